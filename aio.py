@@ -0,0 +1,233 @@
+# governed/aio.py
+"""
+Asyncio embedding API.
+
+check_source_async() and check_sources_async() are the awaitable
+counterparts of engine.check_source(): parsing and rule execution run on
+an AsyncChecker's worker pool, so the event loop never blocks on a large
+input. An AsyncChecker bounds how many checks are submitted at once;
+callers beyond that wait on the loop, where cancelling them is free.
+Cancelling a check that has already started stops waiting for it, but
+its slot is only released once the worker finishes.
+
+Results are the same Diagnostic lists check_source() returns, and a
+SyntaxError in the source is raised by the awaiting call.
+AsyncChecker.check_source_lazy() and check_sources_lazy() have workers
+send results in the binary encoding of governed.transport instead, and
+hand it over as a DiagnosticArray decoded only as it is used: cheaper
+than unpickling lists when callers look at a few diagnostics or only
+count them, dearer when every diagnostic is read.
+"""
+from __future__ import annotations
+
+import asyncio
+import os
+import threading
+import weakref
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Iterable, List, Optional, Tuple
+
+from governed.config import Config
+from governed.diagnostics import Diagnostic
+from governed.engine import CheckerEngine, parse_or_incomplete
+from governed.transport import DiagnosticArray, decode, encode
+
+
+def _check(source: str, filename: str, config: Config) -> List[Diagnostic]:
+    # Runs on a worker; module-level so process pools can pickle it.
+    tree, failed = parse_or_incomplete(source, filename)
+    if failed is not None:
+        return [failed]
+    return CheckerEngine(config).check(tree)
+
+
+def _check_encoded(source: str, filename: str, config: Config) -> bytes:
+    # Lazy results: bytes pickle as one copy, Diagnostic lists do not.
+    return encode(_check(source, filename, config))
+
+
+class AsyncChecker:
+    """
+    A worker pool shared by concurrent checks.
+
+    Processes (the default) check in parallel on every CPython build;
+    threads avoid pickling sources and results but only overlap on
+    free-threaded builds. At most max_concurrency checks per event loop
+    are queued on or running in the pool at once.
+    """
+
+    def __init__(
+        self,
+        max_workers: Optional[int] = None,
+        max_concurrency: Optional[int] = None,
+        processes: bool = True,
+    ):
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.max_concurrency = max_concurrency or 2 * self.max_workers
+        self.processes = processes
+        self._executor: Optional[Executor] = None
+        self._slots: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+        self._lock = threading.Lock()
+        self._closed = False
+
+    def _pool(self) -> Executor:
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("AsyncChecker is closed")
+            if self._executor is None:
+                factory = ProcessPoolExecutor if self.processes else ThreadPoolExecutor
+                self._executor = factory(max_workers=self.max_workers)
+            return self._executor
+
+    # ---- checks ----
+
+    async def check_source(
+        self,
+        source: str,
+        config: Optional[Config] = None,
+        filename: str = "<unknown>",
+    ) -> List[Diagnostic]:
+        """
+        Check one source on the pool.
+        """
+        return await self._submit(_check, source, config, filename)
+
+    async def check_source_lazy(
+        self,
+        source: str,
+        config: Optional[Config] = None,
+        filename: str = "<unknown>",
+    ) -> DiagnosticArray:
+        """
+        Check one source on the pool, returning the encoded result (with
+        either pool kind); diagnostics are decoded as they are accessed.
+        """
+        return decode(await self._submit(_check_encoded, source, config, filename))
+
+    async def _submit(self, worker, source: str, config: Optional[Config], filename: str) -> Any:
+        loop = asyncio.get_running_loop()
+        slots = self._slots.get(loop)
+        if slots is None:
+            slots = self._slots[loop] = asyncio.Semaphore(self.max_concurrency)
+
+        await slots.acquire()
+        try:
+            future = self._pool().submit(worker, source, filename, config or Config())
+        except BaseException:
+            slots.release()
+            raise
+        # Release on the worker's completion, not the caller's: a cancelled
+        # caller must not free a slot while its check is still running.
+        future.add_done_callback(lambda _f: _release(loop, slots))
+        return await asyncio.wrap_future(future)
+
+    async def check_sources(
+        self,
+        sources: Iterable[Tuple[str, str]],
+        config: Optional[Config] = None,
+    ) -> List[List[Diagnostic]]:
+        """
+        Check (filename, source) pairs concurrently; results are in input
+        order. If one check fails or the call is cancelled, the rest are
+        cancelled too.
+        """
+        return await _gather([
+            self.check_source(source, config, filename) for filename, source in sources
+        ])
+
+    async def check_sources_lazy(
+        self,
+        sources: Iterable[Tuple[str, str]],
+        config: Optional[Config] = None,
+    ) -> List[DiagnosticArray]:
+        """
+        check_sources(), returning encoded results as check_source_lazy()
+        does.
+        """
+        return await _gather([
+            self.check_source_lazy(source, config, filename) for filename, source in sources
+        ])
+
+    # ---- lifecycle ----
+
+    def close(self, wait: bool = True) -> None:
+        """
+        Shut the pool down; queued checks that have not started are dropped.
+        """
+        with self._lock:
+            self._closed = True
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=wait, cancel_futures=True)
+
+    async def aclose(self) -> None:
+        await asyncio.get_running_loop().run_in_executor(None, self.close)
+
+    async def __aenter__(self) -> AsyncChecker:
+        return self
+
+    async def __aexit__(self, *exc: Any) -> None:
+        await self.aclose()
+
+
+async def _gather(coros: List[Any]) -> List[Any]:
+    # Cancel the remaining checks if one fails or the caller is cancelled.
+    tasks = [asyncio.ensure_future(c) for c in coros]
+    try:
+        return list(await asyncio.gather(*tasks))
+    except BaseException:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        raise
+
+
+def _release(loop: asyncio.AbstractEventLoop, slots: asyncio.Semaphore) -> None:
+    # Called on a pool thread (or synchronously, for a cancelled future).
+    if loop.is_closed():
+        return
+    try:
+        loop.call_soon_threadsafe(slots.release)
+    except RuntimeError:  # pragma: no cover - loop closed concurrently
+        pass
+
+
+# ----------------- module-level API -----------------
+
+
+_default: Optional[AsyncChecker] = None
+_default_lock = threading.Lock()
+
+
+def default_checker() -> AsyncChecker:
+    """
+    The process-wide AsyncChecker used when none is passed in.
+    """
+    global _default
+    with _default_lock:
+        if _default is None:
+            _default = AsyncChecker()
+        return _default
+
+
+async def check_source_async(
+    source: str,
+    config: Optional[Config] = None,
+    filename: str = "<unknown>",
+    checker: Optional[AsyncChecker] = None,
+) -> List[Diagnostic]:
+    """
+    Awaitable engine.check_source().
+    """
+    return await (checker or default_checker()).check_source(source, config, filename)
+
+
+async def check_sources_async(
+    sources: Iterable[Tuple[str, str]],
+    config: Optional[Config] = None,
+    checker: Optional[AsyncChecker] = None,
+) -> List[List[Diagnostic]]:
+    """
+    Check (filename, source) pairs concurrently on a shared pool.
+    """
+    return await (checker or default_checker()).check_sources(sources, config)
@@ -0,0 +1,284 @@
+# governed/baseline.py
+from __future__ import annotations
+
+import ast
+import hashlib
+import os
+import re
+import struct
+import sys
+from array import array
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from governed.diagnostics import Diagnostic
+
+
+# File layout: MAGIC, entry count and slot count (u32 LE), then an
+# open-addressing hash table of u64 LE entry keys (0 marks an empty slot),
+# then one u64 LE path key per slot naming the file each entry belongs to.
+# The key table is used in place after loading, so no per-entry work
+# happens at load time.
+MAGIC = b"GPBL\x03"
+_HEADER = struct.Struct("<5sII")
+_MAX_LOAD = 0.75
+
+_U64 = (1 << 64) - 1
+_MIX = 0x9E3779B97F4A7C15
+
+_NUMBER = re.compile(r"\d+")
+_SPACE = re.compile(r"\s+")
+
+_SCOPE_NODES = (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)
+MODULE_SCOPE = b"<module>"
+
+
+def normalize_message(message: str) -> str:
+    """
+    Normalize a diagnostic message for fingerprinting.
+
+    Numbers and whitespace runs are collapsed, so messages that embed
+    counts or positions do not change the fingerprint.
+    """
+    return _SPACE.sub(" ", _NUMBER.sub("#", message)).strip()
+
+
+class ScopeIndex:
+    """
+    Maps source lines to the innermost enclosing function or class.
+
+    The scope of a line is identified by a hash of the enclosing node's
+    AST dump (without positions), so moving a function around does not
+    change it, but editing its body does.
+    """
+
+    def __init__(self, tree: ast.AST):
+        self._nodes: List[ast.AST] = []
+        self._hashes: Dict[int, bytes] = {}
+        self._owner: List[int] = []
+
+        # ast.walk is breadth-first: outer scopes are painted before inner ones.
+        for node in ast.walk(tree):
+            if not isinstance(node, _SCOPE_NODES):
+                continue
+            start = min([node.lineno] + [d.lineno for d in node.decorator_list])
+            end = node.end_lineno or node.lineno
+            if end >= len(self._owner):
+                self._owner.extend([-1] * (end + 1 - len(self._owner)))
+            self._owner[start:end + 1] = [len(self._nodes)] * (end + 1 - start)
+            self._nodes.append(node)
+
+    def scope_hash(self, line: Optional[int]) -> bytes:
+        """
+        Return the hash of the scope enclosing the given line.
+        """
+        if line is None or line >= len(self._owner) or self._owner[line] < 0:
+            return MODULE_SCOPE
+
+        idx = self._owner[line]
+        cached = self._hashes.get(idx)
+        if cached is None:
+            try:
+                dump = ast.dump(self._nodes[idx], include_attributes=False)
+            except RecursionError:
+                # Too deep to dump: fall back to the module scope, which is
+                # still stable across runs.
+                return MODULE_SCOPE
+            cached = hashlib.blake2b(dump.encode("utf-8"), digest_size=8).digest()
+            self._hashes[idx] = cached
+        return cached
+
+
+def fingerprint(diagnostic: Diagnostic, scope_hash: bytes) -> int:
+    """
+    Compute the 64-bit fingerprint of a diagnostic.
+
+    The fingerprint covers rule ID, normalized message and the enclosing
+    scope hash. Line and column numbers are deliberately excluded, and so
+    is the file path: the baseline pairs fingerprints with a path of its
+    own, relative to where the baseline file lives.
+    """
+    h = hashlib.blake2b(digest_size=8)
+    h.update((diagnostic.rule_id or "").encode("utf-8"))
+    h.update(b"\0")
+    h.update(normalize_message(diagnostic.message).encode("utf-8"))
+    h.update(b"\0")
+    h.update(scope_hash)
+    # 0 marks an empty slot in the on-disk table.
+    return int.from_bytes(h.digest(), "little") or 1
+
+
+def fingerprints(tree: ast.AST, diagnostics: Iterable[Diagnostic]) -> List[int]:
+    """
+    Fingerprint every diagnostic produced for one file.
+    """
+    scopes = ScopeIndex(tree)
+    return [fingerprint(d, scopes.scope_hash(d.line)) for d in diagnostics]
+
+
+def path_key(path: str, root: Path) -> int:
+    """
+    Hash a file path relative to root.
+
+    The same file gets the same key however it was named on the command
+    line (relative to another directory, or absolute).
+    """
+    rel = os.path.relpath(os.path.abspath(path), os.path.abspath(root))
+    digest = hashlib.blake2b(rel.replace(os.sep, "/").encode("utf-8"), digest_size=8).digest()
+    return int.from_bytes(digest, "little")
+
+
+def _entry_key(owner: int, fp: int) -> int:
+    # 0 marks an empty slot in the on-disk table.
+    return ((owner * _MIX) ^ fp) & _U64 or 1
+
+
+def _build_tables(entries: Dict[int, int]) -> Tuple[array, array]:
+    slots = 8
+    while slots * _MAX_LOAD < len(entries):
+        slots *= 2
+    mask = slots - 1
+
+    table = array("Q", bytes(8 * slots))
+    owners = array("Q", bytes(8 * slots))
+    for key, owner in entries.items():
+        i = key & mask
+        while table[i]:
+            i = (i + 1) & mask
+        table[i] = key
+        owners[i] = owner
+    return table, owners
+
+
+class Baseline:
+    """
+    A set of accepted diagnostics, keyed by file and fingerprint.
+
+    Identical diagnostics in the same scope share a fingerprint, so the
+    baseline records that a violation exists there, not how many times.
+    File paths are taken relative to root, which should be the directory
+    the baseline file is saved in; load() sets it that way.
+
+    A loaded baseline answers membership queries straight from the on-disk
+    hash table; it is only expanded into a dict when modified.
+    """
+
+    def __init__(self, entries: Optional[Dict[int, int]] = None, root: Path = Path(".")):
+        self._entries: Optional[Dict[int, int]] = entries if entries is not None else {}
+        self._table: Optional[array] = None
+        self._owners: Optional[array] = None
+        self._count = 0
+        self.root = root
+
+    @property
+    def entries(self) -> Dict[int, int]:
+        """
+        Map of entry key to the path key of the file it belongs to.
+        """
+        if self._entries is None:
+            self._entries = {
+                key: owner for key, owner in zip(self._table, self._owners) if key
+            }
+            self._table = self._owners = None
+        return self._entries
+
+    def __len__(self) -> int:
+        if self._entries is None:
+            return self._count
+        return len(self._entries)
+
+    def _contains(self, key: int) -> bool:
+        table = self._table
+        if table is None:
+            return key in self._entries
+
+        mask = len(table) - 1
+        i = key & mask
+        slot = table[i]
+        while slot:
+            if slot == key:
+                return True
+            i = (i + 1) & mask
+            slot = table[i]
+        return False
+
+    def add_all(self, path: str, fps: Iterable[int]) -> None:
+        owner = path_key(path, self.root)
+        entries = self.entries
+        for fp in fps:
+            entries[_entry_key(owner, fp)] = owner
+
+    def filter_new(self, path: str, diagnostics: List[Diagnostic], fps: List[int]) -> List[Diagnostic]:
+        """
+        Return only the diagnostics of one file that are not in the baseline.
+        """
+        owner = path_key(path, self.root)
+        return [d for d, fp in zip(diagnostics, fps) if not self._contains(_entry_key(owner, fp))]
+
+    def prune(self, checked: Iterable[Tuple[str, Iterable[int]]]) -> int:
+        """
+        Drop entries of the checked files that were not seen in this run.
+
+        checked holds (path, fingerprints) for every file of the run;
+        entries of other files are kept. Returns the number removed.
+        """
+        owners = set()
+        seen = set()
+        for path, fps in checked:
+            owner = path_key(path, self.root)
+            owners.add(owner)
+            seen.update(_entry_key(owner, fp) for fp in fps)
+
+        entries = self.entries
+        fixed = [key for key, owner in entries.items() if owner in owners and key not in seen]
+        for key in fixed:
+            del entries[key]
+        return len(fixed)
+
+    # ---- persistence ----
+
+    def to_bytes(self) -> bytes:
+        if self._entries is None:
+            table, owners, count = self._table, self._owners, self._count
+        else:
+            (table, owners), count = _build_tables(self._entries), len(self._entries)
+        if sys.byteorder != "little":
+            table, owners = array("Q", table), array("Q", owners)
+            table.byteswap()
+            owners.byteswap()
+        return _HEADER.pack(MAGIC, count, len(table)) + table.tobytes() + owners.tobytes()
+
+    @classmethod
+    def from_bytes(cls, raw: bytes, root: Path = Path(".")) -> Baseline:
+        if len(raw) < _HEADER.size:
+            raise ValueError("baseline file is truncated")
+        magic, count, slots = _HEADER.unpack_from(raw)
+        if magic != MAGIC:
+            raise ValueError("not a governed baseline file")
+        if not slots or slots & (slots - 1) or count > slots:
+            raise ValueError("baseline file is corrupt")
+        if len(raw) != _HEADER.size + 16 * slots:
+            raise ValueError("baseline file is truncated")
+
+        split = _HEADER.size + 8 * slots
+        table = array("Q")
+        table.frombytes(raw[_HEADER.size:split])
+        owners = array("Q")
+        owners.frombytes(raw[split:])
+        if sys.byteorder != "little":
+            table.byteswap()
+            owners.byteswap()
+
+        baseline = cls(root=root)
+        baseline._entries = None
+        baseline._table = table
+        baseline._owners = owners
+        baseline._count = count
+        return baseline
+
+    def save(self, path: Path) -> None:
+        path.write_bytes(self.to_bytes())
+
+    @classmethod
+    def load(cls, path: Path) -> Baseline:
+        return cls.from_bytes(path.read_bytes(), path.parent)
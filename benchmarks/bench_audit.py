@@ -0,0 +1,76 @@
+# benchmarks/bench_audit.py
+"""
+Audit throughput: fsync per event against group commit.
+
+    python benchmarks/bench_audit.py [--events 2000] [--writers 8]
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+from governed.capabilities.audit import SegmentAudit
+
+
+def _fsync_per_event(directory: Path, events: int, writers: int) -> None:
+    lock = threading.Lock()
+    with open(directory / "naive.log", "ab") as f:
+
+        def writer() -> None:
+            for i in range(events // writers):
+                with lock:
+                    f.write(b"event %d\n" % i)
+                    f.flush()
+                    os.fsync(f.fileno())
+
+        _run(writer, writers)
+
+
+def _group_commit(directory: Path, events: int, writers: int, sync: bool) -> int:
+    audit = SegmentAudit(directory, sync=sync)
+
+    def writer() -> None:
+        for i in range(events // writers):
+            audit.record(("event", i))
+
+    _run(writer, writers)
+    audit.close()
+    return audit.fsyncs
+
+
+def _run(target, writers: int) -> None:
+    threads = [threading.Thread(target=target) for _ in range(writers)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+
+def _time(label: str, fn, events: int) -> None:
+    start = time.perf_counter()
+    extra = fn()
+    elapsed = time.perf_counter() - start
+    note = f"  ({extra} fsyncs)" if extra is not None else ""
+    print(f"{label:<28} {elapsed * 1e3:9.1f} ms  {events / elapsed:10.0f} events/s{note}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--events", type=int, default=2000)
+    parser.add_argument("--writers", type=int, default=8)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        n, w = args.events, args.writers
+        _time("fsync per event", lambda: _fsync_per_event(root, n, w), n)
+        _time("group commit (sync=True)", lambda: _group_commit(root / "sync", n, w, True), n)
+        _time("background commit", lambda: _group_commit(root / "async", n, w, False), n)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+# benchmarks/bench_importgraph.py
+"""
+Import graph cost on a synthetic project: cold build, warm refresh,
+one-file change, and transitive queries.
+
+    python benchmarks/bench_importgraph.py [--modules 10000] [--fanout 4]
+"""
+from __future__ import annotations
+
+import argparse
+import tempfile
+import time
+from pathlib import Path
+
+from governed.capabilities.rng import CounterRng
+from governed.config import Config
+from governed.discovery import discover
+from governed.importgraph import ImportGraph
+from governed.rules.determinism import NONDETERMINISTIC_NAMES
+
+
+def _make_project(root: Path, modules: int, fanout: int) -> None:
+    rng = CounterRng(1)
+    pkg = root / "proj"
+    pkg.mkdir()
+    (pkg / "__init__.py").write_text("")
+    for i in range(modules):
+        lines = [f"import proj.m{rng.randint(0, modules - 1)}" for _ in range(fanout)]
+        if rng.randint(0, 999) == 0:
+            lines.append("import time")
+        (pkg / f"m{i}.py").write_text("\n".join(lines) + "\n")
+
+
+def _time(label: str, fn):
+    start = time.perf_counter()
+    result = fn()
+    print(f"{label:<28} {(time.perf_counter() - start) * 1e3:9.1f} ms")
+    return result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--modules", type=int, default=10000)
+    parser.add_argument("--fanout", type=int, default=4)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        _make_project(root, args.modules, args.fanout)
+        cache = root / "graph.json"
+        scan = str(root / "proj")
+
+        def refresh():
+            graph = ImportGraph.load(cache)
+            graph.refresh((scan, f) for f in discover(scan, Config()))
+            graph.reachable_roots("proj.m0")
+            graph.save(cache)
+            return graph
+
+        _time("cold build", refresh)
+        _time("warm refresh", refresh)
+        (root / "proj" / "m0.py").write_text("import random\n")
+        graph = _time("one file changed", refresh)
+
+        paths = list(graph.files)
+        _time(
+            f"transitive D2, {len(paths)} files",
+            lambda: [graph.transitive_diagnostics(p, NONDETERMINISTIC_NAMES) for p in paths],
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,48 @@
+# benchmarks/bench_io.py
+"""
+Io write cost seen by the caller: FileIo against BufferedIo and AsyncIo.
+
+Simulates a telemetry writer appending small records from a control loop.
+
+    python benchmarks/bench_io.py [--writes 20000] [--size 64]
+"""
+from __future__ import annotations
+
+import argparse
+import tempfile
+import time
+from pathlib import Path
+
+from governed.capabilities.io import AsyncIo, BufferedIo
+from governed.capabilities.reference import FileIo
+
+
+def _run(label: str, io, writes: int, size: int) -> None:
+    record = b"t" * (size - 1) + b"\n"
+    clock = time.perf_counter
+    start = clock()
+    for _ in range(writes):
+        io.write("telemetry.log", record)
+    in_loop = clock() - start
+    close = getattr(io, "close", None)
+    if close is not None:
+        close()
+    total = clock() - start
+    print(f"{label:<12} loop {in_loop * 1e3:8.1f} ms ({writes / in_loop:10.0f} writes/s)  incl. close {total * 1e3:8.1f} ms")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--writes", type=int, default=20000)
+    parser.add_argument("--size", type=int, default=64)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        _run("FileIo", FileIo(root / "file"), args.writes, args.size)
+        _run("BufferedIo", BufferedIo(root / "buffered"), args.writes, args.size)
+        _run("AsyncIo", AsyncIo(root / "async"), args.writes, args.size)
+
+
+if __name__ == "__main__":
+    main()
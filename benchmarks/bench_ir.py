@@ -0,0 +1,62 @@
+# benchmarks/bench_ir.py
+"""
+Flat IR against the ast: build cost, reload cost, memory and a kind scan.
+
+    python benchmarks/bench_ir.py [FILE] [--repeat 5]
+"""
+from __future__ import annotations
+
+import argparse
+import ast
+import time
+import tracemalloc
+
+from governed.ast.context import Context
+from governed.config import Config
+from governed.ir import FlatTree, lower
+from governed.rules import syntax
+
+
+def _time(label: str, fn, repeat: int):
+    best, result = float("inf"), None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - start)
+    print(f"{label:<28} {best * 1e3:9.2f} ms")
+    return result
+
+
+def _allocated(fn) -> int:
+    tracemalloc.start()
+    keep = fn()
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del keep
+    return size
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("file", nargs="?", default=ast.__file__.replace("ast.py", "typing.py"))
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    with open(args.file, encoding="utf-8") as f:
+        source = f.read()
+
+    tree = _time("ast.parse", lambda: ast.parse(source), args.repeat)
+    ir = _time("lower", lambda: lower(tree), args.repeat)
+    blob = _time("FlatTree.to_bytes", ir.to_bytes, args.repeat)
+    _time("FlatTree.from_bytes", lambda: FlatTree.from_bytes(blob), args.repeat)
+
+    config = Config()
+    _time("syntax rule, ast.walk", lambda: syntax.check(tree, Context(config=config)), args.repeat)
+    _time("syntax rule, flat IR", lambda: syntax.check_ir(FlatTree.from_bytes(blob), Context(config=config)), args.repeat)
+
+    print(f"{len(ir)} nodes; ast {_allocated(lambda: ast.parse(source)) / 1e6:.1f} MB, "
+          f"IR {_allocated(lambda: lower(tree)) / 1e6:.1f} MB, blob {len(blob) / 1e6:.1f} MB")
+
+
+if __name__ == "__main__":
+    main()
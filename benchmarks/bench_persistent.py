@@ -0,0 +1,109 @@
+# benchmarks/bench_persistent.py
+"""
+Microbenchmarks: persistent Vector/Map against tuple- and dict-copy idioms.
+
+Run from a checkout where `governed` is importable:
+
+    python benchmarks/bench_persistent.py [--sizes 100 1000 10000]
+"""
+from __future__ import annotations
+
+import argparse
+import timeit
+from typing import Callable, Dict, List
+
+from governed.persistent import Map, Vector
+
+
+def _tuple_appends(n: int) -> tuple:
+    t: tuple = ()
+    for i in range(n):
+        t = t + (i,)
+    return t
+
+
+def _vector_appends(n: int) -> Vector:
+    v = Vector()
+    for i in range(n):
+        v = v.append(i)
+    return v
+
+
+def _vector_transient(n: int) -> Vector:
+    return Vector().transient().extend(range(n)).persistent()
+
+
+def _tuple_sets(t: tuple) -> tuple:
+    for i in range(0, len(t), 7):
+        t = t[:i] + (None,) + t[i + 1:]
+    return t
+
+
+def _vector_sets(v: Vector) -> Vector:
+    for i in range(0, len(v), 7):
+        v = v.set(i, None)
+    return v
+
+
+def _dict_assocs(n: int) -> dict:
+    d: dict = {}
+    for i in range(n):
+        d = {**d, i: i}
+    return d
+
+
+def _map_assocs(n: int) -> Map:
+    m = Map()
+    for i in range(n):
+        m = m.assoc(i, i)
+    return m
+
+
+def _map_transient(n: int) -> Map:
+    t = Map().transient()
+    for i in range(n):
+        t.assoc(i, i)
+    return t.persistent()
+
+
+def _cases(n: int) -> Dict[str, Callable[[], object]]:
+    t = tuple(range(n))
+    v = Vector(t)
+    m = Map((i, i) for i in range(n))
+    return {
+        "tuple copy append": lambda: _tuple_appends(n),
+        "Vector.append": lambda: _vector_appends(n),
+        "Vector transient build": lambda: _vector_transient(n),
+        "tuple copy set (n/7)": lambda: _tuple_sets(t),
+        "Vector.set (n/7)": lambda: _vector_sets(v),
+        "tuple iterate": lambda: sum(t),
+        "Vector iterate": lambda: sum(v),
+        "dict copy assoc": lambda: _dict_assocs(n),
+        "Map.assoc": lambda: _map_assocs(n),
+        "Map transient build": lambda: _map_transient(n),
+        "Map.get (all keys)": lambda: [m.get(i) for i in range(n)],
+    }
+
+
+def run(sizes: List[int], repeat: int) -> None:
+    print(f"{'case':<26}" + "".join(f"{f'n={n}':>14}" for n in sizes))
+    names = list(_cases(1))
+    results = {name: [] for name in names}
+    for n in sizes:
+        for name, fn in _cases(n).items():
+            best = min(timeit.repeat(fn, number=1, repeat=repeat))
+            results[name].append(best)
+    for name in names:
+        print(f"{name:<26}" + "".join(f"{t * 1e3:>12.3f}ms" for t in results[name]))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 1000, 10000])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+    run(args.sizes, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
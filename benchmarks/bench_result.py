@@ -0,0 +1,128 @@
+# benchmarks/bench_result.py
+"""
+Microbenchmarks: Result/Ok/Err against exception-based control flow.
+
+Each case runs a transition-shaped function in a hot loop at several
+failure rates and dispatches on the outcome.
+
+    python benchmarks/bench_result.py [--iterations 200000]
+"""
+from __future__ import annotations
+
+import argparse
+import timeit
+
+from governed.result import UNIT, Err, Ok
+from governed.secret import Secret
+
+
+class StepError(Exception):
+    pass
+
+
+def _step_result(x: int, fail_every: int):
+    if fail_every and x % fail_every == 0:
+        return Err(x)
+    return Ok(x)
+
+
+def _step_unit(x: int, fail_every: int):
+    if fail_every and x % fail_every == 0:
+        return Err(x)
+    return UNIT
+
+
+def _step_raise(x: int, fail_every: int) -> int:
+    if fail_every and x % fail_every == 0:
+        raise StepError(x)
+    return x
+
+
+def _loop_match(n: int, fail_every: int) -> int:
+    acc = 0
+    for x in range(n):
+        match _step_result(x, fail_every):
+            case Ok(value):
+                acc += value
+            case Err(_):
+                acc -= 1
+    return acc
+
+
+def _loop_type_check(n: int, fail_every: int) -> int:
+    acc = 0
+    for x in range(n):
+        r = _step_result(x, fail_every)
+        if type(r) is Ok:
+            acc += r.value
+        else:
+            acc -= 1
+    return acc
+
+
+def _loop_unit(n: int, fail_every: int) -> int:
+    acc = 0
+    for x in range(n):
+        if _step_unit(x, fail_every) is UNIT:
+            acc += 1
+    return acc
+
+
+def _loop_exceptions(n: int, fail_every: int) -> int:
+    acc = 0
+    for x in range(n):
+        try:
+            acc += _step_raise(x, fail_every)
+        except StepError:
+            acc -= 1
+    return acc
+
+
+def _loop_secret(n: int) -> int:
+    s = Secret(7)
+    acc = 0
+    for _ in range(n):
+        acc += s.expose()
+    return acc
+
+
+def _loop_plain(n: int) -> int:
+    v = 7
+    acc = 0
+    for _ in range(n):
+        acc += v
+    return acc
+
+
+def run(n: int, repeat: int) -> None:
+    rates = {"0%": 0, "1%": 100, "10%": 10, "50%": 2}
+    cases = {
+        "match Ok/Err": _loop_match,
+        "type(r) is Ok": _loop_type_check,
+        "UNIT identity": _loop_unit,
+        "raise/except": _loop_exceptions,
+    }
+
+    print(f"{'case (ns/iter)':<20}" + "".join(f"{'fail ' + r:>12}" for r in rates))
+    for name, fn in cases.items():
+        row = []
+        for every in rates.values():
+            best = min(timeit.repeat(lambda: fn(n, every), number=1, repeat=repeat))
+            row.append(best / n * 1e9)
+        print(f"{name:<20}" + "".join(f"{t:>12.1f}" for t in row))
+
+    for name, fn in {"Secret.expose()": _loop_secret, "plain local": _loop_plain}.items():
+        best = min(timeit.repeat(lambda: fn(n), number=1, repeat=repeat))
+        print(f"{name:<20}{best / n * 1e9:>12.1f}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--iterations", type=int, default=200_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+    run(args.iterations, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,41 @@
+# benchmarks/bench_rng.py
+"""
+Microbenchmarks: CounterRng against per-call random.Random.
+
+    python benchmarks/bench_rng.py [--draws 1000000]
+"""
+from __future__ import annotations
+
+import argparse
+import random
+import time
+
+from governed.capabilities.rng import CounterRng
+
+
+def _time(label: str, fn, draws: int) -> None:
+    start = time.perf_counter()
+    fn()
+    elapsed = time.perf_counter() - start
+    print(f"{label:<32} {elapsed * 1e3:9.1f} ms  {draws / elapsed / 1e6:7.2f} M draws/s")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--draws", type=int, default=1_000_000)
+    args = parser.parse_args()
+    n = args.draws
+
+    ref = random.Random(0)
+    rng = CounterRng(0)
+
+    _time("random.Random.random (per call)", lambda: [ref.random() for _ in range(n)], n)
+    _time("CounterRng.random (per call)", lambda: [rng.random() for _ in range(n)], n)
+    _time("CounterRng.random_batch", lambda: rng.random_batch(n), n)
+    _time("random.Random.getrandbits(64)", lambda: [ref.getrandbits(64) for _ in range(n)], n)
+    _time("CounterRng.u64_batch", lambda: rng.u64_batch(n), n)
+    _time("CounterRng.split x workers", lambda: [rng.split().u64_batch(n // 8) for _ in range(8)], n)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+# benchmarks/bench_snippet.py
+"""
+Snippet rendering against checking, over a directory of Python files.
+
+    python benchmarks/bench_snippet.py [DIR] [--repeat 3]
+"""
+from __future__ import annotations
+
+import argparse
+import ast
+import sysconfig
+import time
+
+from governed.config import Config
+from governed.discovery import discover, read_source
+from governed.engine import CheckerEngine
+from governed.snippet import LineIndex, render
+
+
+def _time(label: str, fn, repeat: int):
+    best, result = float("inf"), None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - start)
+    print(f"{label:<32} {best * 1e3:9.1f} ms")
+    return result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("dir", nargs="?", default=sysconfig.get_paths()["stdlib"])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    config = Config(exclude=("test/", "tests/", "site-packages/"))
+    trees = {}
+    for f in discover(args.dir, config):
+        try:
+            trees[f.path] = ast.parse(read_source(f.path, f.size))
+        except (SyntaxError, UnicodeDecodeError, OSError, ValueError):
+            continue
+
+    engine = CheckerEngine(Config())
+    results = _time(
+        f"check {len(trees)} files",
+        lambda: {path: engine.check(tree) for path, tree in trees.items()},
+        args.repeat,
+    )
+    count = sum(len(diags) for diags in results.values())
+
+    def with_index():
+        out = []
+        for path, diags in results.items():
+            if not diags:
+                continue
+            lines = LineIndex.from_file(path)
+            out.extend(render(d, lines) for d in diags)
+            lines.close()
+        return out
+
+    def resplit():
+        # What a snippet costs without an index: split the file per diagnostic.
+        out = []
+        for path, diags in results.items():
+            for d in diags:
+                with open(path, encoding="utf-8-sig") as f:
+                    source = f.read().splitlines()
+                out.append(source[d.line - 1] if d.line else "")
+        return out
+
+    _time(f"render {count} diagnostics", with_index, args.repeat)
+    _time("re-split file per diagnostic", resplit, 1)
+    print(f"{count / max(len(results), 1):.1f} diagnostics per file")
+
+
+if __name__ == "__main__":
+    main()
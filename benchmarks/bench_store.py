@@ -0,0 +1,72 @@
+# benchmarks/bench_store.py
+"""
+Store throughput and latency: MemoryStore against SqliteStore settings.
+
+Each workload reports ops/s and p50/p95/p99 per-operation latency.
+
+    python benchmarks/bench_store.py [--ops 20000] [--keys 2000]
+"""
+from __future__ import annotations
+
+import argparse
+import tempfile
+import time
+from pathlib import Path
+
+from governed.capabilities.reference import MemoryStore
+from governed.capabilities.rng import CounterRng
+from governed.capabilities.store import SqliteStore
+
+
+def _percentile(sorted_ns, q: float) -> float:
+    return sorted_ns[min(len(sorted_ns) - 1, int(q * len(sorted_ns)))] / 1e3
+
+
+def _run(label: str, store, ops: int, keys: int, write_ratio: float) -> None:
+    rng = CounterRng(0)
+    plan = [(rng.random() < write_ratio, rng.randint(0, keys - 1)) for _ in range(ops)]
+    latencies = []
+    clock = time.perf_counter_ns
+    start = clock()
+    for is_write, key in plan:
+        t0 = clock()
+        if is_write:
+            store.put(("k", key), key)
+        else:
+            store.get(("k", key))
+        latencies.append(clock() - t0)
+    if hasattr(store, "commit"):
+        store.commit()
+    elapsed = (clock() - start) / 1e9
+
+    latencies.sort()
+    print(
+        f"{label:<34} {ops / elapsed:10.0f} ops/s  "
+        f"p50 {_percentile(latencies, 0.50):7.1f}us  "
+        f"p95 {_percentile(latencies, 0.95):7.1f}us  "
+        f"p99 {_percentile(latencies, 0.99):7.1f}us"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--ops", type=int, default=20000)
+    parser.add_argument("--keys", type=int, default=2000)
+    args = parser.parse_args()
+
+    configs = [
+        ("sqlite batch=1 cache=0", dict(batch_size=1, cache_size=0)),
+        ("sqlite batch=256 cache=0", dict(batch_size=256, cache_size=0)),
+        ("sqlite batch=256 cache=4096", dict(batch_size=256, cache_size=4096)),
+    ]
+    for mix, ratio in (("read-heavy", 0.1), ("write-heavy", 0.9)):
+        print(f"-- {mix} ({int(ratio * 100)}% writes)")
+        _run("memory", MemoryStore(), args.ops, args.keys, ratio)
+        with tempfile.TemporaryDirectory() as tmp:
+            for i, (label, kwargs) in enumerate(configs):
+                with SqliteStore(Path(tmp) / f"{i}.db", **kwargs) as store:
+                    _run(label, store, args.ops, args.keys, ratio)
+
+
+if __name__ == "__main__":
+    main()
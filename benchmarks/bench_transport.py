@@ -0,0 +1,76 @@
+# benchmarks/bench_transport.py
+"""
+Diagnostic transport between processes: pickle against governed.transport,
+over the checker's results for a directory of Python files.
+
+    python benchmarks/bench_transport.py [DIR] [--repeat 5]
+"""
+from __future__ import annotations
+
+import argparse
+import ast
+import gc
+import pickle
+import sysconfig
+import time
+
+from governed.config import Config
+from governed.discovery import discover, read_source
+from governed.engine import CheckerEngine
+from governed.transport import decode, encode
+
+
+def _time(label: str, fn, repeat: int):
+    best, result = float("inf"), None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - start)
+    print(f"{label:<32} {best * 1e3:9.1f} ms")
+    return result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("dir", nargs="?", default=sysconfig.get_paths()["stdlib"])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    config = Config(exclude=("test/", "tests/", "site-packages/"))
+    engine = CheckerEngine(Config())
+    results = []
+    for f in discover(args.dir, config):
+        try:
+            results.append(engine.check(ast.parse(read_source(f.path, f.size))))
+        except (SyntaxError, UnicodeDecodeError, OSError, ValueError, RecursionError):
+            continue
+    count = sum(len(r) for r in results)
+    print(f"{len(results)} files, {count} diagnostics")
+
+    # What crosses the pipe: one pickle per result, as ProcessPoolExecutor sends it.
+    pickled = _time("worker: pickle", lambda: [pickle.dumps(r) for r in results], args.repeat)
+    encoded = _time(
+        "worker: encode + pickle",
+        lambda: [pickle.dumps(encode(r)) for r in results],
+        args.repeat,
+    )
+    print(f"{'bytes: pickle / encoded':<32} {sum(map(len, pickled)):>9} / {sum(map(len, encoded))}")
+
+    gc.collect()
+    _time("parent: unpickle", lambda: [pickle.loads(p) for p in pickled], args.repeat)
+    arrays = _time("parent: decode (lazy)", lambda: [decode(pickle.loads(p)) for p in encoded], args.repeat)
+    _time(
+        "parent: decode + severities",
+        lambda: [[a.severity(i) for i in range(len(a))] for a in (decode(pickle.loads(p)) for p in encoded)],
+        args.repeat,
+    )
+    _time(
+        "parent: decode + materialize",
+        lambda: [list(decode(pickle.loads(p))) for p in encoded],
+        args.repeat,
+    )
+    assert arrays == results
+
+
+if __name__ == "__main__":
+    main()
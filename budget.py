@@ -0,0 +1,104 @@
+# governed/budget.py
+"""
+Per-file work budgets.
+
+A Budget bounds how many AST nodes a file may have and how long checking
+it may take. The engine counts nodes while building the module index
+and rules traverse the tree with walk(), which checks the deadline as it
+goes, so a pathological file stops early with BudgetExceeded instead of
+stalling a run. The engine turns that into a "check incomplete"
+diagnostic (see engine.incomplete).
+"""
+from __future__ import annotations
+
+import ast
+import time
+from collections import deque
+from typing import Callable, Iterator, Optional, Tuple, Type
+
+from governed.config import Config
+
+
+# walk() looks at the clock once per this many nodes.
+CLOCK_INTERVAL = 1024
+
+
+class BudgetExceeded(Exception):
+    """
+    Raised when a file exceeds its node or time budget.
+    """
+
+    def __init__(self, reason: str):
+        super().__init__(reason)
+        self.reason = reason
+
+
+class Budget:
+    """
+    Node and wall-clock limits for checking one file; None disables a limit.
+
+    The clock starts when the Budget is created.
+    """
+
+    def __init__(
+        self,
+        max_nodes: Optional[int] = None,
+        max_seconds: Optional[float] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.max_nodes = max_nodes
+        self.max_seconds = max_seconds
+        self._clock = clock
+        self._deadline = None if max_seconds is None else clock() + max_seconds
+
+    @classmethod
+    def from_config(cls, config: Config) -> Budget:
+        return cls(config.max_nodes_per_file, config.max_seconds_per_file)
+
+    def check_nodes(self, count: int) -> None:
+        if self.max_nodes is not None and count > self.max_nodes:
+            raise BudgetExceeded(f"file has more than {self.max_nodes} AST nodes")
+
+    def check_time(self) -> None:
+        if self._deadline is not None and self._clock() > self._deadline:
+            raise BudgetExceeded(f"checking took longer than {self.max_seconds:g}s")
+
+
+def walk(
+    node: ast.AST,
+    budget: Optional[Budget] = None,
+    prune: Tuple[Type[ast.AST], ...] = (),
+) -> Iterator[ast.AST]:
+    """
+    ast.walk (same breadth-first order), checking the budget's deadline
+    as it goes. Iterative, so nesting depth is unbounded.
+
+    Descendants that are instances of a prune type are yielded but not
+    descended into (the starting node always is).
+    """
+    check_time = budget.check_time if budget is not None and budget.max_seconds is not None else None
+    root = node
+    todo = deque([node])
+    popleft, append = todo.popleft, todo.append
+    AST = ast.AST
+    countdown = CLOCK_INTERVAL
+    while todo:
+        node = popleft()
+        if prune and node is not root and isinstance(node, prune):
+            yield node
+            continue
+        # Inlined ast.iter_child_nodes: this loop is every rule's hot path.
+        for name in node._fields:
+            value = getattr(node, name, None)
+            if value.__class__ is list:
+                for item in value:
+                    if isinstance(item, AST):
+                        append(item)
+            elif isinstance(value, AST):
+                append(value)
+        yield node
+        countdown -= 1
+        if not countdown:
+            countdown = CLOCK_INTERVAL
+            if check_time is not None:
+                check_time()
@@ -0,0 +1,182 @@
+# governed/compiler.py
+from __future__ import annotations
+
+import ast
+from dataclasses import dataclass
+from typing import Dict, List, Sequence, Tuple
+
+from governed.ast.context import Context
+from governed.config import Config
+from governed.diagnostics import Diagnostic, Severity
+from governed.rules import protocol
+from governed.rules.protocol import ProtocolModel
+
+
+# Marker for "transition not enabled in this state" in a NEXT table.
+DISABLED = -1
+
+
+@dataclass(frozen=True)
+class TransitionTable:
+    """
+    Integer encoding of a protocol's state machine.
+
+    States and transitions are numbered in declaration order. next_state
+    is a flat row-major table: next_state[state * len(transitions) + t]
+    is the destination of transition t from state, or DISABLED.
+    """
+
+    name: str
+    states: Tuple[str, ...]
+    transitions: Tuple[str, ...]
+    next_state: Tuple[int, ...]
+    initial: int = 0
+
+    def step(self, state: int, transition: int) -> int:
+        return self.next_state[state * len(self.transitions) + transition]
+
+    def enabled(self, state: int) -> Tuple[int, ...]:
+        width = len(self.transitions)
+        row = self.next_state[state * width:(state + 1) * width]
+        return tuple(t for t, dst in enumerate(row) if dst != DISABLED)
+
+
+def build_table(model: ProtocolModel) -> TransitionTable:
+    """
+    Lower a checked protocol model to a transition table.
+
+    Each distinct transition name gets one id, so a function with several
+    @transition decorators is one transition enabled from several states.
+    Transitions that reference unknown states (P7) or leave one state
+    for two destinations under one name (P4) are not representable and
+    must be rejected by the caller beforehand.
+    """
+    state_ids: Dict[str, int] = {name: i for i, name in enumerate(model.states)}
+    transition_ids: Dict[str, int] = {}
+    for _src, _dst, fn in model.transitions:
+        transition_ids.setdefault(fn.name, len(transition_ids))
+    width = len(transition_ids)
+
+    table = [DISABLED] * (len(model.states) * width)
+    for src, dst, fn in model.transitions:
+        table[state_ids[src] * width + transition_ids[fn.name]] = state_ids[dst]
+
+    return TransitionTable(
+        name=model.name,
+        states=tuple(model.states),
+        transitions=tuple(transition_ids),
+        next_state=tuple(table),
+    )
+
+
+def compile_protocols(tree: ast.AST, config: Config) -> Tuple[List[TransitionTable], List[Diagnostic]]:
+    """
+    Run the protocol rules and lower every protocol they accept.
+
+    Returns the tables and the protocol diagnostics. If any diagnostic is
+    an error, no tables are returned.
+    """
+    ctx = Context(config=config)
+    diagnostics = protocol.check(tree, ctx)
+    if any(d.severity == Severity.ERROR for d in diagnostics):
+        return [], diagnostics
+    return [build_table(model) for model in ctx.protocols.values()], diagnostics
+
+
+# ----------------- code generation -----------------
+
+
+_HEADER = '''\
+# Generated by `governed compile` from {source}. Do not edit.
+#
+# States and transitions are small integers numbered in declaration order.
+# NEXT[state * N_TRANSITIONS + transition] is the destination state, or -1
+# when the transition is not enabled in that state.
+from __future__ import annotations
+
+
+'''
+
+_TEMPLATE = '''\
+class {name}:
+    """
+    Compiled transition table for protocol {name}.
+    """
+
+    __slots__ = ()
+
+    STATES = {states!r}
+    TRANSITIONS = {transitions!r}
+    N_TRANSITIONS = {width}
+    INITIAL = {initial}
+
+{state_consts}
+
+{transition_consts}
+
+    NEXT = {next_state}
+
+    # Transition ids enabled in each state
+    ENABLED = {enabled!r}
+
+    @staticmethod
+    def step(state: int, transition: int, _next=NEXT) -> int:
+        return _next[state * {width} + transition]
+
+    @staticmethod
+    def step_many(states, transitions, _next=NEXT) -> list:
+        return [_next[s * {width} + t] for s, t in zip(states, transitions)]
+
+    @classmethod
+    def bind(cls, protocol_class) -> tuple:
+        """
+        Resolve transition functions once, in transition-id order.
+        """
+        return tuple(getattr(protocol_class, name) for name in cls.TRANSITIONS)
+
+    @staticmethod
+    def dispatch(handlers: tuple, state: int, transition: int, value, _next=NEXT):
+        """
+        Run a bound transition; returns (next state, result) or (-1, None).
+        """
+        nxt = _next[state * {width} + transition]
+        if nxt < 0:
+            return -1, None
+        return nxt, handlers[transition](value)
+'''
+
+
+def _format_table(table: TransitionTable) -> str:
+    width = len(table.transitions)
+    if not width or not table.states:
+        return "()"
+    rows = []
+    for s, state in enumerate(table.states):
+        row = table.next_state[s * width:(s + 1) * width]
+        rows.append("        " + ", ".join(str(v) for v in row) + f",  # {state}")
+    return "(\n" + "\n".join(rows) + "\n    )"
+
+
+def emit_module(tables: Sequence[TransitionTable], source: str) -> str:
+    """
+    Render the generated Python module for the given tables.
+    """
+    parts = [_HEADER.format(source=source)]
+    for table in tables:
+        state_consts = "\n".join(f"    S_{name} = {i}" for i, name in enumerate(table.states))
+        transition_consts = "\n".join(f"    T_{name} = {i}" for i, name in enumerate(table.transitions))
+        parts.append(
+            _TEMPLATE.format(
+                name=table.name,
+                states=table.states,
+                transitions=table.transitions,
+                width=len(table.transitions),
+                initial=table.initial,
+                state_consts=state_consts or "    # (no states)",
+                transition_consts=transition_consts or "    # (no transitions)",
+                next_state=_format_table(table),
+                enabled=tuple(table.enabled(s) for s in range(len(table.states))),
+            )
+        )
+        parts.append("\n\n")
+    return "".join(parts).rstrip("\n") + "\n"
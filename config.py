@@ -2,7 +2,7 @@
 from __future__ import annotations
 
 from dataclasses import dataclass, field
-from typing import Optional, Set
+from typing import Optional, Set, Tuple
 
 
 @dataclass(slots=True)
@@ -19,13 +19,23 @@ class Config:
         default_factory=lambda: {"typing", "dataclasses", "enum", "math", "decimal", "governed"}
     )
 
-    # If strict is False, the engine may downgrade/omit warnings depending on rule modules.
+    # If strict is False, the engine omits warnings (see engine.apply_policy).
     strict: bool = True
 
-    # Optional knobs that other layers may use (engine/rules), but do not enforce here.
-    protocol_validation: str = "strict"   # e.g. "strict" | "lenient"
-    secret_protection: str = "strict"     # e.g. "strict" | "lenient"
+    # "lenient" makes the engine report protocol / secret errors as warnings.
+    protocol_validation: str = "strict"   # "strict" | "lenient"
+    secret_protection: str = "strict"     # "strict" | "lenient"
 
     # Optional determinism/testing configuration (authoring-level; runtime is out of scope here).
     deterministic_test: bool = False
     test_seed: Optional[int] = 42
+
+    # File discovery for directory checks (gitignore-style globs, relative to the checked root).
+    include: Tuple[str, ...] = ("*.py",)
+    exclude: Tuple[str, ...] = ()
+    respect_gitignore: bool = True
+
+    # Per-file work limits; a file over either gets a "check incomplete"
+    # diagnostic instead of full results. None disables a limit.
+    max_nodes_per_file: Optional[int] = 1_000_000
+    max_seconds_per_file: Optional[float] = 60.0
@@ -45,12 +45,26 @@ class Scope:
         """
         Look up a symbol in this scope or any parent scope.
         """
-        if name in self.symbols:
-            return self.symbols[name]
-        if self.parent is not None:
-            return self.parent.lookup(name)
+        scope: Optional[Scope] = self
+        while scope is not None:
+            symbol = scope.symbols.get(name)
+            if symbol is not None:
+                return symbol
+            scope = scope.parent
         return None
 
+    def binding_scope(self) -> Scope:
+        """
+        The nearest of this scope and its parents that defines a symbol
+        (or the outermost scope). A child scope parented there looks names
+        up exactly as if parented here, while no symbols are added to the
+        scopes skipped, and without walking them on every lookup.
+        """
+        scope = self
+        while not scope.symbols and scope.parent is not None:
+            scope = scope.parent
+        return scope
+
     def lookup_local(self, name: str) -> Optional[Symbol]:
         """
         Look up a symbol only in the current scope.
@@ -61,9 +75,10 @@ class Scope:
 @dataclass
 class Context:
     """
-    Shared checker context passed to all rule modules.
+    Checker context passed to a rule module.
 
-    This object is mutated as the AST is traversed.
+    The engine creates one Context per rule module, so a Context is never
+    shared between rules (or threads). It is mutated as the AST is traversed.
     It contains no rule logic itself.
     """
 
@@ -76,13 +91,25 @@ class Context:
     # Protocol models collected by protocol rules
     protocols: Dict[str, Any] = field(default_factory=dict)
 
+    # Flat IR of the module (governed.ir.FlatTree), shared read-only
+    # between rules when the engine lowers the tree; None otherwise.
+    ir: Any = None
+
+    # Inverted index of the module (governed.index.ModuleIndex), shared
+    # read-only between rules; see governed.index.module_index.
+    index: Any = None
+
+    # Work budget of the file being checked (governed.budget.Budget), for
+    # governed.budget.walk; None means unbounded.
+    budget: Any = None
+
     def __post_init__(self) -> None:
         self.current_scope = self.global_scope
 
     # ---- scope management helpers ----
 
-    def push_scope(self, name: str) -> None:
-        self.current_scope = Scope(name, parent=self.current_scope)
+    def push_scope(self, name: str, parent: Optional[Scope] = None) -> None:
+        self.current_scope = Scope(name, parent=self.current_scope if parent is None else parent)
 
     def pop_scope(self) -> None:
         if self.current_scope.parent is not None:
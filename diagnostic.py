@@ -62,6 +62,24 @@ class Diagnostic:
             },
         }
 
+    @classmethod
+    def from_json(cls, data: Dict[str, Any]) -> Diagnostic:
+        """
+        Rebuild a diagnostic from the structure produced by to_json().
+        """
+        start = data["range"]["start"]
+        end = data["range"]["end"]
+        return cls(
+            severity=Severity(data["severity"]),
+            message=data["message"],
+            rule_id=data.get("rule_id"),
+            suggestion=data.get("suggestion"),
+            line=start["line"] or None,
+            column=start["column"] if start["line"] else None,
+            end_line=end["line"] or None,
+            end_column=end["column"] if end["line"] else None,
+        )
+
     def format_human(self) -> str:
         """
         Render a human-readable diagnostic string.
@@ -0,0 +1,395 @@
+# governed/discovery.py
+from __future__ import annotations
+
+import functools
+import hashlib
+import json
+import mmap
+import os
+import re
+import sys
+from dataclasses import dataclass, fields
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Pattern, Sequence, Tuple
+
+from governed.config import Config
+from governed.diagnostics import Diagnostic
+
+
+# Files at least this large are decoded straight from a memory map.
+MMAP_THRESHOLD = 1 << 20
+
+GITIGNORE = ".gitignore"
+
+# Directories never worth descending into, regardless of ignore files.
+ALWAYS_SKIP = frozenset({".git", ".hg", ".svn", "__pycache__"})
+
+
+# ----------------- glob compilation -----------------
+
+
+def _translate(pattern: str) -> str:
+    """
+    Translate one gitignore-style glob into a regex fragment.
+
+    Patterns containing a slash (other than a trailing one) are anchored
+    to the base directory; all others match a name at any depth.
+    """
+    anchored = "/" in pattern
+    pattern = pattern.lstrip("/")
+
+    out: List[str] = []
+    i, n = 0, len(pattern)
+    while i < n:
+        c = pattern[i]
+        if pattern.startswith("**/", i):
+            out.append("(?:.*/)?")
+            i += 3
+        elif pattern.startswith("/**", i) and i + 3 == n:
+            out.append("/.*")
+            i += 3
+        elif pattern.startswith("**", i):
+            out.append(".*")
+            i += 2
+        elif c == "*":
+            out.append("[^/]*")
+            i += 1
+        elif c == "?":
+            out.append("[^/]")
+            i += 1
+        elif c == "[":
+            j = pattern.find("]", i + 2)
+            if j < 0:
+                out.append(re.escape(c))
+                i += 1
+            else:
+                body = pattern[i + 1:j]
+                if body.startswith("!"):
+                    body = "^" + body[1:]
+                out.append(f"[{body}]")
+                i = j + 1
+        elif c == "\\" and i + 1 < n:
+            out.append(re.escape(pattern[i + 1]))
+            i += 2
+        else:
+            out.append(re.escape(c))
+            i += 1
+
+    body = "".join(out)
+    return body if anchored else f"(?:.*/)?{body}"
+
+
+def compile_globs(patterns: Iterable[str]) -> Optional[Pattern[str]]:
+    """
+    Compile a set of globs into one regex matching relative POSIX paths.
+
+    Returns None for an empty pattern set.
+    """
+    parts = [_translate(p.rstrip("/")) for p in patterns if p.rstrip("/")]
+    if not parts:
+        return None
+    return re.compile("(?:" + "|".join(parts) + r")\Z")
+
+
+def compile_selector(include: Sequence[str], exclude: Sequence[str]) -> Pattern[str]:
+    """
+    Compile include and exclude globs into a single file matcher.
+    """
+    inc = "|".join(_translate(p.rstrip("/")) for p in include if p.rstrip("/")) or ".*"
+    exc = "|".join(_translate(p.rstrip("/")) for p in exclude if p.rstrip("/"))
+    guard = rf"(?!(?:{exc})\Z)" if exc else ""
+    return re.compile(rf"{guard}(?:{inc})\Z")
+
+
+class IgnoreFile:
+    """
+    The compiled rules of one .gitignore file.
+
+    All patterns are folded into one alternation per entry kind, in
+    reverse order, so the first alternative that matches is the pattern
+    that gitignore semantics say wins (the last one in the file).
+    """
+
+    def __init__(self, patterns: Sequence[str]):
+        rules: List[Tuple[str, bool, bool]] = []
+        for raw in patterns:
+            line = raw.rstrip("\n").rstrip("\r")
+            if not line.strip() or line.startswith("#"):
+                continue
+            line = line.rstrip(" ")
+            negate = line.startswith("!")
+            if negate:
+                line = line[1:]
+            dir_only = line.endswith("/")
+            line = line.rstrip("/")
+            if line:
+                rules.append((_translate(line), negate, dir_only))
+
+        self._files = self._compile([r for r in rules if not r[2]])
+        self._dirs = self._compile(rules)
+
+    @staticmethod
+    def _compile(rules: List[Tuple[str, bool, bool]]):
+        if not rules:
+            return None
+        ordered = list(reversed(rules))
+        regex = re.compile("(?:" + "|".join(f"({r})" for r, _neg, _d in ordered) + r")\Z")
+        return regex, tuple(neg for _r, neg, _d in ordered)
+
+    def match(self, rel: str, is_dir: bool) -> Optional[bool]:
+        """
+        Return True if ignored, False if explicitly re-included, None if no rule applies.
+        """
+        compiled = self._dirs if is_dir else self._files
+        if compiled is None:
+            return None
+        regex, negations = compiled
+        m = regex.match(rel)
+        if m is None:
+            return None
+        return not negations[m.lastindex - 1]
+
+    @classmethod
+    def load(cls, path: str) -> Optional[IgnoreFile]:
+        try:
+            with open(path, encoding="utf-8", errors="replace") as f:
+                return cls(f.readlines())
+        except OSError:
+            return None
+
+
+# ----------------- discovery -----------------
+
+
+@dataclass(frozen=True, slots=True)
+class SourceFile:
+    """
+    A discovered source file and the stat data used to detect changes.
+    """
+
+    path: str
+    size: int
+    mtime_ns: int
+    inode: int
+
+    @property
+    def stat_key(self) -> Tuple[int, int, int]:
+        return (self.mtime_ns, self.size, self.inode)
+
+    @classmethod
+    def from_stat(cls, path: str, st: os.stat_result) -> SourceFile:
+        return cls(path=path, size=st.st_size, mtime_ns=st.st_mtime_ns, inode=st.st_ino)
+
+
+def stat_file(path: str) -> SourceFile:
+    """
+    Stat an explicitly named file. Raises OSError if it cannot be stat'ed.
+    """
+    return SourceFile.from_stat(Path(path).as_posix(), os.stat(path))
+
+
+def discover(root: str, config: Config) -> Iterator[SourceFile]:
+    """
+    Walk root with os.scandir and yield the files selected for checking.
+
+    Honours .gitignore files at every level (deeper files take precedence)
+    and the include/exclude globs from config. Entries are visited in
+    sorted order, so discovery is deterministic.
+    """
+    select = compile_selector(config.include, config.exclude)
+    exclude_dirs = compile_globs(config.exclude)
+    base = Path(root).as_posix().rstrip("/") or "/"
+
+    # Stack of (directory path, relative path, ignore files in effect)
+    stack: List[Tuple[str, str, Tuple[Tuple[str, IgnoreFile], ...]]] = [(base, "", ())]
+
+    while stack:
+        dirpath, rel_dir, ignores = stack.pop()
+
+        try:
+            with os.scandir(dirpath) as it:
+                entries = sorted(it, key=lambda e: e.name)
+        except OSError:
+            continue
+
+        # Only open .gitignore where the listing shows one: no failed opens per directory.
+        if config.respect_gitignore and any(e.name == GITIGNORE for e in entries):
+            ignore = IgnoreFile.load(os.path.join(dirpath, GITIGNORE))
+            if ignore is not None:
+                ignores = ignores + ((rel_dir, ignore),)
+
+        subdirs = []
+        for entry in entries:
+            rel = f"{rel_dir}{entry.name}"
+            try:
+                is_dir = entry.is_dir(follow_symlinks=False)
+                if not is_dir and not entry.is_file():
+                    continue
+            except OSError:
+                continue
+
+            if is_dir:
+                if entry.name in ALWAYS_SKIP:
+                    continue
+                if exclude_dirs is not None and exclude_dirs.match(rel):
+                    continue
+                if _ignored(ignores, rel, True):
+                    continue
+                subdirs.append((entry.path, rel + "/", ignores))
+                continue
+
+            if not select.match(rel) or _ignored(ignores, rel, False):
+                continue
+            try:
+                st = entry.stat()
+            except OSError:
+                continue
+            yield SourceFile.from_stat(_join(base, rel), st)
+
+        # Reverse so the stack pops subdirectories in sorted order.
+        stack.extend(reversed(subdirs))
+
+
+def _join(base: str, rel: str) -> str:
+    if base == ".":
+        return rel
+    return base + rel if base.endswith("/") else f"{base}/{rel}"
+
+
+def _ignored(ignores, rel: str, is_dir: bool) -> bool:
+    for prefix, ignore in reversed(ignores):
+        result = ignore.match(rel[len(prefix):], is_dir)
+        if result is not None:
+            return result
+    return False
+
+
+# ----------------- reading -----------------
+
+
+def read_source(path: str, size: Optional[int] = None, mmap_threshold: int = MMAP_THRESHOLD) -> str:
+    """
+    Read a source file as bytes and decode it once.
+
+    Files at or above mmap_threshold are decoded directly from a memory
+    map instead of being copied into an intermediate bytes object.
+    Raises OSError or UnicodeDecodeError.
+    """
+    fd = os.open(path, os.O_RDONLY | getattr(os, "O_BINARY", 0))
+    try:
+        if size is None:
+            size = os.fstat(fd).st_size
+        if size and size >= mmap_threshold:
+            with mmap.mmap(fd, 0, access=mmap.ACCESS_READ) as mm:
+                view = memoryview(mm)
+                try:
+                    return str(view, "utf-8-sig")
+                finally:
+                    view.release()
+
+        chunks = []
+        while True:
+            chunk = os.read(fd, max(size or 0, 1 << 16))
+            if not chunk:
+                break
+            chunks.append(chunk)
+        return b"".join(chunks).decode("utf-8-sig")
+    finally:
+        os.close(fd)
+
+
+# ----------------- manifest -----------------
+
+
+@functools.lru_cache(maxsize=None)
+def checker_digest() -> str:
+    """
+    Digest of the checker's own sources and the Python version.
+
+    Any edit to a rule, the engine or a module they use changes it, so
+    cached results never outlive the code that produced them.
+    """
+    root = Path(__file__).parent
+    h = hashlib.blake2b(digest_size=16)
+    h.update(sys.version.encode("utf-8"))
+    for path in sorted(root.rglob("*.py")):
+        h.update(b"\0" + path.relative_to(root).as_posix().encode("utf-8") + b"\0")
+        h.update(path.read_bytes())
+    return h.hexdigest()
+
+
+class Manifest:
+    """
+    Results of the previous run, keyed by path and stat data.
+
+    A file whose mtime, size and inode are unchanged is not read again;
+    its recorded diagnostics and fingerprints are reused. The manifest is
+    discarded wholesale when the configuration or the checker changes
+    (see checker_digest()); VERSION only tracks the file layout.
+    """
+
+    VERSION = 3
+
+    def __init__(self, config_key: str):
+        self.config_key = config_key
+        self.hits = 0
+        self.misses = 0
+        self._previous: Dict[str, List[Any]] = {}
+        self._current: Dict[str, List[Any]] = {}
+
+    @staticmethod
+    def key_for(config: Config) -> str:
+        """
+        Stable digest of the configuration (set ordering does not matter).
+        """
+        canonical = {
+            f.name: sorted(v) if isinstance(v, (set, frozenset)) else v
+            for f in fields(config)
+            for v in (getattr(config, f.name),)
+        }
+        raw = json.dumps(canonical, sort_keys=True, default=list)
+        return hashlib.blake2b(raw.encode("utf-8"), digest_size=16).hexdigest()
+
+    def lookup(self, f: SourceFile) -> Optional[Tuple[List[Diagnostic], List[int]]]:
+        entry = self._previous.get(f.path)
+        if entry is None or tuple(entry[0]) != f.stat_key:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        self._current[f.path] = entry
+        return [Diagnostic.from_json(d) for d in entry[1]], list(entry[2])
+
+    def record(self, f: SourceFile, diagnostics: List[Diagnostic], fps: List[int]) -> None:
+        self._current[f.path] = [list(f.stat_key), [d.to_json() for d in diagnostics], fps]
+
+    # ---- persistence ----
+
+    @classmethod
+    def load(cls, path: Path, config: Config) -> Manifest:
+        manifest = cls(cls.key_for(config))
+        try:
+            data = json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return manifest
+        if (
+            data.get("version") == cls.VERSION
+            and data.get("config") == manifest.config_key
+            and data.get("checker") == checker_digest()
+        ):
+            manifest._previous = data.get("files", {})
+        return manifest
+
+    def save(self, path: Path) -> None:
+        """
+        Write the entries seen in this run; files no longer checked are dropped.
+        """
+        payload = {
+            "version": self.VERSION,
+            "config": self.config_key,
+            "checker": checker_digest(),
+            "files": self._current,
+        }
+        tmp = path.with_name(path.name + ".tmp")
+        tmp.write_text(json.dumps(payload, separators=(",", ":")), encoding="utf-8")
+        os.replace(tmp, path)
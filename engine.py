@@ -2,11 +2,20 @@
 from __future__ import annotations
 
 import ast
-from typing import List
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import replace
+from time import perf_counter
+from typing import Dict, Hashable, List, Mapping, Optional
 
+from governed.budget import Budget, BudgetExceeded
 from governed.config import Config
-from governed.diagnostics import Diagnostic
+from governed.diagnostics import Diagnostic, Severity
 from governed.ast.context import Context
+from governed.index import ModuleIndex
+from governed.ir import FlatTree, lower
+from governed.metrics import Metrics
+from governed.tracing import Tracer, span
 
 # Import rule modules (implemented later)
 from governed.rules import (
@@ -18,6 +27,17 @@ from governed.rules import (
 )
 
 
+# Rule execution order is fixed and deterministic.
+# Each rule module is responsible for exactly its SPEC scope.
+RULE_MODULES = (
+    syntax,
+    capabilities,
+    secrets,
+    protocol,
+    determinism,
+)
+
+
 class CheckerEngine:
     """
     Orchestrates static checking for Governed Python.
@@ -28,41 +48,270 @@ class CheckerEngine:
       - parses the AST
       - runs rule modules in a fixed order
       - aggregates diagnostics
+
+    Every rule module receives its own Context, so rule modules share
+    nothing but the (read-only) AST. With max_workers > 1 the modules run
+    concurrently on a thread pool; this only pays off on free-threaded
+    CPython builds, but is safe everywhere. Diagnostics are returned in
+    source order (see diagnostic_order), whichever rules found them, in
+    whatever order and through whichever path (AST or IR).
+
+    The module index (governed.index) is built once per check and shared
+    read-only by all rules. With use_ir, the tree is also lowered once to
+    a flat IR (governed.ir) that rules supporting it scan instead of
+    walking the AST.
+
+    Each check runs under the per-file Budget from the config. If the
+    file is over budget, nests too deeply, or exhausts memory, checking
+    stops: diagnostics of the rules that finished are kept and an
+    incomplete() diagnostic is added.
+
+    Policy knobs of the config (strict, protocol_validation,
+    secret_protection) are applied to each rule module's diagnostics by
+    apply_policy(). check_matrix() checks one tree against several configs
+    at once: rule modules run once, and only the config-dependent part of
+    a module (its check_policy(), if it splits check() into check_shared()
+    and check_policy()) and apply_policy() run per config. A module that
+    does not split check() runs once under the first config, so it may
+    read nothing from ctx.config but the policy knobs.
+
+    With a Metrics registry, each check records its latency, the time of
+    the index build and of every rule module, and diagnostics per rule ID.
+    With a Tracer, the index build and each rule module are recorded as
+    trace spans.
     """
 
-    def __init__(self, config: Config):
+    def __init__(
+        self,
+        config: Config,
+        max_workers: Optional[int] = None,
+        use_ir: bool = False,
+        metrics: Optional[Metrics] = None,
+        tracer: Optional[Tracer] = None,
+    ):
         self.config = config
+        self.max_workers = max_workers
+        self.use_ir = use_ir
+        self.metrics = metrics
+        self.tracer = tracer
+
+    def check(self, tree: ast.AST, ir: Optional[FlatTree] = None) -> List[Diagnostic]:
+        """
+        Run all checker rules against the given AST (and its IR, if given).
+        """
+        return self._check(tree, ir, {None: self.config}, split=False)[None]
+
+    def check_matrix(
+        self,
+        tree: ast.AST,
+        configs: Mapping[str, Config],
+        ir: Optional[FlatTree] = None,
+    ) -> Dict[str, List[Diagnostic]]:
+        """
+        Check the AST against several named configs, sharing the index
+        and all config-independent rule work between them.
 
-    def check(self, tree: ast.AST) -> List[Diagnostic]:
+        Each config's diagnostics equal check() with that config. The
+        budget comes from the configs, which must agree on
+        max_nodes_per_file and max_seconds_per_file (ValueError
+        otherwise); worker settings are the engine's own.
         """
-        Run all checker rules against the given AST.
+        if len({_budget_fields(config) for config in configs.values()}) > 1:
+            raise ValueError(
+                "check_matrix configs must share max_nodes_per_file and max_seconds_per_file"
+            )
+        if not configs:
+            return {}
+        return self._check(tree, ir, configs, split=True)
+
+    def _check(
+        self,
+        tree: ast.AST,
+        ir: Optional[FlatTree],
+        configs: Mapping[Hashable, Config],
+        split: bool,
+    ) -> Dict[Hashable, List[Diagnostic]]:
+        rule_modules = [m for m in RULE_MODULES if hasattr(m, "check")]
+        # Every config agrees on the budget (see check_matrix), and split
+        # modules' shared parts do not read the config at all.
+        first = next(iter(configs.values()))
+        budget = Budget.from_config(first)
+        metrics = self.metrics
+        started = perf_counter()
+        results: Dict[Hashable, List[Diagnostic]] = {key: [] for key in configs}
+
+        def collect(module, found: Optional[List[Diagnostic]]) -> None:
+            found = found or []
+            policy = getattr(module, "check_policy", None) if split else None
+            for key, config in configs.items():
+                own = found
+                if policy is not None:
+                    ctx = Context(config=config, ir=ir, index=index, budget=budget)
+                    own = found + policy(tree, ctx)
+                results[key].extend(apply_policy(module, own, config))
+
+        try:
+            with span(self.tracer, "index", "engine"):
+                index = ModuleIndex.build(tree, budget)
+            if metrics is not None:
+                metrics.observe("governed_rule_seconds", perf_counter() - started, module="index")
+            if ir is None and self.use_ir:
+                with span(self.tracer, "lower", "engine"):
+                    ir = lower(tree)
+
+            if self.max_workers is not None and self.max_workers > 1:
+                with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+                    futures = [
+                        pool.submit(self._run_rule, m, tree, ir, index, budget, split, first)
+                        for m in rule_modules
+                    ]
+                    try:
+                        for m, f in zip(rule_modules, futures):
+                            collect(m, f.result())
+                    finally:
+                        for f in futures:
+                            f.cancel()
+            else:
+                for m in rule_modules:
+                    collect(m, self._run_rule(m, tree, ir, index, budget, split, first))
+                    budget.check_time()
+        except BudgetExceeded as e:
+            failed: Optional[Diagnostic] = incomplete(e.reason)
+        except RecursionError:
+            failed = incomplete("the syntax tree nests too deeply")
+        except MemoryError:
+            failed = incomplete("out of memory")
+        else:
+            failed = None
+        for diagnostics in results.values():
+            diagnostics.sort(key=diagnostic_order)
+            if failed is not None:
+                diagnostics.append(failed)
+
+        if metrics is not None:
+            metrics.observe("governed_check_seconds", perf_counter() - started)
+            metrics.inc("governed_files_checked_total")
+            counts = Counter(d.rule_id or "" for diagnostics in results.values() for d in diagnostics)
+            for rule_id, n in counts.items():
+                metrics.inc("governed_diagnostics_total", n, rule_id=rule_id)
+        return results
+
+    def _run_rule(
+        self,
+        module,
+        tree: ast.AST,
+        ir: Optional[FlatTree] = None,
+        index: Optional[ModuleIndex] = None,
+        budget: Optional[Budget] = None,
+        shared: bool = False,
+        config: Optional[Config] = None,
+    ) -> List[Diagnostic]:
         """
-        ctx = Context(config=self.config)
-        diagnostics: List[Diagnostic] = []
-
-        # Rule execution order is fixed and deterministic.
-        # Each rule module is responsible for exactly its SPEC scope.
-        rule_modules = [
-            syntax,
-            capabilities,
-            secrets,
-            protocol,
-            determinism,
+        Run a single rule module against a fresh, rule-private Context
+        (with config, or the engine's); with shared, only its
+        config-independent part.
+        """
+        ctx = Context(config=config or self.config, ir=ir, index=index, budget=budget)
+        check = getattr(module, "check_shared", module.check) if shared else module.check
+        if self.metrics is None and self.tracer is None:
+            return check(tree, ctx)
+        name = module.__name__.rpartition(".")[2]
+        started = perf_counter()
+        try:
+            with span(self.tracer, name, "rule"):
+                return check(tree, ctx)
+        finally:
+            if self.metrics is not None:
+                self.metrics.observe("governed_rule_seconds", perf_counter() - started, module=name)
+
+
+def diagnostic_order(d: Diagnostic):
+    """
+    Sort key of the engine's output: by position, then rule ID and
+    message; diagnostics without a line come last.
+    """
+    return (d.line is None, d.line or 0, d.column or 0, d.rule_id or "", d.message)
+
+
+def _budget_fields(config: Config):
+    return config.max_nodes_per_file, config.max_seconds_per_file
+
+
+# Rule module -> the Config field that can make it lenient.
+LENIENCY_FIELDS = {
+    "protocol": "protocol_validation",
+    "secrets": "secret_protection",
+}
+
+
+def apply_policy(module, diagnostics: List[Diagnostic], config: Config) -> List[Diagnostic]:
+    """
+    Apply the config's policy knobs to one rule module's diagnostics:
+    a "lenient" module reports its errors as warnings, and a non-strict
+    config drops warnings.
+    """
+    knob = LENIENCY_FIELDS.get(module.__name__.rpartition(".")[2])
+    if knob is not None and getattr(config, knob) == "lenient":
+        diagnostics = [
+            replace(d, severity=Severity.WARNING) if d.severity is Severity.ERROR else d
+            for d in diagnostics
         ]
+    if not config.strict:
+        diagnostics = [d for d in diagnostics if d.severity is not Severity.WARNING]
+    return diagnostics
 
-        for module in rule_modules:
-            if hasattr(module, "check"):
-                diags = module.check(tree, ctx)
-                if diags:
-                    diagnostics.extend(diags)
 
-        return diagnostics
+def incomplete(reason: str) -> Diagnostic:
+    """
+    The diagnostic reported for a file that could not be fully checked.
+    """
+    return Diagnostic(
+        severity=Severity.ERROR,
+        message=f"Check incomplete: {reason}",
+        rule_id="BUDGET",
+        suggestion="Split the file, or raise max_nodes_per_file / max_seconds_per_file",
+    )
 
 
-def check_source(source: str, config: Config) -> List[Diagnostic]:
+def parse_or_incomplete(source: str, filename: str = "<unknown>", metrics: Optional[Metrics] = None):
+    """
+    Parse source, returning (tree, None), or (None, diagnostic) when the
+    parser runs out of stack or memory. SyntaxError propagates.
+    """
+    started = perf_counter()
+    try:
+        return ast.parse(source, filename=filename), None
+    except RecursionError:
+        return None, incomplete("the source nests too deeply to parse")
+    except MemoryError:
+        return None, incomplete("out of memory while parsing")
+    finally:
+        if metrics is not None:
+            metrics.observe("governed_parse_seconds", perf_counter() - started)
+
+
+def check_source(source: str, config: Config, metrics: Optional[Metrics] = None) -> List[Diagnostic]:
     """
     Convenience helper: parse source and run the checker.
     """
-    tree = ast.parse(source)
-    engine = CheckerEngine(config)
+    tree, failed = parse_or_incomplete(source, metrics=metrics)
+    if failed is not None:
+        return [failed]
+    engine = CheckerEngine(config, metrics=metrics)
     return engine.check(tree)
+
+
+def check_source_matrix(
+    source: str,
+    configs: Mapping[str, Config],
+    metrics: Optional[Metrics] = None,
+) -> Dict[str, List[Diagnostic]]:
+    """
+    Convenience helper: parse source once and check it against every config.
+    The configs must share their budget fields, as for check_matrix().
+    """
+    tree, failed = parse_or_incomplete(source, metrics=metrics)
+    if failed is not None:
+        return {name: [failed] for name in configs}
+    engine = CheckerEngine(Config(), metrics=metrics)
+    return engine.check_matrix(tree, configs)
@@ -0,0 +1,192 @@
+# governed/explorer.py
+from __future__ import annotations
+
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from governed.compiler import DISABLED, TransitionTable
+
+
+# Below this many frontier states, expanding in-process beats shipping work to a pool.
+PARALLEL_THRESHOLD = 4096
+
+
+@dataclass
+class ExplorationReport:
+    """
+    Result of a bounded exploration of one protocol.
+
+    paths counts every distinct transition sequence of length 1..depth
+    that starts at the initial state and only fires enabled transitions.
+    """
+
+    protocol: str
+    depth: int
+    paths: int = 0
+    truncated: bool = False
+    reachable: List[str] = field(default_factory=list)
+    dead_ends: List[str] = field(default_factory=list)
+    no_return: List[str] = field(default_factory=list)
+    never_enabled: List[str] = field(default_factory=list)
+
+    @property
+    def clean(self) -> bool:
+        return not (self.dead_ends or self.no_return or self.never_enabled)
+
+    def to_json(self) -> Dict[str, object]:
+        return {
+            "protocol": self.protocol,
+            "depth": self.depth,
+            "paths": self.paths,
+            "truncated": self.truncated,
+            "reachable": self.reachable,
+            "dead_ends": self.dead_ends,
+            "no_return": self.no_return,
+            "never_enabled": self.never_enabled,
+        }
+
+    def format_human(self) -> str:
+        lines = [
+            f"protocol {self.protocol}: {self.paths} path(s) up to depth {self.depth}"
+            + (" (bound reached)" if self.truncated else ""),
+            f"  reachable: {', '.join(self.reachable) or '-'}",
+        ]
+        if self.dead_ends:
+            lines.append(f"  dead ends: {', '.join(self.dead_ends)}")
+        if self.no_return:
+            lines.append(f"  never return to initial: {', '.join(self.no_return)}")
+        if self.never_enabled:
+            lines.append(f"  transitions never enabled: {', '.join(self.never_enabled)}")
+        return "\n".join(lines)
+
+
+def _expand(
+    next_state: Tuple[int, ...],
+    width: int,
+    frontier: List[Tuple[int, int]],
+) -> Tuple[Dict[int, int], Set[int]]:
+    """
+    Expand (state, path count) pairs by one step.
+
+    Returns the path counts of the successor states and the transitions fired.
+    """
+    successors: Dict[int, int] = {}
+    fired: Set[int] = set()
+    for state, count in frontier:
+        base = state * width
+        for t in range(width):
+            dst = next_state[base + t]
+            if dst == DISABLED:
+                continue
+            fired.add(t)
+            successors[dst] = successors.get(dst, 0) + count
+    return successors, fired
+
+
+def _chunks(items: List[Tuple[int, int]], n: int) -> Iterable[List[Tuple[int, int]]]:
+    size = -(-len(items) // n)
+    for i in range(0, len(items), size):
+        yield items[i:i + size]
+
+
+def explore(
+    table: TransitionTable,
+    depth: int,
+    pool: Optional[ProcessPoolExecutor] = None,
+    workers: int = 1,
+    parallel_threshold: int = PARALLEL_THRESHOLD,
+) -> ExplorationReport:
+    """
+    Explore every transition sequence of a protocol up to depth steps.
+
+    Transitions are deterministic, so sequences that end in the same state
+    are merged: the search keeps one (state -> number of sequences) map per
+    level and a hashed set of visited states, and never materializes
+    individual paths. With a pool, large frontiers are split across workers.
+    """
+    report = ExplorationReport(protocol=table.name, depth=depth)
+    width = len(table.transitions)
+    if not table.states:
+        return report
+
+    visited: Set[int] = {table.initial}
+    fired: Set[int] = set()
+    frontier: Dict[int, int] = {table.initial: 1}
+
+    for _level in range(depth):
+        if not frontier or not width:
+            break
+        items = list(frontier.items())
+
+        if pool is not None and workers > 1 and len(items) >= parallel_threshold:
+            futures = [
+                pool.submit(_expand, table.next_state, width, chunk)
+                for chunk in _chunks(items, workers)
+            ]
+            successors: Dict[int, int] = {}
+            for future in futures:
+                part, part_fired = future.result()
+                fired |= part_fired
+                for state, count in part.items():
+                    successors[state] = successors.get(state, 0) + count
+        else:
+            successors, level_fired = _expand(table.next_state, width, items)
+            fired |= level_fired
+
+        report.paths += sum(successors.values())
+        visited.update(successors)
+        frontier = successors
+    else:
+        report.truncated = bool(frontier) and width > 0
+
+    order = range(len(table.states))
+    report.reachable = [table.states[s] for s in order if s in visited]
+    report.dead_ends = [
+        table.states[s] for s in order if s in visited and not table.enabled(s)
+    ]
+
+    returns = _can_reach(table, table.initial)
+    report.no_return = [table.states[s] for s in order if s in visited and s not in returns]
+    report.never_enabled = [name for t, name in enumerate(table.transitions) if t not in fired]
+    return report
+
+
+def _can_reach(table: TransitionTable, target: int) -> Set[int]:
+    """
+    States from which target is reachable in one or more steps.
+    """
+    width = len(table.transitions)
+    predecessors: Dict[int, List[int]] = {}
+    for s in range(len(table.states)):
+        for t in range(width):
+            dst = table.next_state[s * width + t]
+            if dst != DISABLED:
+                predecessors.setdefault(dst, []).append(s)
+
+    seen: Set[int] = set()
+    stack = [target]
+    while stack:
+        for pred in predecessors.get(stack.pop(), ()):
+            if pred not in seen:
+                seen.add(pred)
+                stack.append(pred)
+    return seen
+
+
+def explore_all(
+    tables: List[TransitionTable],
+    depth: int,
+    workers: int = 1,
+    parallel_threshold: int = PARALLEL_THRESHOLD,
+) -> List[ExplorationReport]:
+    """
+    Explore several protocols, sharing one process pool when workers > 1.
+    """
+    if workers <= 1:
+        return [explore(t, depth) for t in tables]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return [
+            explore(t, depth, pool=pool, workers=workers, parallel_threshold=parallel_threshold)
+            for t in tables
+        ]
@@ -0,0 +1,364 @@
+# governed/capabilities/audit.py
+"""
+Append-only, segment-file Audit backend.
+
+Events are appended as length-prefixed binary records to segment files
+in one directory. Durability uses group commit: record() only encodes
+the event and queues it, and one committer writes and fsyncs everything
+queued so far on behalf of all waiting writers. A transition that
+records an event therefore never pays for its own fsync.
+
+Segment layout: MAGIC, then one record per event:
+
+    header  <IIQ  payload length, crc32 of payload, sequence number
+    payload marshal(event)
+
+Segments are named after the first sequence number they hold and are
+rotated once they reach segment_bytes. Every index_interval records,
+a (sequence, offset) pair is appended to the segment's .idx file so
+readers can seek close to a sequence number without scanning the
+whole segment. The index is only a hint and is rebuilt-by-scan when
+it is missing or stale.
+"""
+from __future__ import annotations
+
+import bisect
+import marshal
+import mmap
+import os
+import struct
+import threading
+import zlib
+from pathlib import Path
+from typing import Any, Iterator, List, Optional, Tuple
+
+
+MAGIC = b"GPAU\x01"
+_RECORD = struct.Struct("<IIQ")
+_INDEX_ENTRY = struct.Struct("<QQ")
+
+SEGMENT_SUFFIX = ".seg"
+INDEX_SUFFIX = ".idx"
+
+SEGMENT_BYTES = 64 << 20
+INDEX_INTERVAL = 256
+FLUSH_INTERVAL = 0.05
+
+
+def _segment_name(first_seq: int) -> str:
+    return f"{first_seq:020d}"
+
+
+def _segments(directory: Path) -> List[Tuple[int, Path]]:
+    """
+    (first sequence number, path) of every segment, in order.
+    """
+    found = []
+    for path in directory.glob("*" + SEGMENT_SUFFIX):
+        try:
+            found.append((int(path.stem), path))
+        except ValueError:
+            continue
+    found.sort()
+    return found
+
+
+def _scan(buf, offset: int, end: int) -> Iterator[Tuple[int, int, int, int]]:
+    """
+    Yield (offset, sequence, payload start, payload length) of each intact
+    record from offset, stopping at the end or at the first torn record.
+    """
+    header = _RECORD.size
+    while offset + header <= end:
+        size, crc, seq = _RECORD.unpack_from(buf, offset)
+        start = offset + header
+        if start + size > end or zlib.crc32(buf[start:start + size]) != crc:
+            return
+        yield offset, seq, start, size
+        offset = start + size
+
+
+class SegmentAudit:
+    """
+    Audit capability writing to append-only segment files.
+
+    With sync=False (the default), record() returns as soon as the event
+    is queued and a background thread commits every flush_interval
+    seconds; call commit() to wait for durability explicitly. With
+    sync=True, record() returns only once the event is on disk, but
+    concurrent callers share a single write and fsync.
+
+    If a write or fsync fails, the records it covered are not reported
+    durable and the log latches into a failed state: every later
+    record(), commit() and close() raises OSError. Reopening the
+    directory recovers the intact prefix.
+    """
+
+    def __init__(
+        self,
+        directory: Path,
+        segment_bytes: int = SEGMENT_BYTES,
+        index_interval: int = INDEX_INTERVAL,
+        sync: bool = False,
+        flush_interval: Optional[float] = FLUSH_INTERVAL,
+    ):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.segment_bytes = segment_bytes
+        self.index_interval = index_interval
+        self.sync = sync
+        self.fsyncs = 0
+
+        self._cond = threading.Condition(threading.Lock())
+        self._pending: List[bytes] = []
+        self._committing = False
+        self._closed = False
+        self._failed: Optional[BaseException] = None
+
+        self._next_seq = self._recover()
+        self._durable = self._next_seq - 1
+        self._open_segment(self._next_seq)
+
+        self._stop = threading.Event()
+        self._flusher: Optional[threading.Thread] = None
+        if not sync and flush_interval:
+            self._flusher = threading.Thread(
+                target=self._flush_loop, args=(flush_interval,), name="governed-audit", daemon=True
+            )
+            self._flusher.start()
+
+    # ---- Audit capability method (see reference.METHODS) ----
+
+    def record(self, event: Any) -> int:
+        """
+        Append an event and return its sequence number.
+        """
+        payload = marshal.dumps(event)
+        crc = zlib.crc32(payload)
+        with self._cond:
+            if self._closed:
+                raise ValueError("audit log is closed")
+            self._check_failed()
+            seq = self._next_seq
+            self._next_seq += 1
+            self._pending.append(_RECORD.pack(len(payload), crc, seq) + payload)
+        if self.sync:
+            self.commit(seq)
+        return seq
+
+    # ---- durability ----
+
+    @property
+    def durable_seq(self) -> int:
+        """
+        Highest sequence number known to be on disk, or -1.
+        """
+        return self._durable
+
+    def commit(self, seq: Optional[int] = None) -> None:
+        """
+        Block until seq (default: everything recorded so far) is durable.
+
+        The first waiter becomes the committer and writes every queued
+        record with one fsync; the others wait for it and return
+        together when their records are covered.
+        """
+        with self._cond:
+            target = self._next_seq - 1 if seq is None else seq
+            self._check_failed()
+            while self._durable < target:
+                if self._committing:
+                    self._cond.wait()
+                    self._check_failed()
+                    continue
+                batch, self._pending = self._pending, []
+                last = self._next_seq - 1
+                self._committing = True
+                self._cond.release()
+                try:
+                    self._write_batch(batch)
+                except BaseException as e:
+                    # Part of the batch may be in the file: neither retry
+                    # it nor report it durable.
+                    self._cond.acquire()
+                    self._failed = e
+                    raise
+                else:
+                    self._cond.acquire()
+                    self._durable = last
+                finally:
+                    self._committing = False
+                    self._cond.notify_all()
+
+    def _check_failed(self) -> None:
+        # Called with self._cond held.
+        if self._failed is not None:
+            raise OSError(f"audit log failed to write: {self._failed!r}") from self._failed
+
+    def _write_batch(self, batch: List[bytes]) -> None:
+        chunk: List[bytes] = []
+        for rec in batch:
+            if self._size > len(MAGIC) and self._size + len(rec) > self.segment_bytes:
+                self._flush_chunk(chunk)
+                chunk = []
+                self._rotate(_RECORD.unpack_from(rec)[2])
+            if self._count % self.index_interval == 0:
+                self._index.append(_INDEX_ENTRY.pack(_RECORD.unpack_from(rec)[2], self._size))
+            chunk.append(rec)
+            self._size += len(rec)
+            self._count += 1
+        self._flush_chunk(chunk)
+
+    def _flush_chunk(self, chunk: List[bytes]) -> None:
+        if chunk:
+            self._file.write(b"".join(chunk))
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self.fsyncs += 1
+        # The index is a hint: written after the data it points at is durable.
+        if self._index:
+            self._index_file.write(b"".join(self._index))
+            self._index_file.flush()
+            self._index.clear()
+
+    def _flush_loop(self, interval: float) -> None:
+        while not self._stop.wait(interval):
+            try:
+                self.commit()
+            except OSError:
+                # Latched: the next record() or commit() raises it.
+                return
+
+    # ---- segments ----
+
+    def _open_segment(self, first_seq: int) -> None:
+        name = _segment_name(first_seq)
+        self._file = open(self.directory / (name + SEGMENT_SUFFIX), "xb")
+        self._file.write(MAGIC)
+        self._index_file = open(self.directory / (name + INDEX_SUFFIX), "wb")
+        self._index: List[bytes] = []
+        self._size = len(MAGIC)
+        self._count = 0
+
+    def _rotate(self, first_seq: int) -> None:
+        self._file.close()
+        self._index_file.close()
+        self._open_segment(first_seq)
+        _fsync_dir(self.directory)
+
+    def _recover(self) -> int:
+        """
+        Truncate a torn tail left by a crash and return the next sequence number.
+        """
+        segments = _segments(self.directory)
+        if not segments:
+            return 0
+        first, path = segments[-1]
+        with open(path, "r+b") as f:
+            data = f.read()
+            if not data.startswith(MAGIC):
+                raise ValueError(f"not a governed audit segment: {path}")
+            end, next_seq = len(MAGIC), first
+            for offset, seq, start, size in _scan(data, len(MAGIC), len(data)):
+                end, next_seq = start + size, seq + 1
+            if end < len(data):
+                f.truncate(end)
+                f.flush()
+                os.fsync(f.fileno())
+        if next_seq == first:
+            # Nothing durable in the last segment: start it afresh.
+            path.unlink()
+            path.with_suffix(INDEX_SUFFIX).unlink(missing_ok=True)
+        return next_seq
+
+    def close(self) -> None:
+        self._stop.set()
+        if self._flusher is not None:
+            self._flusher.join()
+        try:
+            self.commit()
+        finally:
+            with self._cond:
+                self._closed = True
+                self._file.close()
+                self._index_file.close()
+
+    def __enter__(self) -> SegmentAudit:
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
+
+
+def _fsync_dir(directory: Path) -> None:
+    try:
+        fd = os.open(directory, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+class AuditReader:
+    """
+    Streams events back from a segment directory.
+    """
+
+    def __init__(self, directory: Path):
+        self.directory = Path(directory)
+
+    def __iter__(self) -> Iterator[Tuple[int, Any]]:
+        return self.read_from(0)
+
+    def read_from(self, seq: int) -> Iterator[Tuple[int, Any]]:
+        """
+        Yield (sequence, event) for every durable event at or after seq.
+
+        Each segment is memory-mapped; the sparse index positions the
+        scan near seq in the first segment read.
+        """
+        segments = _segments(self.directory)
+        firsts = [first for first, _path in segments]
+        i = max(bisect.bisect_right(firsts, seq) - 1, 0)
+        for first, path in segments[i:]:
+            offset = self._seek(path, seq) if first < seq else len(MAGIC)
+            for item in self._read_segment(path, offset):
+                if item[0] >= seq:
+                    yield item
+
+    @staticmethod
+    def _seek(path: Path, seq: int) -> int:
+        try:
+            raw = path.with_suffix(INDEX_SUFFIX).read_bytes()
+        except OSError:
+            return len(MAGIC)
+        n = len(raw) // _INDEX_ENTRY.size
+        entries = [_INDEX_ENTRY.unpack_from(raw, k * _INDEX_ENTRY.size) for k in range(n)]
+        k = bisect.bisect_right(entries, (seq, 1 << 64)) - 1
+        return entries[k][1] if k >= 0 else len(MAGIC)
+
+    @staticmethod
+    def _read_segment(path: Path, offset: int) -> Iterator[Tuple[int, Any]]:
+        with open(path, "rb") as f:
+            size = os.fstat(f.fileno()).st_size
+            if size <= len(MAGIC):
+                return
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                if mm[:len(MAGIC)] != MAGIC:
+                    raise ValueError(f"not a governed audit segment: {path}")
+                if offset >= size:
+                    offset = len(MAGIC)
+                view = memoryview(mm)
+                try:
+                    records = _scan(view, offset, size)
+                    # A stale index can point past the valid data: fall back to a full scan.
+                    if offset > len(MAGIC) and next(_scan(view, offset, size), None) is None:
+                        records = _scan(view, len(MAGIC), size)
+                    for _offset, seq, start, length in records:
+                        yield seq, marshal.loads(view[start:start + length])
+                finally:
+                    view.release()
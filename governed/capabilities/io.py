@@ -0,0 +1,239 @@
+# governed/capabilities/io.py
+"""
+Buffered Io backends.
+
+Governed code cannot use async/await (S1), so any batching or overlap of
+I/O has to happen behind the capability's synchronous read/write
+surface. BufferedIo gathers writes per file and flushes them with one
+vectored write; AsyncIo additionally runs those flushes on an asyncio
+loop thread so the caller never waits on the disk, up to a bounded
+number of in-flight flushes.
+
+Both keep FileIo's semantics: paths are confined to the root, writes
+append, and a read sees every write made before it.
+"""
+from __future__ import annotations
+
+import asyncio
+import os
+import threading
+from concurrent.futures import Future
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from governed.capabilities.reference import FileIo
+
+
+BUFFER_BYTES = 1 << 16
+MAX_IN_FLIGHT = 8
+
+try:
+    IOV_MAX = os.sysconf("SC_IOV_MAX")
+except (AttributeError, OSError, ValueError):  # pragma: no cover - non-POSIX
+    IOV_MAX = 1024
+if IOV_MAX <= 0:  # pragma: no cover
+    IOV_MAX = 1024
+
+
+def _writev_all(fd: int, chunks: List[bytes]) -> None:
+    """
+    Write every chunk with as few writev calls as possible, resuming after
+    short writes.
+    """
+    if not hasattr(os, "writev"):  # pragma: no cover - Windows
+        data = memoryview(b"".join(chunks))
+        while data:
+            data = data[os.write(fd, data):]
+        return
+
+    views = [memoryview(c) for c in chunks]
+    i = 0
+    while i < len(views):
+        n = os.writev(fd, views[i:i + IOV_MAX])
+        while n:
+            size = len(views[i])
+            if n >= size:
+                n -= size
+                i += 1
+            else:
+                views[i] = views[i][n:]
+                n = 0
+
+
+class BufferedIo(FileIo):
+    """
+    Io that gathers appends per file and writes them in bulk.
+
+    A file's buffer is flushed once it holds buffer_bytes, before the file
+    is read, and on flush()/close(). Resolved paths are cached, so a
+    symlink swapped in under the root after first use is not re-checked.
+    """
+
+    def __init__(self, root: Path, buffer_bytes: int = BUFFER_BYTES):
+        super().__init__(root)
+        self.buffer_bytes = buffer_bytes
+        self._lock = threading.Lock()
+        self._buffers: Dict[Path, List[bytes]] = {}
+        self._sizes: Dict[Path, int] = {}
+        self._fds: Dict[Path, int] = {}
+        self._resolved: Dict[str, Path] = {}
+
+    def _resolve(self, path: str) -> Path:
+        full = self._resolved.get(path)
+        if full is None:
+            full = self._resolved[path] = super()._resolve(path)
+        return full
+
+    # ---- Io capability methods (see reference.METHODS) ----
+
+    def read(self, path: str) -> bytes:
+        full = self._resolve(path)
+        self._drain(full)
+        return full.read_bytes()
+
+    def write(self, path: str, data: bytes) -> int:
+        full = self._resolve(path)
+        data = bytes(data)
+        if not data:
+            return 0
+        with self._lock:
+            self._buffers.setdefault(full, []).append(data)
+            size = self._sizes.get(full, 0) + len(data)
+            self._sizes[full] = size
+            if size >= self.buffer_bytes:
+                self._submit(full, self._take(full))
+        return len(data)
+
+    # ---- flushing ----
+
+    def flush(self) -> None:
+        """
+        Write out every buffered file.
+        """
+        with self._lock:
+            for full in list(self._buffers):
+                self._submit(full, self._take(full))
+
+    def _drain(self, full: Path) -> None:
+        with self._lock:
+            if full in self._buffers:
+                self._submit(full, self._take(full))
+
+    def _take(self, full: Path) -> List[bytes]:
+        # Caller holds self._lock.
+        self._sizes.pop(full, None)
+        return self._buffers.pop(full)
+
+    def _fd(self, full: Path) -> int:
+        # Caller holds self._lock.
+        fd = self._fds.get(full)
+        if fd is None:
+            full.parent.mkdir(parents=True, exist_ok=True)
+            fd = os.open(full, os.O_WRONLY | os.O_APPEND | os.O_CREAT | getattr(os, "O_BINARY", 0), 0o666)
+            self._fds[full] = fd
+        return fd
+
+    def _submit(self, full: Path, chunks: List[bytes]) -> None:
+        _writev_all(self._fd(full), chunks)
+
+    def close(self) -> None:
+        self.flush()
+        with self._lock:
+            for fd in self._fds.values():
+                os.close(fd)
+            self._fds.clear()
+
+    def __enter__(self) -> BufferedIo:
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
+
+
+class AsyncIo(BufferedIo):
+    """
+    BufferedIo whose flushes run on a background asyncio loop.
+
+    write() returns once the data is buffered or its flush is queued.
+    At most max_in_flight flushes are outstanding; past that, write()
+    blocks until one completes, which bounds memory and applies
+    backpressure to a producer that outruns the disk. Flushes of one file
+    are applied in submission order. A failed flush is re-raised by the
+    next write, read, flush or close.
+    """
+
+    def __init__(self, root: Path, buffer_bytes: int = BUFFER_BYTES, max_in_flight: int = MAX_IN_FLIGHT):
+        super().__init__(root, buffer_bytes)
+        self.max_in_flight = max_in_flight
+        self._slots = threading.BoundedSemaphore(max_in_flight)
+        self._last: Dict[Path, Future] = {}
+        self._error: Optional[BaseException] = None
+
+        self._loop = asyncio.new_event_loop()
+        self._file_locks: Dict[Path, asyncio.Lock] = {}
+        self._thread = threading.Thread(target=self._loop.run_forever, name="governed-io", daemon=True)
+        self._thread.start()
+
+    def write(self, path: str, data: bytes) -> int:
+        self._raise_pending()
+        return super().write(path, data)
+
+    def read(self, path: str) -> bytes:
+        full = self._resolve(path)
+        self._drain(full)
+        with self._lock:
+            last = self._last.get(full)
+        if last is not None:
+            last.result()
+        self._raise_pending()
+        return full.read_bytes()
+
+    def flush(self) -> None:
+        """
+        Write out every buffered file and wait for all in-flight flushes.
+        """
+        super().flush()
+        with self._lock:
+            pending = list(self._last.values())
+        for future in pending:
+            future.result()
+        self._raise_pending()
+
+    def _submit(self, full: Path, chunks: List[bytes]) -> None:
+        # Caller holds self._lock; the loop thread never takes it.
+        self._slots.acquire()
+        coro = self._flush_file(full, self._fd(full), chunks)
+        self._last[full] = asyncio.run_coroutine_threadsafe(coro, self._loop)
+
+    async def _flush_file(self, full: Path, fd: int, chunks: List[bytes]) -> None:
+        # Runs on the loop thread. Errors are recorded, not raised, so they
+        # are visible before the future completes.
+        lock = self._file_locks.get(full)
+        if lock is None:
+            lock = self._file_locks[full] = asyncio.Lock()
+        try:
+            async with lock:
+                await self._loop.run_in_executor(None, _writev_all, fd, chunks)
+        except Exception as e:
+            if self._error is None:
+                self._error = e
+        finally:
+            self._slots.release()
+
+    def _raise_pending(self) -> None:
+        error, self._error = self._error, None
+        if error is not None:
+            raise error
+
+    def close(self) -> None:
+        try:
+            self.flush()
+        finally:
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            self._thread.join()
+            self._loop.run_until_complete(self._loop.shutdown_default_executor())
+            self._loop.close()
+            with self._lock:
+                for fd in self._fds.values():
+                    os.close(fd)
+                self._fds.clear()
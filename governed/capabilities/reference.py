@@ -0,0 +1,173 @@
+# governed/capabilities/reference.py
+"""
+Reference runtime implementations of the SPEC §2 capabilities.
+
+These are deliberately plain: they define the method surface each
+capability exposes to governed code (METHODS) and give a working
+in-process backend for every capability. Specialized backends live in
+sibling modules and implement the same methods.
+"""
+from __future__ import annotations
+
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from governed.capabilities.audit import SegmentAudit
+from governed.capabilities.rng import CounterRng
+from governed.capabilities.store import SqliteStore
+from governed.config import Config
+
+
+# Methods governed code may call on each capability (SPEC C6).
+METHODS: Dict[str, Tuple[str, ...]] = {
+    "Clock": ("now", "monotonic"),
+    "Rng": ("random", "randint", "randbytes"),
+    "Io": ("read", "write"),
+    "Store": ("get", "put", "delete"),
+    "Audit": ("record",),
+}
+
+
+class SystemClock:
+    """
+    Wall and monotonic time from the host, in integer nanoseconds.
+    """
+
+    def now(self) -> int:
+        return time.time_ns()
+
+    def monotonic(self) -> int:
+        return time.monotonic_ns()
+
+
+class SimClock:
+    """
+    Deterministic clock: starts at a fixed instant and advances a fixed
+    step on every read.
+    """
+
+    def __init__(self, start_ns: int = 0, step_ns: int = 1_000_000):
+        self._t = start_ns
+        self._step = step_ns
+
+    def now(self) -> int:
+        self._t += self._step
+        return self._t
+
+    def monotonic(self) -> int:
+        return self.now()
+
+    def advance(self, ns: int) -> None:
+        self._t += ns
+
+
+class FileIo:
+    """
+    Io confined to a root directory. Paths are relative to that root.
+    """
+
+    def __init__(self, root: Path):
+        self._root = Path(root).resolve()
+
+    def _resolve(self, path: str) -> Path:
+        full = (self._root / path).resolve()
+        if full != self._root and self._root not in full.parents:
+            raise PermissionError(f"path escapes Io root: {path}")
+        return full
+
+    def read(self, path: str) -> bytes:
+        return self._resolve(path).read_bytes()
+
+    def write(self, path: str, data: bytes) -> int:
+        full = self._resolve(path)
+        full.parent.mkdir(parents=True, exist_ok=True)
+        with open(full, "ab") as f:
+            return f.write(data)
+
+
+class MemoryStore:
+    """
+    In-process key/value Store.
+    """
+
+    def __init__(self) -> None:
+        self._data: Dict[Any, Any] = {}
+
+    def get(self, key: Any, default: Any = None) -> Any:
+        return self._data.get(key, default)
+
+    def put(self, key: Any, value: Any) -> None:
+        self._data[key] = value
+
+    def delete(self, key: Any) -> bool:
+        return self._data.pop(key, _MISSING) is not _MISSING
+
+
+_MISSING = object()
+
+
+class MemoryAudit:
+    """
+    Audit trail kept in memory, in call order.
+    """
+
+    def __init__(self) -> None:
+        self.events: List[Any] = []
+
+    def record(self, event: Any) -> int:
+        self.events.append(event)
+        return len(self.events) - 1
+
+
+@dataclass
+class Capabilities:
+    """
+    One instance of every capability, as handed to a governed entry point.
+    """
+
+    clock: Any
+    rng: Any
+    io: Any
+    store: Any
+    audit: Any
+
+    def by_name(self) -> Dict[str, Any]:
+        return {
+            "Clock": self.clock,
+            "Rng": self.rng,
+            "Io": self.io,
+            "Store": self.store,
+            "Audit": self.audit,
+        }
+
+
+def reference_capabilities(
+    config: Config,
+    io_root: Path = Path("."),
+    audit_dir: Optional[Path] = None,
+    store_path: Optional[Path] = None,
+) -> Capabilities:
+    """
+    Build the reference capability set.
+
+    With config.deterministic_test, time is simulated and the Rng is
+    seeded from config.test_seed; otherwise the host clock and an
+    OS-seeded Rng are used. Store and Audit state is kept in memory
+    unless store_path or audit_dir is given, in which case a SqliteStore
+    or SegmentAudit is opened there.
+    """
+    if config.deterministic_test:
+        clock: Any = SimClock()
+        rng = CounterRng.from_config(config)
+    else:
+        clock = SystemClock()
+        rng = CounterRng.from_entropy()
+    return Capabilities(
+        clock=clock,
+        rng=rng,
+        io=FileIo(io_root),
+        store=MemoryStore() if store_path is None else SqliteStore(store_path),
+        audit=MemoryAudit() if audit_dir is None else SegmentAudit(audit_dir),
+    )
@@ -0,0 +1,237 @@
+# governed/capabilities/replay.py
+"""
+Record and replay of capability calls.
+
+A Recorder wraps live capabilities and appends every call and its
+outcome to a binary log. A Replayer serves the same outcomes back from
+the log in the same order, without touching any real clock, randomness
+or I/O, so a recorded run can be re-executed exactly and quickly.
+
+Log layout: MAGIC, then one record per call:
+
+    header   <BBBII  capability id, method id, status, arguments length,
+                     outcome length
+    payload  encoded (args, kwargs), then encoded result-or-error
+
+Values are marshalled when marshal can encode them (None, bool, int,
+float, str, bytes and tuples/lists/dicts of those) and pickled otherwise,
+so persistent Vector and Map values can be recorded too; status flags
+say which. Arguments are encoded before the call is made, so a call that
+cannot be recorded fails without running. Failed calls are logged with
+the exception type and message and re-raised on replay.
+"""
+from __future__ import annotations
+
+import builtins
+import marshal
+import pickle
+import struct
+from pathlib import Path
+from typing import Any, BinaryIO, Dict, Tuple
+
+from governed.capabilities.reference import METHODS, Capabilities
+
+
+MAGIC = b"GPCL\x02"
+_RECORD = struct.Struct("<BBBII")
+
+_OK = 0
+_ERROR = 1
+# Status flags: the arguments or the outcome are pickled, not marshalled.
+_ARGS_PICKLED = 2
+_OUTCOME_PICKLED = 4
+
+CAPABILITY_IDS: Dict[str, int] = {name: i for i, name in enumerate(METHODS)}
+_CAPABILITY_NAMES: Tuple[str, ...] = tuple(METHODS)
+
+
+class ReplayDivergence(RuntimeError):
+    """
+    Replayed code made a call that does not match the recorded log.
+    """
+
+
+class Recorder:
+    """
+    Appends capability calls to a log file.
+    """
+
+    def __init__(self, path: Path, buffer_size: int = 1 << 16):
+        self._file: BinaryIO = open(path, "wb", buffering=buffer_size)
+        self._file.write(MAGIC)
+
+    def wrap(self, name: str, impl: Any) -> Any:
+        return _Recording(self, name, impl)
+
+    def wrap_all(self, caps: Capabilities) -> Capabilities:
+        return Capabilities(
+            clock=self.wrap("Clock", caps.clock),
+            rng=self.wrap("Rng", caps.rng),
+            io=self.wrap("Io", caps.io),
+            store=self.wrap("Store", caps.store),
+            audit=self.wrap("Audit", caps.audit),
+        )
+
+    def _append(self, cap: int, method: int, status: int, args: bytes, outcome: Any) -> None:
+        pickled, data = _encode(outcome)
+        if pickled:
+            status |= _OUTCOME_PICKLED
+        self._file.write(_RECORD.pack(cap, method, status, len(args), len(data)))
+        self._file.write(args)
+        self._file.write(data)
+
+    def flush(self) -> None:
+        self._file.flush()
+
+    def close(self) -> None:
+        self._file.close()
+
+    def __enter__(self) -> Recorder:
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
+
+
+class Replayer:
+    """
+    Serves recorded capability outcomes back in call order.
+    """
+
+    def __init__(self, path: Path):
+        raw = Path(path).read_bytes()
+        if not raw.startswith(MAGIC):
+            raise ValueError("not a governed capability log")
+        self._raw = memoryview(raw)
+        self._offset = len(MAGIC)
+
+    def wrap(self, name: str) -> Any:
+        return _Replaying(self, name)
+
+    def wrap_all(self) -> Capabilities:
+        return Capabilities(
+            clock=self.wrap("Clock"),
+            rng=self.wrap("Rng"),
+            io=self.wrap("Io"),
+            store=self.wrap("Store"),
+            audit=self.wrap("Audit"),
+        )
+
+    @property
+    def exhausted(self) -> bool:
+        return self._offset >= len(self._raw)
+
+    def _next(self, cap: int, method: int, args: tuple, kwargs: dict) -> Any:
+        if self.exhausted:
+            raise ReplayDivergence(f"log exhausted at {_describe(cap, method)}")
+        raw = self._raw
+        start = self._offset + _RECORD.size
+        if start > len(raw):
+            raise ReplayDivergence(f"log truncated at {_describe(cap, method)}")
+        rec_cap, rec_method, status, args_size, size = _RECORD.unpack_from(raw, self._offset)
+        middle = start + args_size
+        end = middle + size
+        if end > len(raw):
+            raise ReplayDivergence(f"log truncated at {_describe(cap, method)}")
+        self._offset = end
+
+        if (rec_cap, rec_method) != (cap, method):
+            raise ReplayDivergence(
+                f"expected {_describe(rec_cap, rec_method)}, got {_describe(cap, method)}"
+            )
+        rec_args, rec_kwargs = _decode(status & _ARGS_PICKLED, raw[start:middle])
+        if rec_args != args or rec_kwargs != kwargs:
+            raise ReplayDivergence(f"arguments of {_describe(cap, method)} differ from the log")
+
+        outcome = _decode(status & _OUTCOME_PICKLED, raw[middle:end])
+        if status & _ERROR:
+            raise _rebuild_error(*outcome)
+        return outcome
+
+
+def _describe(cap: int, method: int) -> str:
+    name = _CAPABILITY_NAMES[cap]
+    return f"{name}.{METHODS[name][method]}"
+
+
+def _rebuild_error(type_name: str, message: str) -> BaseException:
+    exc_type = getattr(builtins, type_name, None)
+    if isinstance(exc_type, type) and issubclass(exc_type, Exception):
+        return exc_type(message)
+    return RuntimeError(f"{type_name}: {message}")
+
+
+def _encode(value: Any) -> Tuple[bool, bytes]:
+    """
+    Encode a value for the log, returning (pickled, data). Raises
+    TypeError if the value can be neither marshalled nor pickled.
+    """
+    try:
+        return False, marshal.dumps(value)
+    except ValueError:
+        pass
+    try:
+        return True, pickle.dumps(value, pickle.HIGHEST_PROTOCOL)
+    except (pickle.PicklingError, TypeError, AttributeError) as e:
+        raise TypeError(f"cannot record {type(value).__name__}: {e}") from None
+
+
+def _decode(pickled: int, data: memoryview) -> Any:
+    return pickle.loads(data) if pickled else marshal.loads(data)
+
+
+def _normalize(args: tuple, kwargs: dict) -> Tuple[tuple, dict]:
+    # Round-trip through the log encoding so replay compares exactly what
+    # was logged.
+    pickled, data = _encode((args, kwargs))
+    return _decode(pickled, data)
+
+
+class _Recording:
+    """
+    Proxy that forwards whitelisted methods to a live capability and logs them.
+    """
+
+    def __init__(self, recorder: Recorder, name: str, impl: Any):
+        cap = CAPABILITY_IDS[name]
+        for method_id, method in enumerate(METHODS[name]):
+            setattr(self, method, self._bind(recorder, cap, method_id, getattr(impl, method)))
+
+    @staticmethod
+    def _bind(recorder: Recorder, cap: int, method_id: int, fn: Any):
+        append = recorder._append
+
+        def call(*args: Any, **kwargs: Any) -> Any:
+            # Encode the arguments first: a call that cannot be logged
+            # must not reach the live capability.
+            pickled, encoded = _encode((args, kwargs))
+            flags = _ARGS_PICKLED if pickled else 0
+            try:
+                result = fn(*args, **kwargs)
+            except Exception as e:
+                append(cap, method_id, _ERROR | flags, encoded, (type(e).__name__, str(e)))
+                raise
+            append(cap, method_id, _OK | flags, encoded, result)
+            return result
+
+        return call
+
+
+class _Replaying:
+    """
+    Proxy that answers whitelisted methods from a Replayer.
+    """
+
+    def __init__(self, replayer: Replayer, name: str):
+        cap = CAPABILITY_IDS[name]
+        for method_id, method in enumerate(METHODS[name]):
+            setattr(self, method, self._bind(replayer, cap, method_id))
+
+    @staticmethod
+    def _bind(replayer: Replayer, cap: int, method_id: int):
+        next_ = replayer._next
+
+        def call(*args: Any, **kwargs: Any) -> Any:
+            return next_(cap, method_id, *_normalize(args, kwargs))
+
+        return call
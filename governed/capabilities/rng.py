@@ -0,0 +1,177 @@
+# governed/capabilities/rng.py
+"""
+Counter-based, splittable Rng capability (SplitMix64 family).
+
+Draw i of a stream is a pure function of (seed, gamma, i):
+
+    mix64(seed + gamma * i)
+
+so jumping ahead is an O(1) counter bump, batches can be generated
+without any sequential dependency, and split() derives a statistically
+independent child stream (new seed and gamma) in O(1) without locks.
+Parallel workers should each take their own split() of a common root.
+"""
+from __future__ import annotations
+
+import os
+import sys
+from array import array
+from governed.config import Config
+
+try:  # Optional: vectorized batch draws.
+    import numpy as _np
+except ImportError:  # pragma: no cover - exercised only without NumPy
+    _np = None
+
+
+_M64 = (1 << 64) - 1
+GOLDEN_GAMMA = 0x9E3779B97F4A7C15
+_DOUBLE_UNIT = 1.0 / (1 << 53)
+
+# Batches at least this large use NumPy when it is installed.
+VECTOR_THRESHOLD = 256
+
+
+def mix64(z: int) -> int:
+    z = ((z ^ (z >> 30)) * 0xBF58476D1CE4E5B9) & _M64
+    z = ((z ^ (z >> 27)) * 0x94D049BB133111EB) & _M64
+    return z ^ (z >> 31)
+
+
+def _mix64_variant(z: int) -> int:
+    z = ((z ^ (z >> 33)) * 0xFF51AFD7ED558CCD) & _M64
+    z = ((z ^ (z >> 33)) * 0xC4CEB9FE1A85EC53) & _M64
+    return z ^ (z >> 33)
+
+
+def _mix_gamma(z: int) -> int:
+    z = _mix64_variant(z) | 1
+    if (z ^ (z >> 1)).bit_count() < 24:
+        z ^= 0xAAAAAAAAAAAAAAAA
+    return z
+
+
+class CounterRng:
+    """
+    Rng capability over a (seed, gamma, counter) stream.
+    """
+
+    __slots__ = ("_seed", "_gamma", "_counter")
+
+    def __init__(self, seed: int, gamma: int = GOLDEN_GAMMA, counter: int = 0):
+        self._seed = seed & _M64
+        self._gamma = (gamma | 1) & _M64
+        self._counter = counter & _M64
+
+    @classmethod
+    def from_config(cls, config: Config) -> CounterRng:
+        """
+        Seed from config.test_seed when set, otherwise from the OS.
+        """
+        if config.test_seed is None:
+            return cls.from_entropy()
+        return cls(mix64(config.test_seed & _M64))
+
+    @classmethod
+    def from_entropy(cls) -> CounterRng:
+        return cls(int.from_bytes(os.urandom(8), "little"))
+
+    @property
+    def counter(self) -> int:
+        return self._counter
+
+    # ---- core draws ----
+
+    def next_u64(self) -> int:
+        c = self._counter
+        self._counter = (c + 1) & _M64
+        return mix64((self._seed + self._gamma * c) & _M64)
+
+    def jump(self, n: int) -> None:
+        """
+        Skip n draws in O(1).
+        """
+        self._counter = (self._counter + n) & _M64
+
+    def split(self) -> CounterRng:
+        """
+        Derive an independent child stream; advances this stream by two draws.
+        """
+        seed = self.next_u64()
+        gamma = _mix_gamma(self.next_u64())
+        return CounterRng(seed, gamma)
+
+    # ---- Rng capability methods (see reference.METHODS) ----
+
+    def random(self) -> float:
+        return (self.next_u64() >> 11) * _DOUBLE_UNIT
+
+    def randint(self, a: int, b: int) -> int:
+        """
+        Uniform integer in [a, b], without modulo bias.
+        """
+        if a > b:
+            raise ValueError(f"empty range for randint({a}, {b})")
+        span = b - a + 1
+        if span > _M64:
+            bits = span.bit_length()
+            while True:
+                r = 0
+                for _ in range(0, bits, 64):
+                    r = (r << 64) | self.next_u64()
+                r >>= (-bits) % 64
+                if r < span:
+                    return a + r
+        # Reject the top partial bucket of the 64-bit range.
+        limit = (1 << 64) - ((1 << 64) % span)
+        while True:
+            r = self.next_u64()
+            if r < limit:
+                return a + r % span
+
+    def randbytes(self, n: int) -> bytes:
+        words = self.u64_batch(-(-n // 8))
+        if sys.byteorder != "little":
+            words.byteswap()
+        return words.tobytes()[:n]
+
+    # ---- batched draws ----
+
+    def fill_u64(self, out: array) -> array:
+        """
+        Fill an array('Q') with consecutive draws in one call.
+        """
+        n = len(out)
+        start = self._counter
+        self._counter = (start + n) & _M64
+        if _np is not None and n >= VECTOR_THRESHOLD:
+            out[:] = array("Q", _vector_u64(self._seed, self._gamma, start, n).tobytes())
+            return out
+
+        seed, gamma = self._seed, self._gamma
+        for i in range(n):
+            z = (seed + gamma * ((start + i) & _M64)) & _M64
+            z = ((z ^ (z >> 30)) * 0xBF58476D1CE4E5B9) & _M64
+            z = ((z ^ (z >> 27)) * 0x94D049BB133111EB) & _M64
+            out[i] = z ^ (z >> 31)
+        return out
+
+    def u64_batch(self, n: int) -> array:
+        return self.fill_u64(array("Q", bytes(8 * n)))
+
+    def random_batch(self, n: int) -> array:
+        """
+        n floats in [0, 1) as an array('d').
+        """
+        words = self.u64_batch(n)
+        unit = _DOUBLE_UNIT
+        return array("d", [(w >> 11) * unit for w in words])
+
+
+def _vector_u64(seed: int, gamma: int, start: int, n: int):
+    u64 = _np.uint64
+    counters = _np.arange(n, dtype=_np.uint64) + u64(start)
+    z = u64(seed) + u64(gamma) * counters
+    z = (z ^ (z >> u64(30))) * u64(0xBF58476D1CE4E5B9)
+    z = (z ^ (z >> u64(27))) * u64(0x94D049BB133111EB)
+    return z ^ (z >> u64(31))
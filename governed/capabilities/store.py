@@ -0,0 +1,232 @@
+# governed/capabilities/store.py
+"""
+Embedded Store backend on sqlite3 in WAL mode.
+
+Values are stored as marshal blobs, so they must be marshal-able (None,
+bool, int, float, str, bytes and tuples/lists/dicts of those). Keys are None, bool, int, float, str, bytes or
+tuples of those, stored in a canonical type-tagged encoding: marshal
+output depends on string interning and reference counts, so equal keys
+could map to different rows.
+
+Writes are buffered and applied batch_size at a time in one transaction;
+reads check a bounded LRU cache first, then buffered writes, then the
+database. The cache holds encoded values, decoded on every hit, so
+mutating a value after put() or get() cannot change what is stored. snapshot() gives a consistent read-only view for the length
+of a protocol step while writes continue.
+"""
+from __future__ import annotations
+
+import marshal
+import sqlite3
+import struct
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+
+BATCH_SIZE = 256
+CACHE_SIZE = 4096
+
+_SCHEMA = "CREATE TABLE IF NOT EXISTS store (key BLOB PRIMARY KEY, value BLOB NOT NULL) WITHOUT ROWID"
+
+# Marks a buffered delete, and an absent key in the read cache.
+# Everything else in the buffer and the cache is a marshal blob.
+_DELETED = object()
+
+
+def _encode_key(key: Any) -> bytes:
+    """
+    Canonical bytes of a key: equal keys of the same types encode equally.
+    Raises TypeError for other types.
+    """
+    out = bytearray()
+    _encode_into(out, key)
+    return bytes(out)
+
+
+def _encode_into(out: bytearray, key: Any) -> None:
+    # One tag byte per value; variable-length payloads are length-prefixed
+    # so tuple items never run into each other.
+    if key is None:
+        out += b"N"
+    elif key is True or key is False:
+        out += b"T" if key else b"F"
+    elif type(key) is int:
+        raw = str(key).encode("ascii")
+        out += b"I" + struct.pack("<I", len(raw)) + raw
+    elif type(key) is float:
+        out += b"D" + struct.pack("<d", key)
+    elif type(key) is str:
+        raw = key.encode("utf-8", errors="surrogatepass")
+        out += b"S" + struct.pack("<I", len(raw)) + raw
+    elif type(key) is bytes:
+        out += b"B" + struct.pack("<I", len(key)) + key
+    elif type(key) is tuple:
+        out += b"U" + struct.pack("<I", len(key))
+        for item in key:
+            _encode_into(out, item)
+    else:
+        raise TypeError(f"unsupported Store key type: {type(key).__name__}")
+
+
+def _connect(path: Path) -> sqlite3.Connection:
+    conn = sqlite3.connect(str(path), isolation_level=None, check_same_thread=False)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    return conn
+
+
+class SqliteStore:
+    """
+    Store capability backed by one sqlite3 database file.
+    """
+
+    def __init__(self, path: Path, batch_size: int = BATCH_SIZE, cache_size: int = CACHE_SIZE):
+        self.path = Path(path)
+        self.batch_size = batch_size
+        self.cache_size = cache_size
+        self.cache_hits = 0
+        self.cache_misses = 0
+
+        self._lock = threading.RLock()
+        self._conn = _connect(self.path)
+        self._conn.execute(_SCHEMA)
+        self._pending: Dict[bytes, Any] = {}
+        self._cache: OrderedDict[bytes, Any] = OrderedDict()
+
+    # ---- Store capability methods (see reference.METHODS) ----
+
+    def get(self, key: Any, default: Any = None) -> Any:
+        k = _encode_key(key)
+        with self._lock:
+            blob = self._lookup(k)
+        return default if blob is _DELETED else marshal.loads(blob)
+
+    def put(self, key: Any, value: Any) -> None:
+        k = _encode_key(key)
+        blob = marshal.dumps(value)
+        with self._lock:
+            self._pending[k] = blob
+            self._cache_put(k, blob)
+            if len(self._pending) >= self.batch_size:
+                self.commit()
+
+    def delete(self, key: Any) -> bool:
+        k = _encode_key(key)
+        with self._lock:
+            existed = self._lookup(k) is not _DELETED
+            if existed:
+                self._pending[k] = _DELETED
+                self._cache_put(k, _DELETED)
+                if len(self._pending) >= self.batch_size:
+                    self.commit()
+            return existed
+
+    # ---- reads ----
+
+    def _lookup(self, k: bytes) -> Any:
+        """
+        Return the marshal blob stored under k, or _DELETED.
+        """
+        cache = self._cache
+        if k in cache:
+            self.cache_hits += 1
+            cache.move_to_end(k)
+            return cache[k]
+
+        self.cache_misses += 1
+        blob = self._pending.get(k)
+        if blob is None:
+            row = self._conn.execute("SELECT value FROM store WHERE key = ?", (k,)).fetchone()
+            blob = _DELETED if row is None else row[0]
+        self._cache_put(k, blob)
+        return blob
+
+    def _cache_put(self, k: bytes, blob: Any) -> None:
+        if not self.cache_size:
+            return
+        cache = self._cache
+        cache[k] = blob
+        cache.move_to_end(k)
+        if len(cache) > self.cache_size:
+            cache.popitem(last=False)
+
+    # ---- writes ----
+
+    def commit(self) -> None:
+        """
+        Apply every buffered write in one transaction.
+        """
+        with self._lock:
+            if not self._pending:
+                return
+            puts = [(k, v) for k, v in self._pending.items() if v is not _DELETED]
+            deletes = [(k,) for k, v in self._pending.items() if v is _DELETED]
+            conn = self._conn
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                if puts:
+                    conn.executemany("INSERT OR REPLACE INTO store (key, value) VALUES (?, ?)", puts)
+                if deletes:
+                    conn.executemany("DELETE FROM store WHERE key = ?", deletes)
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+            conn.execute("COMMIT")
+            self._pending.clear()
+
+    def snapshot(self) -> StoreSnapshot:
+        """
+        Commit buffered writes, then open a read-only view of that state.
+
+        Later writes through this store are not visible in the snapshot.
+        """
+        self.commit()
+        return StoreSnapshot(self.path)
+
+    def close(self) -> None:
+        with self._lock:
+            self.commit()
+            self._conn.close()
+
+    def __enter__(self) -> SqliteStore:
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
+
+
+class StoreSnapshot:
+    """
+    A read transaction over a SqliteStore, pinned when it is opened.
+    """
+
+    def __init__(self, path: Path):
+        self._conn: Optional[sqlite3.Connection] = _connect(path)
+        self._conn.execute("BEGIN")
+        # WAL read snapshots start at the first read, not at BEGIN.
+        self._conn.execute("SELECT 1 FROM store LIMIT 1").fetchall()
+
+    def get(self, key: Any, default: Any = None) -> Any:
+        if self._conn is None:
+            raise ValueError("snapshot is closed")
+        row = self._conn.execute(
+            "SELECT value FROM store WHERE key = ?", (_encode_key(key),)
+        ).fetchone()
+        return default if row is None else marshal.loads(row[0])
+
+    def __contains__(self, key: Any) -> bool:
+        return self.get(key, _DELETED) is not _DELETED
+
+    def close(self) -> None:
+        if self._conn is not None:
+            self._conn.execute("COMMIT")
+            self._conn.close()
+            self._conn = None
+
+    def __enter__(self) -> StoreSnapshot:
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
@@ -2,47 +2,512 @@
 from __future__ import annotations
 
 import argparse
+import ast
 import json
+import os
 import sys
 from pathlib import Path
 
 from governed.config import Config
-from governed.engine import check_source
+from governed.engine import CheckerEngine, parse_or_incomplete
 from governed.diagnostics import Severity
+from governed.baseline import MODULE_SCOPE, Baseline, fingerprint, fingerprints
+from governed.compiler import compile_protocols, emit_module
+from governed.explorer import explore_all
+from governed.discovery import Manifest, SourceFile, discover, read_source, stat_file
+from governed.importgraph import ImportGraph
+from governed.metrics import Metrics
+from governed.shard import merge_reports, parse_shard, partition, read_report
+from governed.snippet import LineIndex, render
+from governed.tracing import Tracer, span
+from governed.rules.determinism import NONDETERMINISTIC_NAMES
 
 
-def _read_file(path: Path) -> str:
+DEFAULT_BASELINE = Path(".governed-baseline")
+
+# Path argument that stands for standard input.
+STDIN = "-"
+
+
+def _read_file(f: SourceFile, tracer: Tracer | None = None) -> str | None:
+    """
+    Read a source file, or return None (after reporting) if it is unreadable.
+
+    An unreadable file must not abort the rest of a batch.
+    """
+    try:
+        with span(tracer, "read", "io", file=f.path):
+            return read_source(f.path, f.size)
+    except (OSError, UnicodeDecodeError) as e:
+        print(f"error: failed to read {f.path}: {e}", file=sys.stderr)
+        return None
+
+
+def _read_stdin() -> str | None:
     try:
-        return path.read_text(encoding="utf-8")
+        return sys.stdin.buffer.read().decode("utf-8")
+    except (OSError, UnicodeDecodeError) as e:
+        print(f"error: failed to read stdin: {e}", file=sys.stderr)
+        return None
+
+
+def _read_file_list(spec: str) -> list[str]:
+    """
+    Read a NUL-separated list of paths from a file, or from stdin if spec is '-'.
+    """
+    try:
+        if spec == STDIN:
+            raw = sys.stdin.buffer.read()
+        else:
+            raw = Path(spec).read_bytes()
     except OSError as e:
-        print(f"error: failed to read {path}: {e}", file=sys.stderr)
+        print(f"error: failed to read file list {spec}: {e}", file=sys.stderr)
+        sys.exit(1)
+    return [os.fsdecode(p) for p in raw.split(b"\0") if p]
+
+
+class _SourceLines:
+    """
+    A LineIndex per reported file for --show-source, built on first use
+    from the file on disk, or from the text of stdin input.
+    """
+
+    def __init__(self):
+        self._indexes: dict[str, LineIndex | None] = {}
+
+    def add_text(self, name: str, text: str) -> None:
+        self._indexes[name] = LineIndex.from_text(text)
+
+    def __call__(self, name: str) -> LineIndex | None:
+        if name not in self._indexes:
+            try:
+                self._indexes[name] = LineIndex.from_file(name)
+            except (OSError, ValueError):
+                self._indexes[name] = None
+        return self._indexes[name]
+
+    def close(self) -> None:
+        for index in self._indexes.values():
+            if index is not None:
+                index.close()
+        self._indexes.clear()
+
+
+def _inputs(args) -> list[str]:
+    names = [str(f) for f in args.files]
+    if args.files_from is not None:
+        names.extend(_read_file_list(args.files_from))
+    if not names:
+        print("error: no input files", file=sys.stderr)
+        sys.exit(2)
+    if names.count(STDIN) > 1 or (STDIN in names and args.files_from == STDIN):
+        print("error: stdin can only be read once", file=sys.stderr)
+        sys.exit(2)
+    return names
+
+
+def _load_baseline(path: Path) -> Baseline:
+    try:
+        return Baseline.load(path)
+    except (OSError, ValueError) as e:
+        print(f"error: failed to load baseline {path}: {e}", file=sys.stderr)
         sys.exit(1)
 
 
-def _report_human(diagnostics):
+def _check_source(
+    name: str,
+    source: str,
+    config: Config,
+    metrics: Metrics | None = None,
+    tracer: Tracer | None = None,
+):
+    """
+    Parse and check one source, returning (diagnostics, fingerprints).
+
+    Returns None (after reporting) if the source does not parse.
+    """
+    with span(tracer, "check", "file", file=name):
+        try:
+            with span(tracer, "parse", "parse"):
+                tree, failed = parse_or_incomplete(source, name, metrics)
+        except SyntaxError as e:
+            print(f"error: failed to parse {name}: {e}", file=sys.stderr)
+            return None
+        if failed is not None:
+            return [failed], [fingerprint(failed, MODULE_SCOPE)]
+        diagnostics = CheckerEngine(config, metrics=metrics, tracer=tracer).check(tree)
+        with span(tracer, "fingerprint", "engine"):
+            return diagnostics, fingerprints(tree, diagnostics)
+
+
+def _expand(name: str, config: Config, tracer: Tracer | None = None):
+    """
+    Expand one path argument into source files (directories are discovered).
+
+    Returns None (after reporting) if the path cannot be stat'ed.
+    """
+    try:
+        with span(tracer, "discover", "io", path=name):
+            if os.path.isdir(name):
+                return list(discover(name, config))
+            return [stat_file(name)]
+    except OSError as e:
+        print(f"error: failed to read {name}: {e}", file=sys.stderr)
+        return None
+
+
+def _check_inputs(
+    names: list[str],
+    config: Config,
+    stdin_filename: str | None,
+    manifest: Manifest | None = None,
+    expanded: list | None = None,
+    shard: tuple[int, int] | None = None,
+    metrics: Metrics | None = None,
+    tracer: Tracer | None = None,
+    lines: _SourceLines | None = None,
+):
+    """
+    Check every input in one process.
+
+    Returns (display name, diagnostics, fingerprints) for each input that
+    could be read and parsed; failures are reported and counted but do
+    not stop the batch. Also returns the number of failures.
+
+    With a manifest, files whose stat data is unchanged since the previous
+    run are not read at all; their recorded results are reused. If
+    expanded is given, (scan root, SourceFile) is appended to it for every
+    file found on disk.
+
+    With shard (i, N), the whole file set is still discovered but only
+    shard i of partition() is checked; paths that cannot be expanded are
+    counted as failures by shard 1 only. With lines, the text of stdin
+    input is kept for --show-source.
+    """
+    failures = 0
+    results = []
+    inputs = []
+    for name in names:
+        if name == STDIN:
+            inputs.append((name, None))
+            continue
+        files = _expand(name, config, tracer)
+        if files is None:
+            failures += 1
+            continue
+        if expanded is not None:
+            root = name if os.path.isdir(name) else os.path.dirname(name) or "."
+            expanded.extend((root, f) for f in files)
+        inputs.append((name, files))
+
+    if shard is not None:
+        index, count = shard
+        everything = [f for _name, files in inputs if files is not None for f in files]
+        mine = {f.path for f in partition(everything, count)[index - 1]}
+        inputs = [(name, [f for f in files if f.path in mine]) for name, files in inputs]
+        if index != 1:
+            failures = 0
+
+    for name, files in inputs:
+        if files is None:
+            display = stdin_filename or "<stdin>"
+            source = _read_stdin()
+            if lines is not None and source is not None:
+                lines.add_text(display, source)
+            checked = _check_source(display, source, config, metrics, tracer) if source is not None else None
+            if checked is None:
+                failures += 1
+            else:
+                results.append((display, *checked))
+            continue
+
+        for f in files:
+            checked = manifest.lookup(f) if manifest is not None else None
+            if metrics is not None and manifest is not None:
+                metrics.inc("governed_cache_misses_total" if checked is None else "governed_cache_hits_total")
+            if checked is None:
+                source = _read_file(f, tracer)
+                checked = _check_source(f.path, source, config, metrics, tracer) if source is not None else None
+                if checked is None:
+                    failures += 1
+                    continue
+                if manifest is not None:
+                    manifest.record(f, *checked)
+            results.append((f.path, *checked))
+
+    return results, failures
+
+
+def _add_transitive(results, expanded, graph_path: Path | None):
+    """
+    Append D2 diagnostics for imports that reach nondeterministic modules
+    through other scanned files. These depend on other files, so they are
+    never stored in the per-file cache.
+    """
+    graph = ImportGraph.load(graph_path) if graph_path is not None else ImportGraph()
+    graph.refresh(expanded)
+    if graph_path is not None:
+        try:
+            graph.save(graph_path)
+        except OSError as e:
+            print(f"warning: failed to write import graph {graph_path}: {e}", file=sys.stderr)
+
+    extended = []
+    for name, diagnostics, fps in results:
+        extra = graph.transitive_diagnostics(name, NONDETERMINISTIC_NAMES)
+        extended.append((
+            name,
+            diagnostics + extra,
+            fps + [fingerprint(d, MODULE_SCOPE) for d in extra],
+        ))
+    return extended
+
+
+def _report_human(results, failures: int, lines: _SourceLines | None = None):
+    diagnostics = [d for _name, diags in results for d in diags]
     errors = [d for d in diagnostics if d.severity == Severity.ERROR]
     warnings = [d for d in diagnostics if d.severity == Severity.WARNING]
 
-    for d in diagnostics:
-        print(d.format_human())
+    for name, diags in results:
+        index = lines(name) if lines is not None and diags else None
+        for d in diags:
+            text = render(d, index) if index is not None else d.format_human()
+            print(f"{name}: {text}")
 
+    if failures:
+        print(f"\n❌ {failures} file(s) could not be checked")
     if errors:
         print(f"\n❌ {len(errors)} error(s), {len(warnings)} warning(s)")
         sys.exit(1)
+    elif failures:
+        sys.exit(1)
     else:
         print(f"\n✅ check passed ({len(warnings)} warning(s))")
         sys.exit(0)
 
 
-def _report_json(diagnostics):
+def _summary(results, failures: int, shard: tuple[int, int] | None) -> dict:
+    summary = {
+        "valid": not failures and not any(
+            d.severity == Severity.ERROR for _name, diags in results for d in diags
+        ),
+    }
+    if failures:
+        summary["unchecked_files"] = failures
+    if shard is not None:
+        summary["shard"] = {"index": shard[0], "count": shard[1]}
+    return summary
+
+
+def _report_json(results, failures: int, shard: tuple[int, int] | None = None):
+    summary = _summary(results, failures, shard)
     payload = {
-        "valid": not any(d.severity == Severity.ERROR for d in diagnostics),
-        "diagnostics": [d.to_json() for d in diagnostics],
+        "valid": summary.pop("valid"),
+        "diagnostics": [
+            {"file": name, **d.to_json()} for name, diags in results for d in diags
+        ],
+        **summary,
     }
     print(json.dumps(payload, indent=2))
     sys.exit(0 if payload["valid"] else 1)
 
 
+def _report_ndjson(results, failures: int, shard: tuple[int, int] | None = None):
+    """
+    One diagnostic per line, then a {"summary": ...} line with the verdict.
+    """
+    out = sys.stdout
+    for name, diags in results:
+        for d in diags:
+            out.write(json.dumps({"file": name, **d.to_json()}) + "\n")
+    summary = _summary(results, failures, shard)
+    out.write(json.dumps({"summary": summary}) + "\n")
+    sys.exit(0 if summary["valid"] else 1)
+
+
+def _report(
+    args,
+    results,
+    failures: int,
+    shard: tuple[int, int] | None = None,
+    lines: _SourceLines | None = None,
+):
+    if getattr(args, "ndjson", False):
+        _report_ndjson(results, failures, shard)
+    elif args.command == "report" or getattr(args, "json", False):
+        _report_json(results, failures, shard)
+    else:
+        _report_human(results, failures, lines)
+
+
+def _baseline_command(args) -> None:
+    config = Config()
+    results, failures = _check_inputs(_inputs(args), config, args.stdin_filename)
+    if failures:
+        print("error: not all files could be checked; baseline left unchanged", file=sys.stderr)
+        sys.exit(1)
+
+    if args.baseline_command == "create":
+        baseline = Baseline(root=args.output.parent)
+        for name, _diagnostics, fps in results:
+            baseline.add_all(name, fps)
+        baseline.save(args.output)
+        print(f"wrote {len(baseline)} baseline entr(ies) to {args.output}")
+
+    elif args.baseline_command == "prune":
+        baseline = _load_baseline(args.baseline)
+        removed = baseline.prune((name, fps) for name, _diagnostics, fps in results)
+        baseline.save(args.baseline)
+        print(f"pruned {removed} fixed entr(ies); {len(baseline)} remain in {args.baseline}")
+
+
+def _check_command(args, tracer: Tracer | None = None) -> None:
+    config = Config()
+    names = _inputs(args)
+    shard = None
+    if getattr(args, "shard", None) is not None:
+        try:
+            shard = parse_shard(args.shard)
+        except ValueError as e:
+            print(f"error: --shard: {e}", file=sys.stderr)
+            sys.exit(2)
+        if STDIN in names:
+            print("error: --shard cannot be combined with stdin input", file=sys.stderr)
+            sys.exit(2)
+    cache_path = getattr(args, "cache", None)
+    manifest = Manifest.load(cache_path, config) if cache_path is not None else None
+
+    graph_path = getattr(args, "graph_cache", None)
+    transitive = getattr(args, "transitive", False) or graph_path is not None
+    expanded: list | None = [] if transitive else None
+
+    metrics_path = getattr(args, "metrics_file", None)
+    metrics = Metrics() if metrics_path is not None else None
+
+    lines = _SourceLines() if getattr(args, "show_source", False) else None
+    results, failures = _check_inputs(
+        names, config, args.stdin_filename, manifest, expanded, shard, metrics, tracer, lines
+    )
+    if metrics is not None:
+        try:
+            metrics.write_textfile(metrics_path)
+        except OSError as e:
+            print(f"warning: failed to write metrics {metrics_path}: {e}", file=sys.stderr)
+    if manifest is not None:
+        try:
+            manifest.save(cache_path)
+        except OSError as e:
+            print(f"warning: failed to write cache {cache_path}: {e}", file=sys.stderr)
+    if transitive:
+        with span(tracer, "transitive", "engine"):
+            results = _add_transitive(results, expanded, graph_path)
+
+    baseline_path = getattr(args, "baseline", None)
+    if baseline_path is not None:
+        baseline = _load_baseline(baseline_path)
+        results = [
+            (name, baseline.filter_new(name, diagnostics, fps), fps)
+            for name, diagnostics, fps in results
+        ]
+
+    reported = [(name, diagnostics) for name, diagnostics, _fps in results]
+    try:
+        with span(tracer, "report", "io"):
+            _report(args, reported, failures, shard, lines)
+    finally:
+        if lines is not None:
+            lines.close()
+
+
+def _merge_command(args) -> None:
+    reports = []
+    for path in args.reports:
+        try:
+            reports.append(read_report(path))
+        except (OSError, ValueError) as e:
+            print(f"error: failed to read report {path}: {e}", file=sys.stderr)
+            sys.exit(1)
+    try:
+        results, failures = merge_reports(reports)
+    except ValueError as e:
+        print(f"error: cannot merge reports: {e}", file=sys.stderr)
+        sys.exit(1)
+    _report(args, results, failures)
+
+
+def _load_protocol_tables(file: str, config: Config):
+    """
+    Parse a file and lower its protocols, exiting on any error.
+    """
+    name = Path(file).as_posix()
+    source = _read_file(stat_file(file)) if file != STDIN else _read_stdin()
+    if source is None:
+        sys.exit(1)
+    try:
+        tree = ast.parse(source, filename=name)
+    except SyntaxError as e:
+        print(f"error: failed to parse {name}: {e}", file=sys.stderr)
+        sys.exit(1)
+
+    tables, diagnostics = compile_protocols(tree, config)
+    for d in diagnostics:
+        print(f"{name}: {d.format_human()}", file=sys.stderr)
+    if any(d.severity == Severity.ERROR for d in diagnostics):
+        print("error: protocol errors; nothing compiled", file=sys.stderr)
+        sys.exit(1)
+    if not tables:
+        print(f"error: no @protocol classes in {name}", file=sys.stderr)
+        sys.exit(1)
+    return name, tables
+
+
+def _compile_command(args) -> None:
+    name, tables = _load_protocol_tables(args.file, Config())
+
+    module = emit_module(tables, name)
+    if args.output is None:
+        sys.stdout.write(module)
+    else:
+        args.output.write_text(module, encoding="utf-8")
+        print(f"wrote {len(tables)} protocol table(s) to {args.output}", file=sys.stderr)
+
+
+def _explore_command(args) -> None:
+    _name, tables = _load_protocol_tables(args.file, Config())
+
+    reports = explore_all(tables, args.depth, workers=args.workers)
+    if args.json:
+        print(json.dumps({"protocols": [r.to_json() for r in reports]}, indent=2))
+    else:
+        for report in reports:
+            print(report.format_human())
+
+
+def _add_input_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument(
+        "files",
+        nargs="*",
+        metavar="PATH",
+        help="Files or directories to check ('-' reads stdin)",
+    )
+    parser.add_argument(
+        "--files-from",
+        metavar="FILE",
+        help="Read a NUL-separated list of paths from FILE ('-' reads stdin)",
+    )
+    parser.add_argument(
+        "--stdin-filename",
+        metavar="NAME",
+        help="File name to report for source read from stdin",
+    )
+
+
+def _add_format_arguments(parser: argparse.ArgumentParser) -> None:
+    formats = parser.add_mutually_exclusive_group()
+    formats.add_argument("--json", action="store_true", help="Emit JSON diagnostics")
+    formats.add_argument("--ndjson", action="store_true", help="Emit one JSON diagnostic per line")
+
+
 def main(argv: list[str] | None = None) -> None:
     parser = argparse.ArgumentParser(
         prog="governed",
@@ -51,26 +516,108 @@ def main(argv: list[str] | None = None) -> None:
 
     sub = parser.add_subparsers(dest="command", required=True)
 
-    check = sub.add_parser("check", help="Check a Python file")
-    check.add_argument("file", type=Path)
-    check.add_argument("--json", action="store_true", help="Emit JSON diagnostics")
+    check = sub.add_parser("check", help="Check Python files")
+    _add_input_arguments(check)
+    _add_format_arguments(check)
+    check.add_argument(
+        "--baseline",
+        type=Path,
+        metavar="FILE",
+        help="Only report diagnostics not recorded in this baseline file",
+    )
+    check.add_argument(
+        "--cache",
+        type=Path,
+        metavar="FILE",
+        help="Reuse results for files unchanged since the run that wrote FILE",
+    )
+    check.add_argument(
+        "--transitive",
+        action="store_true",
+        help="Also report imports that reach nondeterministic modules through other checked files",
+    )
+    check.add_argument(
+        "--graph-cache",
+        type=Path,
+        metavar="FILE",
+        help="Persist the import graph for --transitive in FILE (implies --transitive)",
+    )
+    check.add_argument(
+        "--metrics-file",
+        type=Path,
+        metavar="FILE",
+        help="Write Prometheus text-format metrics for this run to FILE",
+    )
+    check.add_argument(
+        "--show-source",
+        action="store_true",
+        help="Print the offending source line and a caret range under each diagnostic",
+    )
+    check.add_argument(
+        "--trace",
+        type=Path,
+        metavar="FILE",
+        help="Write a Chrome/Perfetto trace-event timeline of this run to FILE",
+    )
+    check.add_argument(
+        "--shard",
+        metavar="I/N",
+        help="Check only shard I of N size-balanced shards of the discovered files",
+    )
 
     report = sub.add_parser("report", help="Alias for check with --json")
-    report.add_argument("file", type=Path)
+    _add_input_arguments(report)
+
+    baseline = sub.add_parser("baseline", help="Manage the accepted-diagnostics baseline")
+    baseline_sub = baseline.add_subparsers(dest="baseline_command", required=True)
+
+    create = baseline_sub.add_parser("create", help="Record current diagnostics as accepted")
+    _add_input_arguments(create)
+    create.add_argument("-o", "--output", type=Path, default=DEFAULT_BASELINE)
+
+    prune = baseline_sub.add_parser("prune", help="Drop baseline entries that have been fixed")
+    _add_input_arguments(prune)
+    prune.add_argument("--baseline", type=Path, default=DEFAULT_BASELINE)
+
+    merge = sub.add_parser("merge", help="Combine JSON or NDJSON reports of check shards")
+    merge.add_argument("reports", nargs="+", type=Path, metavar="REPORT", help="Report files to merge")
+    _add_format_arguments(merge)
+
+    compile_ = sub.add_parser("compile", help="Compile @protocol classes to transition tables")
+    compile_.add_argument("file", metavar="FILE", help="Source file ('-' reads stdin)")
+    compile_.add_argument("-o", "--output", type=Path, help="Write the generated module here")
+
+    explore = sub.add_parser("explore", help="Explore protocol state spaces up to a depth bound")
+    explore.add_argument("file", metavar="FILE", help="Source file ('-' reads stdin)")
+    explore.add_argument("--depth", type=int, default=32, help="Maximum transition sequence length")
+    explore.add_argument("--workers", type=int, default=1, help="Processes for large frontiers")
+    explore.add_argument("--json", action="store_true", help="Emit a JSON report")
 
     args = parser.parse_args(argv)
 
     if args.command in {"check", "report"}:
-        path: Path = args.file
-        source = _read_file(path)
+        trace_path = getattr(args, "trace", None)
+        tracer = Tracer() if trace_path is not None else None
+        try:
+            _check_command(args, tracer)
+        finally:
+            if tracer is not None:
+                try:
+                    tracer.write(trace_path)
+                except OSError as e:
+                    print(f"warning: failed to write trace {trace_path}: {e}", file=sys.stderr)
 
-        config = Config()
-        diagnostics = check_source(source, config)
+    elif args.command == "baseline":
+        _baseline_command(args)
 
-        if args.command == "report" or getattr(args, "json", False):
-            _report_json(diagnostics)
-        else:
-            _report_human(diagnostics)
+    elif args.command == "merge":
+        _merge_command(args)
+
+    elif args.command == "compile":
+        _compile_command(args)
+
+    elif args.command == "explore":
+        _explore_command(args)
 
 
 if __name__ == "__main__":
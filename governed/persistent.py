@@ -0,0 +1,741 @@
+# governed/persistent.py
+"""
+Persistent immutable collections for governed code (SPEC S3).
+
+Vector is a bit-partitioned trie (32-way branching with a tail buffer) and
+Map is a hash array mapped trie (HAMT). Updates return a new collection
+that shares all untouched nodes with the old one, so append, set and
+assoc cost O(log32 n) instead of the O(n) of copying a tuple.
+
+Bulk construction goes through transients: a transient is a mutable,
+single-owner builder that edits nodes it created in place and is frozen
+back into a persistent collection with persistent().
+"""
+
+from __future__ import annotations
+
+from typing import Any, Generic, Iterable, Iterator, Tuple, TypeVar, Union
+
+T = TypeVar("T")
+K = TypeVar("K")
+V = TypeVar("V")
+
+_BITS = 5
+_WIDTH = 1 << _BITS
+_MASK = _WIDTH - 1
+_HASH_MASK = (1 << 64) - 1
+
+
+# ----------------- Vector -----------------
+
+
+class Vector(Generic[T]):
+    """
+    Persistent vector.
+
+    Trie nodes of a persistent Vector are always tuples. A transient marks
+    the nodes it owns by making them lists, and turns them back into
+    tuples when frozen, so ownership needs no extra bookkeeping.
+    """
+
+    __slots__ = ("_count", "_shift", "_root", "_tail", "_hash")
+
+    def __init__(self, items: Iterable[T] = ()):
+        if type(items) is not Vector:
+            items = TransientVector(_EMPTY_VECTOR).extend(items).persistent()
+        self._count = items._count
+        self._shift = items._shift
+        self._root = items._root
+        self._tail = items._tail
+        self._hash = None
+
+    @classmethod
+    def _make(cls, count: int, shift: int, root, tail) -> Vector:
+        v = object.__new__(cls)
+        v._count = count
+        v._shift = shift
+        v._root = root
+        v._tail = tail
+        v._hash = None
+        return v
+
+    @classmethod
+    def of(cls, *items: T) -> Vector[T]:
+        return cls(items)
+
+    # ---- reads ----
+
+    def __len__(self) -> int:
+        return self._count
+
+    def _tailoff(self) -> int:
+        if self._count < _WIDTH:
+            return 0
+        return ((self._count - 1) >> _BITS) << _BITS
+
+    def _leaf_for(self, i: int):
+        if i >= self._tailoff():
+            return self._tail
+        node = self._root
+        level = self._shift
+        while level > 0:
+            node = node[(i >> level) & _MASK]
+            level -= _BITS
+        return node
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return Vector(self[i] for i in range(*index.indices(self._count)))
+        i = index + self._count if index < 0 else index
+        if not 0 <= i < self._count:
+            raise IndexError("Vector index out of range")
+        return self._leaf_for(i)[i & _MASK]
+
+    def __iter__(self) -> Iterator[T]:
+        tailoff = self._tailoff()
+        leaf_for = self._leaf_for
+        for base in range(0, tailoff, _WIDTH):
+            yield from leaf_for(base)
+        yield from self._tail
+
+    def __reversed__(self) -> Iterator[T]:
+        for i in range(self._count - 1, -1, -1):
+            yield self[i]
+
+    def __eq__(self, other: Any) -> bool:
+        if self is other:
+            return True
+        if not isinstance(other, Vector):
+            return NotImplemented
+        return self._count == other._count and all(a == b for a, b in zip(self, other))
+
+    def __hash__(self) -> int:
+        if self._hash is None:
+            self._hash = hash(tuple(self))
+        return self._hash
+
+    def __repr__(self) -> str:
+        return f"Vector({list(self)!r})"
+
+    # ---- persistent updates ----
+
+    def append(self, value: T) -> Vector[T]:
+        count = self._count
+        if count - self._tailoff() < _WIDTH:
+            return Vector._make(count + 1, self._shift, self._root, self._tail + (value,))
+
+        shift = self._shift
+        if (count >> _BITS) > (1 << shift):
+            root = (self._root, _new_path(shift, self._tail))
+            shift += _BITS
+        else:
+            root = _push_tail(count, shift, self._root, self._tail)
+        return Vector._make(count + 1, shift, root, (value,))
+
+    def set(self, index: int, value: T) -> Vector[T]:
+        i = index + self._count if index < 0 else index
+        if i == self._count:
+            return self.append(value)
+        if not 0 <= i < self._count:
+            raise IndexError("Vector index out of range")
+
+        if i >= self._tailoff():
+            tail = list(self._tail)
+            tail[i & _MASK] = value
+            return Vector._make(self._count, self._shift, self._root, tuple(tail))
+        return Vector._make(self._count, self._shift, _assoc(self._shift, self._root, i, value), self._tail)
+
+    def pop(self) -> Vector[T]:
+        """
+        Return a vector without the last element.
+        """
+        count = self._count
+        if count == 0:
+            raise IndexError("pop from empty Vector")
+        if count == 1:
+            return _EMPTY_VECTOR
+        if count - self._tailoff() > 1:
+            return Vector._make(count - 1, self._shift, self._root, self._tail[:-1])
+
+        tail = tuple(self._leaf_for(count - 2))
+        shift = self._shift
+        root = _pop_tail(count, shift, self._root)
+        if root is None:
+            root = ()
+        if shift > _BITS and len(root) == 1:
+            root = root[0]
+            shift -= _BITS
+        return Vector._make(count - 1, shift, root, tail)
+
+    def extend(self, items: Iterable[T]) -> Vector[T]:
+        return self.transient().extend(items).persistent()
+
+    def transient(self) -> TransientVector[T]:
+        return TransientVector(self)
+
+
+def _new_path(level: int, node):
+    while level > 0:
+        node = (node,)
+        level -= _BITS
+    return node
+
+
+def _push_tail(count: int, level: int, parent, tail_node):
+    subidx = ((count - 1) >> level) & _MASK
+    if level == _BITS:
+        insert = tail_node
+    elif subidx < len(parent):
+        insert = _push_tail(count, level - _BITS, parent[subidx], tail_node)
+    else:
+        insert = _new_path(level - _BITS, tail_node)
+
+    if subidx < len(parent):
+        return parent[:subidx] + (insert,) + parent[subidx + 1:]
+    return parent + (insert,)
+
+
+def _assoc(level: int, node, i: int, value):
+    copy = list(node)
+    if level == 0:
+        copy[i & _MASK] = value
+    else:
+        subidx = (i >> level) & _MASK
+        copy[subidx] = _assoc(level - _BITS, node[subidx], i, value)
+    return tuple(copy)
+
+
+def _pop_tail(count: int, level: int, node):
+    subidx = ((count - 2) >> level) & _MASK
+    if level > _BITS:
+        child = _pop_tail(count, level - _BITS, node[subidx])
+        if child is None and subidx == 0:
+            return None
+        if child is None:
+            return node[:subidx]
+        return node[:subidx] + (child,)
+    if subidx == 0:
+        return None
+    return node[:subidx]
+
+
+class TransientVector(Generic[T]):
+    """
+    Mutable builder for a Vector.
+
+    Only nodes that are lists belong to this transient and are edited in
+    place; tuple nodes are shared with persistent vectors and are copied
+    on first write. After persistent() the transient must not be used.
+    """
+
+    __slots__ = ("_count", "_shift", "_root", "_tail", "_live")
+
+    def __init__(self, vector: Vector[T]):
+        self._count = vector._count
+        self._shift = vector._shift
+        self._root = vector._root
+        self._tail = list(vector._tail)
+        self._live = True
+
+    def __len__(self) -> int:
+        return self._count
+
+    def _check(self) -> None:
+        if not self._live:
+            raise RuntimeError("transient used after persistent()")
+
+    def _tailoff(self) -> int:
+        if self._count < _WIDTH:
+            return 0
+        return ((self._count - 1) >> _BITS) << _BITS
+
+    def append(self, value: T) -> TransientVector[T]:
+        self._check()
+        tail = self._tail
+        if len(tail) < _WIDTH:
+            tail.append(value)
+            self._count += 1
+            return self
+
+        count = self._count
+        shift = self._shift
+        if (count >> _BITS) > (1 << shift):
+            self._root = [self._root, _new_path_owned(shift, tail)]
+            self._shift = shift + _BITS
+        else:
+            root = self._root
+            if type(root) is not list:
+                root = list(root)
+            self._root = _push_tail_owned(count, shift, root, tail)
+        self._tail = [value]
+        self._count = count + 1
+        return self
+
+    def extend(self, items: Iterable[T]) -> TransientVector[T]:
+        append = self.append
+        for item in items:
+            append(item)
+        return self
+
+    def set(self, index: int, value: T) -> TransientVector[T]:
+        self._check()
+        i = index + self._count if index < 0 else index
+        if i == self._count:
+            return self.append(value)
+        if not 0 <= i < self._count:
+            raise IndexError("Vector index out of range")
+
+        if i >= self._tailoff():
+            self._tail[i & _MASK] = value
+            return self
+
+        root = self._root
+        if type(root) is not list:
+            root = self._root = list(root)
+        node = root
+        level = self._shift
+        while level > 0:
+            subidx = (i >> level) & _MASK
+            child = node[subidx]
+            if type(child) is not list:
+                child = node[subidx] = list(child)
+            node = child
+            level -= _BITS
+        node[i & _MASK] = value
+        return self
+
+    def persistent(self) -> Vector[T]:
+        self._check()
+        self._live = False
+        return Vector._make(self._count, self._shift, _freeze(self._root, self._shift), tuple(self._tail))
+
+
+def _push_tail_owned(count: int, level: int, parent: list, tail_node):
+    subidx = ((count - 1) >> level) & _MASK
+    if level == _BITS:
+        insert = tail_node
+    elif subidx < len(parent):
+        child = parent[subidx]
+        if type(child) is not list:
+            child = list(child)
+        insert = _push_tail_owned(count, level - _BITS, child, tail_node)
+    else:
+        insert = _new_path_owned(level - _BITS, tail_node)
+
+    if subidx < len(parent):
+        parent[subidx] = insert
+    else:
+        parent.append(insert)
+    return parent
+
+
+def _new_path_owned(level: int, node):
+    while level > 0:
+        node = [node]
+        level -= _BITS
+    return node
+
+
+def _freeze(node, level: int):
+    """
+    Convert the owned (list) nodes of a transient trie back into tuples.
+
+    Owned nodes always form a subtree containing the root, so the walk
+    stops at the first shared tuple on every path. Leaves (level 0) are
+    frozen but not entered: their items are user values, lists included.
+    """
+    if type(node) is not list:
+        return node
+    if level == 0:
+        return tuple(node)
+    return tuple(_freeze(child, level - _BITS) for child in node)
+
+
+_EMPTY_VECTOR = Vector._make(0, _BITS, (), ())
+
+
+# ----------------- Map -----------------
+
+
+class _Subnode:
+    """
+    Key marker for a slot that holds a child node instead of an entry.
+    """
+
+    __slots__ = ()
+
+    def __repr__(self) -> str:
+        return "<subnode>"
+
+
+_NODE = _Subnode()
+
+
+class _Box:
+    """
+    Out-parameter recording whether an edit added or removed an entry.
+    """
+
+    __slots__ = ("value",)
+
+    def __init__(self) -> None:
+        self.value = False
+
+
+class _BitmapNode:
+    """
+    HAMT node: a 32-bit occupancy bitmap and a packed key/value array.
+
+    A slot whose key is _NODE holds a child node in its value position.
+    The array is a tuple unless the node is owned by the transient whose
+    edit token it carries, in which case it is a list edited in place.
+    """
+
+    __slots__ = ("bitmap", "array", "edit")
+
+    def __init__(self, bitmap: int, array, edit):
+        self.bitmap = bitmap
+        self.array = array
+        self.edit = edit
+
+    def _editable(self, edit) -> _BitmapNode:
+        if edit is not None and self.edit is edit:
+            return self
+        return _BitmapNode(self.bitmap, list(self.array), edit)
+
+    def _done(self, edit) -> _BitmapNode:
+        if edit is None:
+            self.array = tuple(self.array)
+        return self
+
+    def assoc(self, shift: int, h: int, key, value, edit, added: _Box):
+        bit = 1 << ((h >> shift) & _MASK)
+        idx = 2 * (self.bitmap & (bit - 1)).bit_count()
+
+        if not self.bitmap & bit:
+            added.value = True
+            node = self._editable(edit)
+            node.array[idx:idx] = (key, value)
+            node.bitmap |= bit
+            return node._done(edit)
+
+        k = self.array[idx]
+        v = self.array[idx + 1]
+        if k is _NODE:
+            child = v.assoc(shift + _BITS, h, key, value, edit, added)
+            if child is v:
+                return self
+            node = self._editable(edit)
+            node.array[idx + 1] = child
+            return node._done(edit)
+
+        if k is key or k == key:
+            if v is value:
+                return self
+            node = self._editable(edit)
+            node.array[idx + 1] = value
+            return node._done(edit)
+
+        added.value = True
+        child = _pair_node(shift + _BITS, k, v, h, key, value, edit)
+        node = self._editable(edit)
+        node.array[idx] = _NODE
+        node.array[idx + 1] = child
+        return node._done(edit)
+
+    def without(self, shift: int, h: int, key, edit, removed: _Box):
+        bit = 1 << ((h >> shift) & _MASK)
+        if not self.bitmap & bit:
+            return self
+        idx = 2 * (self.bitmap & (bit - 1)).bit_count()
+
+        k = self.array[idx]
+        v = self.array[idx + 1]
+        if k is _NODE:
+            child = v.without(shift + _BITS, h, key, edit, removed)
+            if child is v:
+                return self
+            if child is not None:
+                node = self._editable(edit)
+                node.array[idx + 1] = child
+                return node._done(edit)
+        elif k is key or k == key:
+            removed.value = True
+        else:
+            return self
+
+        if self.bitmap == bit:
+            return None
+        node = self._editable(edit)
+        del node.array[idx:idx + 2]
+        node.bitmap ^= bit
+        return node._done(edit)
+
+    def iter_items(self) -> Iterator[Tuple[Any, Any]]:
+        array = self.array
+        for i in range(0, len(array), 2):
+            k = array[i]
+            if k is _NODE:
+                yield from array[i + 1].iter_items()
+            else:
+                yield k, array[i + 1]
+
+
+class _CollisionNode:
+    """
+    HAMT leaf for keys whose full 64-bit hashes collide.
+    """
+
+    __slots__ = ("hash", "array", "edit")
+
+    def __init__(self, h: int, array, edit):
+        self.hash = h
+        self.array = array
+        self.edit = edit
+
+    def _find(self, key) -> int:
+        array = self.array
+        for i in range(0, len(array), 2):
+            k = array[i]
+            if k is key or k == key:
+                return i
+        return -1
+
+    def assoc(self, shift: int, h: int, key, value, edit, added: _Box):
+        if h != self.hash:
+            # Nest this node under a bitmap node and insert beside it.
+            parent = _BitmapNode(1 << ((self.hash >> shift) & _MASK), (_NODE, self), None)
+            return parent.assoc(shift, h, key, value, edit, added)
+
+        i = self._find(key)
+        if i >= 0:
+            if self.array[i + 1] is value:
+                return self
+            array = list(self.array)
+            array[i + 1] = value
+        else:
+            added.value = True
+            array = list(self.array) + [key, value]
+        return _CollisionNode(h, array if edit is not None else tuple(array), edit)
+
+    def without(self, shift: int, h: int, key, edit, removed: _Box):
+        i = self._find(key)
+        if i < 0:
+            return self
+        removed.value = True
+        if len(self.array) == 2:
+            return None
+        array = list(self.array)
+        del array[i:i + 2]
+        return _CollisionNode(self.hash, array if edit is not None else tuple(array), edit)
+
+    def iter_items(self) -> Iterator[Tuple[Any, Any]]:
+        array = self.array
+        for i in range(0, len(array), 2):
+            yield array[i], array[i + 1]
+
+
+def _hash(key) -> int:
+    return hash(key) & _HASH_MASK
+
+
+def _pair_node(shift: int, k1, v1, h2: int, k2, v2, edit):
+    h1 = _hash(k1)
+    if h1 == h2:
+        return _CollisionNode(h1, [k1, v1, k2, v2] if edit is not None else (k1, v1, k2, v2), edit)
+    added = _Box()
+    node = _BitmapNode(0, [] if edit is not None else (), edit)
+    node = node.assoc(shift, h1, k1, v1, edit, added)
+    return node.assoc(shift, h2, k2, v2, edit, added)
+
+
+_MISSING = object()
+
+
+class Map(Generic[K, V]):
+    """
+    Persistent hash map (HAMT).
+    """
+
+    __slots__ = ("_count", "_root", "_hash")
+
+    def __init__(self, items: Union[Iterable[Tuple[K, V]], Any] = ()):
+        if type(items) is not Map:
+            items = _EMPTY_MAP.update(items)
+        self._count = items._count
+        self._root = items._root
+        self._hash = None
+
+    @classmethod
+    def _make(cls, count: int, root) -> Map:
+        m = object.__new__(cls)
+        m._count = count
+        m._root = root
+        m._hash = None
+        return m
+
+    # ---- reads ----
+
+    def __len__(self) -> int:
+        return self._count
+
+    def get(self, key: K, default: Any = None) -> Any:
+        node = self._root
+        if node is None:
+            return default
+        h = _hash(key)
+        shift = 0
+        while True:
+            if type(node) is _BitmapNode:
+                bit = 1 << ((h >> shift) & _MASK)
+                if not node.bitmap & bit:
+                    return default
+                idx = 2 * (node.bitmap & (bit - 1)).bit_count()
+                k = node.array[idx]
+                if k is _NODE:
+                    node = node.array[idx + 1]
+                    shift += _BITS
+                    continue
+                if k is key or k == key:
+                    return node.array[idx + 1]
+                return default
+            if node.hash != h:
+                return default
+            i = node._find(key)
+            return node.array[i + 1] if i >= 0 else default
+
+    def __getitem__(self, key: K) -> V:
+        value = self.get(key, _MISSING)
+        if value is _MISSING:
+            raise KeyError(key)
+        return value
+
+    def __contains__(self, key: Any) -> bool:
+        return self.get(key, _MISSING) is not _MISSING
+
+    def items(self) -> Iterator[Tuple[K, V]]:
+        if self._root is None:
+            return iter(())
+        return self._root.iter_items()
+
+    def keys(self) -> Iterator[K]:
+        return (k for k, _v in self.items())
+
+    def values(self) -> Iterator[V]:
+        return (v for _k, v in self.items())
+
+    def __iter__(self) -> Iterator[K]:
+        return self.keys()
+
+    def __eq__(self, other: Any) -> bool:
+        if self is other:
+            return True
+        if not isinstance(other, Map):
+            return NotImplemented
+        if self._count != other._count:
+            return False
+        get = other.get
+        return all(get(k, _MISSING) == v for k, v in self.items())
+
+    def __hash__(self) -> int:
+        if self._hash is None:
+            self._hash = hash(frozenset(self.items()))
+        return self._hash
+
+    def __repr__(self) -> str:
+        return f"Map({dict(self.items())!r})"
+
+    # ---- persistent updates ----
+
+    def assoc(self, key: K, value: V) -> Map[K, V]:
+        added = _Box()
+        root = self._root or _EMPTY_NODE
+        new_root = root.assoc(0, _hash(key), key, value, None, added)
+        if new_root is self._root:
+            return self
+        return Map._make(self._count + added.value, new_root)
+
+    def dissoc(self, key: K) -> Map[K, V]:
+        if self._root is None:
+            return self
+        removed = _Box()
+        new_root = self._root.without(0, _hash(key), key, None, removed)
+        if not removed.value:
+            return self
+        return Map._make(self._count - 1, new_root)
+
+    def update(self, items: Union[Iterable[Tuple[K, V]], Any]) -> Map[K, V]:
+        t = self.transient()
+        pairs = items.items() if hasattr(items, "items") else items
+        for k, v in pairs:
+            t.assoc(k, v)
+        return t.persistent()
+
+    def transient(self) -> TransientMap[K, V]:
+        return TransientMap(self)
+
+
+_EMPTY_NODE = _BitmapNode(0, (), None)
+
+
+class TransientMap(Generic[K, V]):
+    """
+    Mutable builder for a Map.
+
+    Nodes created by this transient carry its edit token and are edited
+    in place; all other nodes are copied on first write. After
+    persistent() the token is retired and the transient must not be used.
+    """
+
+    __slots__ = ("_count", "_root", "_edit")
+
+    def __init__(self, m: Map[K, V]):
+        self._count = m._count
+        self._root = m._root
+        self._edit = object()
+
+    def __len__(self) -> int:
+        return self._count
+
+    def _check(self) -> None:
+        if self._edit is None:
+            raise RuntimeError("transient used after persistent()")
+
+    def assoc(self, key: K, value: V) -> TransientMap[K, V]:
+        self._check()
+        added = _Box()
+        root = self._root or _EMPTY_NODE
+        self._root = root.assoc(0, _hash(key), key, value, self._edit, added)
+        self._count += added.value
+        return self
+
+    def dissoc(self, key: K) -> TransientMap[K, V]:
+        self._check()
+        if self._root is not None:
+            removed = _Box()
+            self._root = self._root.without(0, _hash(key), key, self._edit, removed)
+            self._count -= removed.value
+        return self
+
+    def persistent(self) -> Map[K, V]:
+        self._check()
+        self._edit = None
+        return Map._make(self._count, _freeze_map(self._root))
+
+
+def _freeze_map(node):
+    """
+    Turn list arrays left by a transient into tuples, stopping at shared nodes.
+    """
+    if node is None or type(node.array) is tuple:
+        return node
+    array = node.array
+    for i in range(0, len(array), 2):
+        if array[i] is _NODE:
+            array[i + 1] = _freeze_map(array[i + 1])
+    node.array = tuple(array)
+    node.edit = None
+    return node
+
+
+_EMPTY_MAP = Map._make(0, None)
@@ -0,0 +1,107 @@
+# governed/result.py
+"""
+Runtime Result types for governed code (SPEC R1/R2, P5).
+
+Ok and Err are plain slotted classes rather than dataclasses: creating
+one is a single attribute store, and both support structural pattern
+matching through __match_args__:
+
+    match step(state):
+        case Ok(next_state):
+            ...
+        case Err(error):
+            ...
+        case _:
+            abort(1)
+
+UNIT is a shared Ok(None) for transitions that succeed without a payload.
+"""
+from __future__ import annotations
+
+from typing import Any, Callable, Generic, TypeVar, Union
+
+T = TypeVar("T")
+E = TypeVar("E")
+U = TypeVar("U")
+
+OkT = TypeVar("OkT", bound="Ok")
+ErrT = TypeVar("ErrT", bound="Err")
+
+
+class Ok(Generic[T]):
+    """
+    Successful result carrying a value.
+    """
+
+    __slots__ = ("value",)
+    __match_args__ = ("value",)
+
+    def __init__(self, value: T):
+        self.value = value
+
+    def is_ok(self) -> bool:
+        return True
+
+    def is_err(self) -> bool:
+        return False
+
+    def unwrap(self) -> T:
+        return self.value
+
+    def unwrap_or(self, default: Any) -> T:
+        return self.value
+
+    def map(self, fn: Callable[[T], U]) -> Ok[U]:
+        return Ok(fn(self.value))
+
+    def __eq__(self, other: Any) -> bool:
+        return type(other) is Ok and self.value == other.value
+
+    def __hash__(self) -> int:
+        return hash((Ok, self.value))
+
+    def __repr__(self) -> str:
+        return f"Ok({self.value!r})"
+
+
+class Err(Generic[E]):
+    """
+    Failed result carrying an error value.
+    """
+
+    __slots__ = ("error",)
+    __match_args__ = ("error",)
+
+    def __init__(self, error: E):
+        self.error = error
+
+    def is_ok(self) -> bool:
+        return False
+
+    def is_err(self) -> bool:
+        return True
+
+    def unwrap(self) -> Any:
+        raise ValueError(f"unwrap() called on {self!r}")
+
+    def unwrap_or(self, default: U) -> U:
+        return default
+
+    def map(self, fn: Callable[[Any], Any]) -> Err[E]:
+        return self
+
+    def __eq__(self, other: Any) -> bool:
+        return type(other) is Err and self.error == other.error
+
+    def __hash__(self) -> int:
+        return hash((Err, self.error))
+
+    def __repr__(self) -> str:
+        return f"Err({self.error!r})"
+
+
+# Result[Ok[State], Err[E]] is the union of its two variants.
+Result = Union[OkT, ErrT]
+
+# Shared unit result: transitions with no payload need not allocate.
+UNIT: Ok[None] = Ok(None)
@@ -0,0 +1,58 @@
+# governed/secret.py
+"""
+Runtime Secret wrapper (SPEC SE1, SE3).
+
+The checker tracks Secret[T] statically; this wrapper backs it up at
+runtime by refusing every string conversion. Reading the value is a
+plain method returning the stored object: no copy, no check.
+"""
+from __future__ import annotations
+
+import hmac
+from typing import Any, Generic, NoReturn, TypeVar
+
+T = TypeVar("T")
+
+
+class Secret(Generic[T]):
+    """
+    Opaque holder for a sensitive value.
+
+    str(), repr(), format() and f-string interpolation raise TypeError,
+    as does pickling. Secrets are unhashable; equality on str and bytes
+    payloads is constant-time.
+    """
+
+    __slots__ = ("_value",)
+
+    def __init__(self, value: T):
+        self._value = value
+
+    def expose(self) -> T:
+        """
+        Return the wrapped value. Every call site is a reviewable disclosure.
+        """
+        return self._value
+
+    def _refuse(self, *_args: Any) -> NoReturn:
+        raise TypeError("Secret values cannot be converted to strings (SPEC SE3)")
+
+    __str__ = _refuse
+    __repr__ = _refuse
+    __format__ = _refuse
+    __bytes__ = _refuse
+
+    def __reduce__(self) -> NoReturn:
+        raise TypeError("Secret values cannot be serialized")
+
+    def __eq__(self, other: Any) -> bool:
+        if type(other) is not Secret:
+            return NotImplemented
+        a, b = self._value, other._value
+        if isinstance(a, (str, bytes)) and type(a) is type(b):
+            if isinstance(a, str):
+                a, b = a.encode("utf-8"), b.encode("utf-8")
+            return hmac.compare_digest(a, b)
+        return a == b
+
+    __hash__ = None  # type: ignore[assignment]
@@ -0,0 +1,494 @@
+# governed/importgraph.py
+"""
+Project import graph for transitive authority checks.
+
+D2 and S6 only see the imports written in the file being checked, so a
+governed module that imports a project helper which itself imports
+`time` passes. ImportGraph records the imports of every scanned file
+and answers "which external modules can this module reach?" for any
+project module.
+
+The graph is persisted with the stat data and content hash of each
+file; on the next run only files whose content changed are parsed
+again. Reachability is then recomputed in one linear pass: strongly
+connected components are condensed (iterative Tarjan) and each
+component gets a bitset of the external module roots reachable from
+it, so every query is a lookup.
+"""
+from __future__ import annotations
+
+import ast
+import hashlib
+import json
+import os
+from collections import deque
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+from governed.diagnostics import Diagnostic, Severity
+from governed.discovery import SourceFile
+
+
+# An import statement: (kind, module, names, level, line, column).
+# kind is "import" (one record per alias) or "from"; names are the
+# imported names of a "from" import.
+ImportRecord = Tuple[str, str, Tuple[str, ...], int, int, int]
+
+
+def module_name(path: str, root: str, _prefixes: Optional[Dict[Tuple[str, str], Tuple[str, ...]]] = None) -> str:
+    """
+    Dotted module name of a file.
+
+    Inside a regular package, the name starts at the outermost directory
+    that still has an __init__.py (so `check app` names app/x.py
+    "app.x"); otherwise it is relative to the scanned root.
+    """
+    prefixes = {} if _prefixes is None else _prefixes
+    directory, filename = os.path.split(os.path.abspath(path))
+    prefix = prefixes.get((directory, root))
+    if prefix is None:
+        prefix = prefixes[(directory, root)] = _package_prefix(directory, root)
+    stem = os.path.splitext(filename)[0]
+    parts = prefix if stem == "__init__" else prefix + (stem,)
+    return ".".join(parts) or Path(root).resolve().name
+
+
+def _package_prefix(directory: str, root: str) -> Tuple[str, ...]:
+    # Module path of a directory; computed once per directory by callers.
+    def is_package(d: str) -> bool:
+        return os.path.isfile(os.path.join(d, "__init__.py"))
+
+    if is_package(directory):
+        base = directory
+        while os.path.dirname(base) != base and is_package(os.path.dirname(base)):
+            base = os.path.dirname(base)
+        base = os.path.dirname(base)
+    else:
+        base = os.path.abspath(root)
+    rel = os.path.relpath(directory, base)
+    return tuple(p for p in rel.split(os.sep) if p not in (os.curdir, os.pardir))
+
+
+def extract_imports(tree: ast.AST) -> List[ImportRecord]:
+    """
+    Every import statement in a module, including nested ones.
+    """
+    records: List[ImportRecord] = []
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Import):
+            for alias in node.names:
+                records.append(("import", alias.name, (), 0, node.lineno, node.col_offset))
+        elif isinstance(node, ast.ImportFrom):
+            names = tuple(alias.name for alias in node.names if alias.name != "*")
+            records.append(("from", node.module or "", names, node.level, node.lineno, node.col_offset))
+    return records
+
+
+def _content_hash(path: str) -> str:
+    with open(path, "rb") as f:
+        return hashlib.blake2b(f.read(), digest_size=16).hexdigest()
+
+
+@dataclass
+class _FileEntry:
+    module: str
+    is_package: bool
+    stat_key: Tuple[int, int, int]
+    content_hash: str
+    imports: List[ImportRecord]
+
+
+class ImportGraph:
+    """
+    Imports of every scanned file, plus a reachability index over them.
+    """
+
+    VERSION = 1
+
+    def __init__(self) -> None:
+        self.files: Dict[str, _FileEntry] = {}
+        self.parsed = 0
+        self.rehashed = 0
+        self.reused = 0
+        self._index: Optional[_Reachability] = None
+
+    # ---- building ----
+
+    def refresh(self, sources: Iterable[Tuple[str, SourceFile]]) -> None:
+        """
+        Bring the graph up to date with (scan root, file) pairs.
+
+        Files are re-read only when their stat data changed, and re-parsed
+        only when their content hash changed. Files not listed are dropped.
+        """
+        previous, self.files = self.files, {}
+        prefixes: Dict[Tuple[str, str], Tuple[str, ...]] = {}
+        for root, f in sources:
+            module = module_name(f.path, root, prefixes)
+            is_package = Path(f.path).name == "__init__.py"
+            old = previous.get(f.path)
+            if old is not None and old.stat_key == f.stat_key and old.module == module:
+                self.files[f.path] = old
+                self.reused += 1
+                continue
+            try:
+                digest = _content_hash(f.path)
+            except OSError:
+                continue
+            if old is not None and old.content_hash == digest:
+                imports = old.imports
+                self.rehashed += 1
+            else:
+                imports = self._parse(f.path)
+                self.parsed += 1
+            self.files[f.path] = _FileEntry(module, is_package, f.stat_key, digest, imports)
+        self._index = None
+
+    @staticmethod
+    def _parse(path: str) -> List[ImportRecord]:
+        try:
+            with open(path, "rb") as f:
+                tree = ast.parse(f.read(), filename=path)
+        except (OSError, SyntaxError, ValueError):
+            return []
+        return extract_imports(tree)
+
+    # ---- queries ----
+
+    def reachable_roots(self, module: str) -> Set[str]:
+        """
+        External top-level modules reachable from a project module.
+        """
+        index = self._reachability()
+        node = index.ids.get(module)
+        return set() if node is None else index.roots_of(index.reach[index.component[node]])
+
+    def chain(self, module: str, root: str) -> List[str]:
+        """
+        A shortest import chain from module to the external root.
+        """
+        index = self._reachability()
+        start = index.ids.get(module)
+        if start is None:
+            return []
+        bit = index.root_bits.get(root)
+        if bit is None:
+            return []
+        return list(index.chain(start, bit))
+
+    def transitive_diagnostics(self, path: str, roots: Set[str], rule_id: str = "D2") -> List[Diagnostic]:
+        """
+        Diagnostics for imports in path of project modules that reach one
+        of roots indirectly. Direct imports of roots are left to the rules.
+        """
+        entry = self.files.get(path)
+        if entry is None:
+            return []
+        index = self._reachability()
+        mask = 0
+        for root in roots:
+            bit = index.root_bits.get(root)
+            if bit is not None:
+                mask |= 1 << bit
+        if not mask:
+            return []
+
+        diagnostics: List[Diagnostic] = []
+        this = index.ids.get(entry.module)
+        for record, targets in zip(entry.imports, index.resolved[path]):
+            line, column = record[4], record[5]
+            reported: Set[str] = set()
+            # Deepest module first: report `a.b.c`, not its package `a`.
+            for target in reversed(targets):
+                if target == this:
+                    continue
+                hits = index.reach[index.component[target]] & mask
+                if not hits:
+                    continue
+                for root in sorted(index.roots_of(hits) - reported):
+                    # A root reached only back through this module (say, via
+                    # its package's __init__) is this module's own import.
+                    chain = index.chain_avoiding(target, index.root_bits[root], this)
+                    if not chain:
+                        continue
+                    reported.add(root)
+                    via = " -> ".join(chain)
+                    diagnostics.append(
+                        Diagnostic(
+                            severity=Severity.ERROR,
+                            message=(
+                                f"Import of '{index.modules[target]}' transitively reaches "
+                                f"nondeterministic module '{root}' ({via})"
+                            ),
+                            rule_id=rule_id,
+                            suggestion="Pass Clock or Rng capabilities instead",
+                            line=line,
+                            column=column,
+                        )
+                    )
+        return diagnostics
+
+    def _reachability(self) -> _Reachability:
+        if self._index is None:
+            self._index = _Reachability(self.files)
+        return self._index
+
+    # ---- persistence ----
+
+    @classmethod
+    def load(cls, path: Path) -> ImportGraph:
+        graph = cls()
+        try:
+            data = json.loads(Path(path).read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return graph
+        if data.get("version") != cls.VERSION:
+            return graph
+        for file_path, (module, is_package, stat_key, digest, imports) in data.get("files", {}).items():
+            graph.files[file_path] = _FileEntry(
+                module,
+                is_package,
+                tuple(stat_key),
+                digest,
+                [(k, m, tuple(n), lvl, ln, col) for k, m, n, lvl, ln, col in imports],
+            )
+        return graph
+
+    def save(self, path: Path) -> None:
+        files = {
+            p: [e.module, e.is_package, list(e.stat_key), e.content_hash, e.imports]
+            for p, e in self.files.items()
+        }
+        payload = {"version": self.VERSION, "files": files}
+        tmp = Path(path).with_name(Path(path).name + ".tmp")
+        tmp.write_text(json.dumps(payload, separators=(",", ":")), encoding="utf-8")
+        os.replace(tmp, path)
+
+
+# next_hops() markers: the node imports the root itself / cannot reach it.
+_OWN = -1
+_UNREACHABLE = -2
+
+
+class _Reachability:
+    """
+    Resolved module graph with per-component bitsets of external roots.
+    """
+
+    def __init__(self, files: Dict[str, _FileEntry]):
+        entries = list(files.values())
+        self.modules: List[str] = []
+        self.ids: Dict[str, int] = {}
+        for e in entries:
+            if e.module not in self.ids:
+                self.ids[e.module] = len(self.modules)
+                self.modules.append(e.module)
+
+        self.root_bits: Dict[str, int] = {}
+        self._root_names: List[str] = []
+        n = len(self.modules)
+        self.own = [0] * n
+        edge_sets: List[Set[int]] = [set() for _ in range(n)]
+        # Per file, the resolved targets of each import record.
+        self.resolved: Dict[str, List[List[int]]] = {}
+        for path, e in files.items():
+            src = self.ids[e.module]
+            self.resolved[path] = per_record = []
+            for record in e.imports:
+                targets = self.targets(e, record)
+                per_record.append(targets)
+                if targets:
+                    edge_sets[src].update(t for t in targets if t != src)
+                else:
+                    root = _absolute(e, record).split(".")[0]
+                    if root:
+                        self.own[src] |= 1 << self._bit(root)
+        self.edges: List[Tuple[int, ...]] = [tuple(sorted(s)) for s in edge_sets]
+        self._reverse: Optional[List[List[int]]] = None
+        self._hops: Dict[int, List[int]] = {}
+        self._chains: Dict[Tuple[int, int], List[str]] = {}
+
+        self.component, components = _tarjan(self.edges)
+        # Tarjan emits components in reverse topological order: every
+        # successor component is finished before its predecessors.
+        self.reach = [0] * len(components)
+        for c, members in enumerate(components):
+            mask = 0
+            for v in members:
+                mask |= self.own[v]
+                for w in self.edges[v]:
+                    if self.component[w] != c:
+                        mask |= self.reach[self.component[w]]
+            self.reach[c] = mask
+
+    def next_hops(self, bit: int) -> List[int]:
+        """
+        For every node, the next module on a shortest chain to the root
+        with this bit: one multi-source BFS over reversed edges, cached.
+        """
+        hops = self._hops.get(bit)
+        if hops is None:
+            n = len(self.modules)
+            if self._reverse is None:
+                reverse: List[List[int]] = [[] for _ in range(n)]
+                for v, succ in enumerate(self.edges):
+                    for w in succ:
+                        reverse[w].append(v)
+                self._reverse = reverse
+            hops = [_UNREACHABLE] * n
+            queue = deque(v for v in range(n) if self.own[v] >> bit & 1)
+            for v in queue:
+                hops[v] = _OWN
+            while queue:
+                w = queue.popleft()
+                for v in self._reverse[w]:
+                    if hops[v] == _UNREACHABLE:
+                        hops[v] = w
+                        queue.append(v)
+            self._hops[bit] = hops
+        return hops
+
+    def chain(self, start: int, bit: int) -> List[str]:
+        """
+        Module names on a shortest chain from node start to the root with
+        this bit, ending with the root; empty if it is unreachable.
+        """
+        key = (start, bit)
+        found = self._chains.get(key)
+        if found is None:
+            hop = self.next_hops(bit)
+            if hop[start] == _UNREACHABLE:
+                found = []
+            else:
+                found = [self.modules[start]]
+                node = start
+                while hop[node] != _OWN:
+                    node = hop[node]
+                    found.append(self.modules[node])
+                found.append(self._root_names[bit])
+            self._chains[key] = found
+        return found
+
+    def chain_avoiding(self, start: int, bit: int, avoid: Optional[int]) -> List[str]:
+        """
+        chain(), but never through node avoid; empty if every chain to
+        the root passes through it.
+        """
+        found = self.chain(start, bit)
+        if avoid is None or self.modules[avoid] not in found:
+            return found
+        # Rare: search again without the avoided node (uncached).
+        parent = {start: start}
+        queue = deque([start])
+        while queue:
+            v = queue.popleft()
+            if self.own[v] >> bit & 1:
+                path = [v]
+                while path[-1] != start:
+                    path.append(parent[path[-1]])
+                return [self.modules[n] for n in reversed(path)] + [self._root_names[bit]]
+            for w in self.edges[v]:
+                if w != avoid and w not in parent:
+                    parent[w] = v
+                    queue.append(w)
+        return []
+
+    def _bit(self, root: str) -> int:
+        bit = self.root_bits.get(root)
+        if bit is None:
+            bit = self.root_bits[root] = len(self._root_names)
+            self._root_names.append(root)
+        return bit
+
+    def roots_of(self, mask: int) -> Set[str]:
+        names = set()
+        while mask:
+            low = mask & -mask
+            names.add(self._root_names[low.bit_length() - 1])
+            mask ^= low
+        return names
+
+    def targets(self, entry: _FileEntry, record: ImportRecord) -> List[int]:
+        """
+        Project modules executed by an import statement: every existing
+        package prefix of the module, and for `from` imports the imported
+        names that are themselves modules.
+        """
+        kind, _module, names, _level, _line, _col = record
+        absolute = _absolute(entry, record)
+        if not absolute:
+            return []
+        ids = self.ids
+        parts = absolute.split(".")
+        found = [ids[m] for m in (".".join(parts[:i]) for i in range(1, len(parts) + 1)) if m in ids]
+        if kind == "from":
+            found.extend(ids[f"{absolute}.{n}"] for n in names if f"{absolute}.{n}" in ids)
+        return found
+
+
+def _absolute(entry: _FileEntry, record: ImportRecord) -> str:
+    _kind, module, _names, level, _line, _col = record
+    if not level:
+        return module
+    package = entry.module.split(".") if entry.is_package else entry.module.split(".")[:-1]
+    if level > 1:
+        package = package[: len(package) - (level - 1)]
+    return ".".join([*package, module] if module else package)
+
+
+def _tarjan(edges: Sequence[Sequence[int]]) -> Tuple[List[int], List[List[int]]]:
+    """
+    Iterative Tarjan SCC. Returns (component of each node, components),
+    components in reverse topological order.
+    """
+    n = len(edges)
+    index = [-1] * n
+    low = [0] * n
+    on_stack = [False] * n
+    component = [-1] * n
+    components: List[List[int]] = []
+    stack: List[int] = []
+    counter = 0
+
+    for start in range(n):
+        if index[start] >= 0:
+            continue
+        work = [(start, 0)]
+        index[start] = low[start] = counter
+        counter += 1
+        stack.append(start)
+        on_stack[start] = True
+        while work:
+            v, i = work[-1]
+            succ = edges[v]
+            if i < len(succ):
+                work[-1] = (v, i + 1)
+                w = succ[i]
+                if index[w] < 0:
+                    index[w] = low[w] = counter
+                    counter += 1
+                    stack.append(w)
+                    on_stack[w] = True
+                    work.append((w, 0))
+                elif on_stack[w] and index[w] < low[v]:
+                    low[v] = index[w]
+                continue
+
+            work.pop()
+            if work:
+                parent = work[-1][0]
+                if low[v] < low[parent]:
+                    low[parent] = low[v]
+            if low[v] == index[v]:
+                members = []
+                while True:
+                    w = stack.pop()
+                    on_stack[w] = False
+                    component[w] = len(components)
+                    members.append(w)
+                    if w == v:
+                        break
+                components.append(members)
+
+    return component, components
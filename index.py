@@ -0,0 +1,246 @@
+# governed/index.py
+"""
+Per-module inverted index of the names rules look for.
+
+One walk over the tree records, in ast.walk order:
+
+    calls        dotted callee name ("print", "time.time") -> Call nodes
+    decorators   decorator name ("protocol", "transition") -> decorated nodes
+    annotations  annotation head ("Secret", "Clock") -> (owner, annotation)
+    imports      every imported module, with its root ("os" for "os.path")
+    node types   node class -> nodes
+
+Rules ask the index for candidate nodes instead of testing every node.
+The engine builds the index once per module and shares it read-only
+between rules through Context.index; module_index() builds it on demand
+when a rule runs outside the engine. Custom rules can use the same
+query methods.
+"""
+from __future__ import annotations
+
+import ast
+import re
+from dataclasses import dataclass
+from typing import Dict, FrozenSet, Iterable, List, Optional, Pattern, Tuple, Union
+
+from governed.ast.context import Context
+from governed.budget import Budget, walk
+
+
+Decorated = Union[ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef]
+ImportNode = Union[ast.Import, ast.ImportFrom]
+
+
+@dataclass(frozen=True, slots=True)
+class ImportRef:
+    """
+    One imported module: an alias of an Import, or the module of an
+    ImportFrom (None for a relative import without a module).
+    """
+
+    node: ImportNode
+    module: Optional[str]
+
+    @property
+    def root(self) -> Optional[str]:
+        return None if self.module is None else self.module.split(".")[0]
+
+
+def dotted_name(node: ast.AST) -> Optional[str]:
+    """
+    "a.b.c" for a Name/Attribute chain, None for anything else.
+    """
+    parts: List[str] = []
+    while isinstance(node, ast.Attribute):
+        parts.append(node.attr)
+        node = node.value
+    if not isinstance(node, ast.Name):
+        return None
+    parts.append(node.id)
+    return ".".join(reversed(parts))
+
+
+def decorator_name(dec: ast.AST) -> Optional[str]:
+    """
+    Name of a decorator expression: `@name`, `@name(...)`, `@a.b(...)`.
+    """
+    while isinstance(dec, ast.Call):
+        dec = dec.func
+    return dotted_name(dec)
+
+
+def annotation_head(node: ast.AST) -> Optional[str]:
+    """
+    Head of an annotation: "Secret" for Secret[int], "Clock" for Clock.
+    """
+    if isinstance(node, ast.Subscript):
+        node = node.value
+    return dotted_name(node)
+
+
+def _compile_pattern(pattern: str) -> Pattern[str]:
+    # "*" matches one dotted segment, "**" any number of them.
+    out = []
+    for part in re.split(r"(\*\*|\*)", pattern):
+        if part == "**":
+            out.append(r".*")
+        elif part == "*":
+            out.append(r"[^.]+")
+        else:
+            out.append(re.escape(part))
+    return re.compile("".join(out) + r"\Z")
+
+
+class ModuleIndex:
+    """
+    Query API over one module. Built once; never mutated afterwards.
+    """
+
+    def __init__(self, tree: ast.AST) -> None:
+        self._tree = tree
+        self._order: Optional[Dict[int, int]] = None
+        self._calls: Dict[str, List[ast.Call]] = {}
+        self._decorated: Dict[str, List[Decorated]] = {}
+        self._decorator_names: Dict[int, FrozenSet[str]] = {}
+        self._annotations: Dict[str, List[Tuple[ast.AST, ast.AST]]] = {}
+        self._imports: List[ImportRef] = []
+        self._by_type: Dict[type, List[ast.AST]] = {}
+
+    @classmethod
+    def build(cls, tree: ast.AST, budget: Optional[Budget] = None) -> ModuleIndex:
+        """
+        Index tree in one walk. With a budget, raises BudgetExceeded once
+        the tree has more nodes than allowed or the deadline passes.
+        """
+        index = cls(tree)
+        by_type = index._by_type
+        limit = budget.max_nodes if budget is not None and budget.max_nodes is not None else -1
+        for count, node in enumerate(walk(tree, budget), 1):
+            if count == limit + 1:
+                budget.check_nodes(count)
+            t = type(node)
+            bucket = by_type.get(t)
+            if bucket is None:
+                by_type[t] = [node]
+            else:
+                bucket.append(node)
+
+            if t is ast.Call:
+                name = dotted_name(node.func)
+                if name is not None:
+                    index._calls.setdefault(name, []).append(node)
+            elif t is ast.FunctionDef or t is ast.AsyncFunctionDef:
+                index._add_decorators(node)
+                index._add_arguments(node.args)
+                if node.returns is not None:
+                    index._add_annotation(node, node.returns)
+            elif t is ast.ClassDef:
+                index._add_decorators(node)
+            elif t is ast.AnnAssign:
+                index._add_annotation(node, node.annotation)
+            elif t is ast.Import:
+                index._imports.extend(ImportRef(node, alias.name) for alias in node.names)
+            elif t is ast.ImportFrom:
+                index._imports.append(ImportRef(node, node.module))
+        return index
+
+    def _add_decorators(self, node: Decorated) -> None:
+        names = []
+        for dec in node.decorator_list:
+            name = decorator_name(dec)
+            if name is not None:
+                names.append(name)
+                bucket = self._decorated.setdefault(name, [])
+                if not bucket or bucket[-1] is not node:
+                    bucket.append(node)
+        if names:
+            self._decorator_names[id(node)] = frozenset(names)
+
+    def _add_arguments(self, args: ast.arguments) -> None:
+        for arg in (*args.posonlyargs, *args.args, args.vararg, *args.kwonlyargs, args.kwarg):
+            if arg is not None and arg.annotation is not None:
+                self._add_annotation(arg, arg.annotation)
+
+    def _add_annotation(self, owner: ast.AST, annotation: ast.AST) -> None:
+        head = annotation_head(annotation)
+        if head is not None:
+            self._annotations.setdefault(head, []).append((owner, annotation))
+
+    # ---- queries ----
+
+    def calls(self, name: str) -> List[ast.Call]:
+        """
+        Calls whose callee is exactly the dotted name.
+        """
+        return self._calls.get(name, [])
+
+    def calls_matching(self, pattern: str) -> List[ast.Call]:
+        """
+        Calls whose dotted callee matches a pattern such as "random.*"
+        ("*" is one segment, "**" any number), in walk order.
+        """
+        if "*" not in pattern:
+            return self.calls(pattern)
+        regex = _compile_pattern(pattern)
+        return self.merge(calls for name, calls in self._calls.items() if regex.match(name))
+
+    def call_names(self) -> Iterable[str]:
+        return self._calls.keys()
+
+    def decorated(self, name: str) -> List[Decorated]:
+        return self._decorated.get(name, [])
+
+    def decorator_names(self, node: ast.AST) -> FrozenSet[str]:
+        return self._decorator_names.get(id(node), frozenset())
+
+    def has_decorator(self, node: ast.AST, name: str) -> bool:
+        return name in self._decorator_names.get(id(node), ())
+
+    def annotated(self, head: str) -> List[Tuple[ast.AST, ast.AST]]:
+        """
+        (owner, annotation) pairs whose annotation head is head. The owner
+        is an arg, an AnnAssign, or a function (for its return annotation).
+        """
+        return self._annotations.get(head, [])
+
+    def imports(self, root: Optional[str] = None) -> List[ImportRef]:
+        """
+        Every imported module in walk order, or only those under root.
+        """
+        if root is None:
+            return self._imports
+        return [ref for ref in self._imports if ref.root == root]
+
+    def of_type(self, *types: type) -> List[ast.AST]:
+        if len(types) == 1:
+            return self._by_type.get(types[0], [])
+        return self.merge(self._by_type.get(t, []) for t in types)
+
+    def merge(self, lists: Iterable[List[ast.AST]]) -> List[ast.AST]:
+        """
+        Concatenate query results, restoring walk order across them.
+        """
+        lists = [lst for lst in lists if lst]
+        if not lists:
+            return []
+        if len(lists) == 1:
+            return list(lists[0])
+        order = self._walk_order()
+        merged = [node for lst in lists for node in lst]
+        merged.sort(key=lambda n: order[id(n)])
+        return merged
+
+    def _walk_order(self) -> Dict[int, int]:
+        # Built on first use only: single-bucket queries never need it.
+        if self._order is None:
+            self._order = {id(n): rank for rank, n in enumerate(ast.walk(self._tree))}
+        return self._order
+
+
+def module_index(tree: ast.AST, ctx: Context) -> ModuleIndex:
+    """
+    The index shared through ctx, building it if the engine did not.
+    """
+    if ctx.index is None:
+        ctx.index = ModuleIndex.build(tree)
+    return ctx.index
@@ -0,0 +1,351 @@
+# governed/ir.py
+"""
+Flat, array-backed intermediate representation of a Python AST.
+
+lower() turns an ast tree into a FlatTree: one row per node, stored as
+parallel array columns instead of one Python object per node. Rows are
+in pre-order, so the subtree of node i is the contiguous range
+i .. end[i] - 1, and a scan for a node kind is a tight loop over one
+integer column (or a vectorised mask when NumPy is installed).
+
+Columns (all indexed by node id):
+
+    kind          index into KINDS
+    parent        parent node id, -1 for the root
+    first_child   first child node id, -1 if none
+    next_sibling  next child of the same parent, -1 if none
+    end           one past the last node id of the subtree
+    field         string id of the parent field holding this node
+    line, col     start position, -1 when the node has none
+    end_line, end_col
+    name          string id of the node's identifier, -1 if none
+
+Identifiers and field names are interned in one string table. A
+FlatTree serializes to a compact byte string (to_bytes/from_bytes) that
+is tied to the ast node set of the running Python version.
+"""
+from __future__ import annotations
+
+import ast
+import hashlib
+import struct
+import sys
+from array import array
+from typing import Dict, Iterator, List, Optional, Tuple
+
+try:  # Optional: vectorised kind masks.
+    import numpy as _np
+except ImportError:  # pragma: no cover - exercised only without NumPy
+    _np = None
+
+
+# Scans over at least this many nodes use NumPy when it is installed.
+VECTOR_THRESHOLD = 4096
+
+
+def _node_classes() -> List[type]:
+    classes = {
+        obj for obj in vars(ast).values()
+        if isinstance(obj, type) and issubclass(obj, ast.AST) and obj._fields is not None
+    }
+    return sorted(classes, key=lambda c: c.__name__)
+
+
+_CLASSES = _node_classes()
+
+# Node kind names; a node's kind column is an index into this tuple.
+KINDS: Tuple[str, ...] = tuple(c.__name__ for c in _CLASSES)
+KIND_IDS: Dict[str, int] = {name: i for i, name in enumerate(KINDS)}
+_CLASS_IDS: Dict[type, int] = {c: i for i, c in enumerate(_CLASSES)}
+
+# The identifier attribute recorded in the name column, per node class.
+_NAME_FIELDS: Dict[str, str] = {
+    "Name": "id",
+    "Attribute": "attr",
+    "FunctionDef": "name",
+    "AsyncFunctionDef": "name",
+    "ClassDef": "name",
+    "alias": "name",
+    "ImportFrom": "module",
+    "arg": "arg",
+    "keyword": "arg",
+    "MatchAs": "name",
+    "MatchStar": "name",
+    "ExceptHandler": "name",
+}
+_NAME_ATTR: Dict[int, str] = {KIND_IDS[k]: v for k, v in _NAME_FIELDS.items() if k in KIND_IDS}
+
+MAGIC = b"GPIR\x01"
+# magic, kinds digest, node count, string table length in bytes
+_HEADER = struct.Struct("<5s8sII")
+_KINDS_DIGEST = hashlib.blake2b("\0".join(KINDS).encode(), digest_size=8).digest()
+
+# (column name, array typecode), in serialization order.
+_COLUMNS: Tuple[Tuple[str, str], ...] = (
+    ("kind", "H"),
+    ("parent", "i"),
+    ("first_child", "i"),
+    ("next_sibling", "i"),
+    ("end", "i"),
+    ("field", "i"),
+    ("line", "i"),
+    ("col", "i"),
+    ("end_line", "i"),
+    ("end_col", "i"),
+    ("name", "i"),
+)
+
+
+class FlatTree:
+    """
+    A lowered AST. See the module docstring for the column layout.
+    """
+
+    __slots__ = tuple(name for name, _code in _COLUMNS) + ("strings", "_string_ids", "_by_kind")
+
+    def __init__(self) -> None:
+        for name, code in _COLUMNS:
+            setattr(self, name, array(code))
+        self.strings: List[str] = []
+        self._string_ids: Dict[str, int] = {}
+        self._by_kind: Optional[Dict[int, List[int]]] = None
+
+    def __len__(self) -> int:
+        return len(self.kind)
+
+    def intern(self, s: str) -> int:
+        sid = self._string_ids.get(s)
+        if sid is None:
+            sid = self._string_ids[s] = len(self.strings)
+            self.strings.append(s)
+        return sid
+
+    # ---- node accessors ----
+
+    def kind_name(self, i: int) -> str:
+        return KINDS[self.kind[i]]
+
+    def name_of(self, i: int) -> Optional[str]:
+        sid = self.name[i]
+        return None if sid < 0 else self.strings[sid]
+
+    def field_of(self, i: int) -> Optional[str]:
+        sid = self.field[i]
+        return None if sid < 0 else self.strings[sid]
+
+    def position(self, i: int) -> Tuple[Optional[int], Optional[int]]:
+        line, col = self.line[i], self.col[i]
+        return (None if line < 0 else line, None if col < 0 else col)
+
+    def span(self, i: int) -> Tuple[Optional[int], Optional[int], Optional[int], Optional[int]]:
+        """
+        (line, col, end_line, end_col) of node i, None where absent.
+        """
+        line, col, end_line, end_col = self.line[i], self.col[i], self.end_line[i], self.end_col[i]
+        return (
+            None if line < 0 else line,
+            None if col < 0 else col,
+            None if end_line < 0 else end_line,
+            None if end_col < 0 else end_col,
+        )
+
+    def children(self, i: int, field: Optional[str] = None) -> Iterator[int]:
+        """
+        Direct children of node i in source order, optionally only those
+        held in the given parent field.
+        """
+        want = -1 if field is None else self._string_ids.get(field, -2)
+        c = self.first_child[i]
+        next_sibling, fields = self.next_sibling, self.field
+        while c >= 0:
+            if want == -1 or fields[c] == want:
+                yield c
+            c = next_sibling[c]
+
+    def descendants(self, i: int) -> range:
+        """
+        Node ids of the strict descendants of i (a contiguous range).
+        """
+        return range(i + 1, self.end[i])
+
+    def ancestors(self, i: int) -> Iterator[int]:
+        parent = self.parent
+        p = parent[i]
+        while p >= 0:
+            yield p
+            p = parent[p]
+
+    # ---- scans ----
+
+    def nodes_of_kind(self, *kinds: str) -> List[int]:
+        """
+        Ids of all nodes of the given kinds, in pre-order.
+        """
+        ids = {KIND_IDS[k] for k in kinds if k in KIND_IDS}
+        if not ids:
+            return []
+        if _np is not None and len(self.kind) >= VECTOR_THRESHOLD:
+            column = _np.frombuffer(self.kind, dtype=_np.uint16)
+            return _np.flatnonzero(_np.isin(column, list(ids))).tolist()
+
+        index = self._kind_index()
+        if len(ids) == 1:
+            return list(index.get(next(iter(ids)), ()))
+        found: List[int] = []
+        for k in ids:
+            found.extend(index.get(k, ()))
+        found.sort()
+        return found
+
+    def _kind_index(self) -> Dict[int, List[int]]:
+        # Built once, in one pass over the kind column, on first scan.
+        if self._by_kind is None:
+            index: Dict[int, List[int]] = {}
+            for i, k in enumerate(self.kind):
+                bucket = index.get(k)
+                if bucket is None:
+                    index[k] = [i]
+                else:
+                    bucket.append(i)
+            self._by_kind = index
+        return self._by_kind
+
+    def count_of_kind(self, *kinds: str) -> int:
+        return len(self.nodes_of_kind(*kinds))
+
+    # ---- serialization ----
+
+    def to_bytes(self) -> bytes:
+        table = "\0".join(self.strings).encode("utf-8")
+        parts = [_HEADER.pack(MAGIC, _KINDS_DIGEST, len(self.kind), len(table))]
+        for name, _code in _COLUMNS:
+            column = getattr(self, name)
+            if sys.byteorder != "little":  # pragma: no cover
+                column = array(column.typecode, column)
+                column.byteswap()
+            parts.append(column.tobytes())
+        parts.append(table)
+        return b"".join(parts)
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> FlatTree:
+        """
+        Rebuild a FlatTree. Raises ValueError if data is malformed or was
+        produced under a different ast node set.
+        """
+        if len(data) < _HEADER.size:
+            raise ValueError("truncated IR")
+        magic, digest, count, table_len = _HEADER.unpack_from(data)
+        if magic != MAGIC:
+            raise ValueError("not a governed IR blob")
+        if digest != _KINDS_DIGEST:
+            raise ValueError("IR was produced by a different Python ast version")
+
+        flat = cls()
+        offset = _HEADER.size
+        view = memoryview(data)
+        for name, code in _COLUMNS:
+            column = array(code)
+            size = column.itemsize * count
+            if offset + size > len(data):
+                raise ValueError("truncated IR")
+            column.frombytes(view[offset:offset + size])
+            if sys.byteorder != "little":  # pragma: no cover
+                column.byteswap()
+            setattr(flat, name, column)
+            offset += size
+        if offset + table_len != len(data):
+            raise ValueError("IR length mismatch")
+        table = bytes(view[offset:]).decode("utf-8")
+        flat.strings = table.split("\0") if table_len else []
+        flat._string_ids = {s: i for i, s in enumerate(flat.strings)}
+        return flat
+
+
+def lower(tree: ast.AST) -> FlatTree:
+    """
+    Lower an AST into a FlatTree, iteratively (no recursion limit).
+    """
+    flat = FlatTree()
+    kind, parent, end, field_col = flat.kind, flat.parent, flat.end, flat.field
+    line, col, end_line, end_col, name = flat.line, flat.col, flat.end_line, flat.end_col, flat.name
+    intern = flat.intern
+    AST = ast.AST
+    shapes: Dict[type, Tuple[int, Tuple[Tuple[str, int], ...], Optional[str], bool]] = {}
+
+    # Nodes whose subtree is still open; end[] is filled when it closes.
+    open_ids: List[int] = []
+
+    # Stack entries: (node, parent id, field id); children are pushed in reverse.
+    stack: List[Tuple[ast.AST, int, int]] = [(tree, -1, -1)]
+    pop, push = stack.pop, stack.append
+    while stack:
+        node, p, fid = pop()
+        i = len(kind)
+
+        while open_ids and open_ids[-1] != p:
+            end[open_ids.pop()] = i
+        open_ids.append(i)
+
+        cls = type(node)
+        shape = shapes.get(cls)
+        if shape is None:
+            shape = shapes[cls] = _shape(cls, intern)
+        k, fields, attr, positioned = shape
+
+        kind.append(k)
+        parent.append(p)
+        end.append(-1)
+        field_col.append(fid)
+        if positioned:
+            line.append(node.lineno)
+            col.append(node.col_offset)
+            el, ec = node.end_lineno, node.end_col_offset
+            end_line.append(-1 if el is None else el)
+            end_col.append(-1 if ec is None else ec)
+        else:
+            line.append(-1)
+            col.append(-1)
+            end_line.append(-1)
+            end_col.append(-1)
+        value = getattr(node, attr) if attr else None
+        name.append(-1 if value is None else intern(value))
+
+        # Push children last-field-first so they pop in source order.
+        for field_name, f in reversed(fields):
+            value = getattr(node, field_name, None)
+            if value.__class__ is list:
+                for child in reversed(value):
+                    if isinstance(child, AST):
+                        push((child, i, f))
+            elif isinstance(value, AST):
+                push((value, i, f))
+
+    n = len(kind)
+    for i in open_ids:
+        end[i] = n
+
+    # In pre-order, a node's first child is the next row and its next
+    # sibling starts where its own subtree ends.
+    flat.first_child = array("i", [i + 1 if end[i] > i + 1 else -1 for i in range(n)])
+    flat.next_sibling = array(
+        "i", [end[i] if p >= 0 and end[i] < end[p] else -1 for i, p in enumerate(parent)]
+    )
+    return flat
+
+
+def _shape(cls: type, intern) -> Tuple[int, Tuple[Tuple[str, int], ...], Optional[str], bool]:
+    """
+    Per-class lowering data: kind id, child fields (name, string id),
+    identifier attribute, and whether instances carry positions.
+    """
+    k = _CLASS_IDS.get(cls)
+    if k is None:
+        k = next(_CLASS_IDS[c] for c in cls.__mro__ if c in _CLASS_IDS)
+    fields = tuple((f, intern(f)) for f in cls._fields)
+    positioned = "lineno" in (cls._attributes or ())
+    return k, fields, _NAME_ATTR.get(k), positioned
+
+
+def lower_source(source: str) -> FlatTree:
+    return lower(ast.parse(source))
@@ -2,9 +2,10 @@
 from __future__ import annotations
 
 import ast
-from typing import List, Set
+from typing import Dict, List, Set
 
-from governed.ast.context import Context, Symbol
+from governed.ast.context import Context, Scope, Symbol
+from governed.budget import walk
 from governed.diagnostics import Diagnostic, Severity
 
 
@@ -14,7 +15,10 @@ CAPABILITY_TYPES: Set[str] = {"Clock", "Rng", "Io", "Store", "Audit"}
 def check(tree: ast.AST, ctx: Context) -> List[Diagnostic]:
     diagnostics: List[Diagnostic] = []
 
-    for node in ast.walk(tree):
+    # Nested functions get the scope of the function they are defined in.
+    enclosing: Dict[int, Scope] = {}
+
+    for node in walk(tree, ctx.budget):
 
         # C1 / C2 — capabilities may only appear as function parameters
         if isinstance(node, ast.AnnAssign):
@@ -28,12 +32,15 @@ def check(tree: ast.AST, ctx: Context) -> List[Diagnostic]:
                             suggestion="Declare capabilities only as function parameters",
                             line=node.lineno,
                             column=node.col_offset,
+                            end_line=node.end_lineno,
+                            end_column=node.end_col_offset,
                         )
                     )
 
         # Track function scopes and parameters
         if isinstance(node, ast.FunctionDef):
-            ctx.push_scope(f"func:{node.name}")
+            outer = enclosing.pop(id(node), ctx.global_scope)
+            ctx.push_scope(f"func:{node.name}", parent=outer.binding_scope())
 
             for arg in node.args.args:
                 if isinstance(arg.annotation, ast.Name):
@@ -46,8 +53,11 @@ def check(tree: ast.AST, ctx: Context) -> List[Diagnostic]:
                             )
                         )
 
-            # Walk function body manually to catch usage
-            for inner in ast.walk(node):
+            # Walk function body manually to catch usage. Nested functions
+            # are walked on their own when the outer walk reaches them.
+            for inner in walk(node, ctx.budget, prune=(ast.FunctionDef,)):
+                if inner is not node and isinstance(inner, ast.FunctionDef):
+                    enclosing[id(inner)] = ctx.current_scope
 
                 # C4 — move semantics (assignment consumes capability)
                 if isinstance(inner, ast.Assign):
@@ -67,6 +77,8 @@ def check(tree: ast.AST, ctx: Context) -> List[Diagnostic]:
                                 rule_id="C4",
                                 line=inner.lineno,
                                 column=inner.col_offset,
+                                end_line=inner.end_lineno,
+                                end_column=inner.end_col_offset,
                             )
                         )
 
@@ -82,6 +94,8 @@ def check(tree: ast.AST, ctx: Context) -> List[Diagnostic]:
                                     rule_id="C3",
                                     line=inner.lineno,
                                     column=inner.col_offset,
+                                    end_line=inner.end_lineno,
+                                    end_column=inner.end_col_offset,
                                 )
                             )
 
@@ -98,9 +112,11 @@ def check(tree: ast.AST, ctx: Context) -> List[Diagnostic]:
                                         rule_id="C5",
                                         line=inner.lineno,
                                         column=inner.col_offset,
+                                        end_line=inner.end_lineno,
+                                        end_column=inner.end_col_offset,
                                     )
                                 )
 
-            ctx.pop_scope()
+            ctx.current_scope = ctx.global_scope
 
     return diagnostics
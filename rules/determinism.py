@@ -6,6 +6,7 @@ from typing import List, Set
 
 from governed.ast.context import Context
 from governed.diagnostics import Diagnostic, Severity
+from governed.index import module_index
 
 
 # Names that represent nondeterministic authority
@@ -18,67 +19,56 @@ NONDETERMINISTIC_NAMES: Set[str] = {
 
 def check(tree: ast.AST, ctx: Context) -> List[Diagnostic]:
     diagnostics: List[Diagnostic] = []
+    index = module_index(tree, ctx)
 
-    for node in ast.walk(tree):
-
-        # D1 — unbounded loops are forbidden
-        # (while is already banned in syntax, but this guards redundancy)
-        if isinstance(node, ast.While):
-            diagnostics.append(
-                Diagnostic(
-                    severity=Severity.ERROR,
-                    message="Unbounded loops are forbidden",
-                    rule_id="D1",
-                    line=node.lineno,
-                    column=node.col_offset,
-                )
+    # D1 — unbounded loops are forbidden
+    # (while is already banned in syntax, but this guards redundancy)
+    for node in index.of_type(ast.While):
+        diagnostics.append(
+            Diagnostic(
+                severity=Severity.ERROR,
+                message="Unbounded loops are forbidden",
+                rule_id="D1",
+                line=node.lineno,
+                column=node.col_offset,
+                end_line=node.end_lineno,
+                end_column=node.end_col_offset,
             )
+        )
 
-        # D2 — direct access to nondeterminism without capability
-        if isinstance(node, ast.Call):
-            # function call like time.time(), random.randint(), secrets.token_bytes()
-            if isinstance(node.func, ast.Attribute):
-                if isinstance(node.func.value, ast.Name):
-                    root = node.func.value.id
-                    if root in NONDETERMINISTIC_NAMES:
-                        diagnostics.append(
-                            Diagnostic(
-                                severity=Severity.ERROR,
-                                message=f"Nondeterministic access via '{root}' requires an explicit capability",
-                                rule_id="D2",
-                                suggestion="Use Clock or Rng capabilities instead",
-                                line=node.lineno,
-                                column=node.col_offset,
-                            )
-                        )
-
-        # D2 — importing nondeterministic modules
-        if isinstance(node, ast.Import):
-            for alias in node.names:
-                root = alias.name.split(".")[0]
-                if root in NONDETERMINISTIC_NAMES:
-                    diagnostics.append(
-                        Diagnostic(
-                            severity=Severity.ERROR,
-                            message=f"Import of nondeterministic module '{root}' is forbidden",
-                            rule_id="D2",
-                            line=node.lineno,
-                            column=node.col_offset,
-                        )
-                    )
+    # D2 — direct access to nondeterminism without capability
+    # function call like time.time(), random.randint(), secrets.token_bytes()
+    calls = index.merge(index.calls_matching(f"{root}.*") for root in sorted(NONDETERMINISTIC_NAMES))
+    for node in calls:
+        root = node.func.value.id
+        diagnostics.append(
+            Diagnostic(
+                severity=Severity.ERROR,
+                message=f"Nondeterministic access via '{root}' requires an explicit capability",
+                rule_id="D2",
+                suggestion="Use Clock or Rng capabilities instead",
+                line=node.lineno,
+                column=node.col_offset,
+                end_line=node.end_lineno,
+                end_column=node.end_col_offset,
+            )
+        )
 
-        if isinstance(node, ast.ImportFrom):
-            if node.module:
-                root = node.module.split(".")[0]
-                if root in NONDETERMINISTIC_NAMES:
-                    diagnostics.append(
-                        Diagnostic(
-                            severity=Severity.ERROR,
-                            message=f"Import from nondeterministic module '{root}' is forbidden",
-                            rule_id="D2",
-                            line=node.lineno,
-                            column=node.col_offset,
-                        )
-                    )
+    # D2 — importing nondeterministic modules
+    for ref in index.imports():
+        if ref.root not in NONDETERMINISTIC_NAMES:
+            continue
+        kind = "Import of" if isinstance(ref.node, ast.Import) else "Import from"
+        diagnostics.append(
+            Diagnostic(
+                severity=Severity.ERROR,
+                message=f"{kind} nondeterministic module '{ref.root}' is forbidden",
+                rule_id="D2",
+                line=ref.node.lineno,
+                column=ref.node.col_offset,
+                end_line=ref.node.end_lineno,
+                end_column=ref.node.end_col_offset,
+            )
+        )
 
     return diagnostics
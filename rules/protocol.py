@@ -2,40 +2,68 @@
 from __future__ import annotations
 
 import ast
+from dataclasses import dataclass, field
 from typing import Dict, List, Set, Tuple
 
 from governed.ast.context import Context
 from governed.diagnostics import Diagnostic, Severity
+from governed.index import decorator_name, module_index
+
+
+@dataclass
+class ProtocolModel:
+    """
+    A parsed @protocol class.
+
+    States and transitions are kept in declaration order; the first
+    declared state is the initial state (SPEC P3).
+    """
+
+    name: str
+    node: ast.ClassDef
+    states: List[str] = field(default_factory=list)
+    transitions: List[Tuple[str, str, ast.FunctionDef]] = field(default_factory=list)
+
+    @property
+    def initial(self) -> str | None:
+        return self.states[0] if self.states else None
 
 
 def check(tree: ast.AST, ctx: Context) -> List[Diagnostic]:
     diagnostics: List[Diagnostic] = []
+    index = module_index(tree, ctx)
 
     for node in tree.body:
         if not isinstance(node, ast.ClassDef):
             continue
 
         # P1 — protocol declaration
-        if not _has_decorator(node, "protocol"):
+        if not index.has_decorator(node, "protocol"):
             continue
 
         protocol_name = node.name
-        states: Set[str] = set()
-        transitions: List[Tuple[str, str, ast.FunctionDef]] = []
+        model = ProtocolModel(name=protocol_name, node=node)
+        ctx.protocols[protocol_name] = model
 
         # Collect states and transitions
+        declared: Set[str] = set()
         for item in node.body:
 
             # P2 — state declaration
-            if isinstance(item, ast.ClassDef) and _has_decorator(item, "state"):
-                states.add(item.name)
+            if isinstance(item, ast.ClassDef) and index.has_decorator(item, "state"):
+                if item.name not in declared:
+                    declared.add(item.name)
+                    model.states.append(item.name)
 
             # P4 — transition declaration
-            if isinstance(item, ast.FunctionDef):
+            if isinstance(item, ast.FunctionDef) and index.has_decorator(item, "transition"):
                 for dec in item.decorator_list:
-                    if isinstance(dec, ast.Call) and _decorator_name(dec) == "transition":
+                    if isinstance(dec, ast.Call) and decorator_name(dec) == "transition":
                         from_state, to_state = _parse_transition(dec)
-                        transitions.append((from_state, to_state, item))
+                        model.transitions.append((from_state, to_state, item))
+
+        states: Set[str] = set(model.states)
+        transitions = model.transitions
 
         # P3 — initial state
         if not states:
@@ -46,9 +74,31 @@ def check(tree: ast.AST, ctx: Context) -> List[Diagnostic]:
                     rule_id="P3",
                     line=node.lineno,
                     column=node.col_offset,
+                    end_line=node.end_lineno,
+                    end_column=node.end_col_offset,
                 )
             )
 
+        # P4 — one transition name leaves a state for one destination only
+        targets: Dict[Tuple[str, str], str] = {}
+        for from_state, to_state, fn in transitions:
+            seen = targets.setdefault((from_state, fn.name), to_state)
+            if seen != to_state:
+                diagnostics.append(
+                    Diagnostic(
+                        severity=Severity.ERROR,
+                        message=(
+                            f"Transition '{fn.name}' from state '{from_state}' is declared "
+                            f"with two destinations ('{seen}' and '{to_state}')"
+                        ),
+                        rule_id="P4",
+                        line=fn.lineno,
+                        column=fn.col_offset,
+                        end_line=fn.end_lineno,
+                        end_column=fn.end_col_offset,
+                    )
+                )
+
         # P7 — validate state references
         for from_state, to_state, fn in transitions:
             if from_state not in states:
@@ -59,6 +109,8 @@ def check(tree: ast.AST, ctx: Context) -> List[Diagnostic]:
                         rule_id="P7",
                         line=fn.lineno,
                         column=fn.col_offset,
+                        end_line=fn.end_lineno,
+                        end_column=fn.end_col_offset,
                     )
                 )
             if to_state not in states:
@@ -69,6 +121,8 @@ def check(tree: ast.AST, ctx: Context) -> List[Diagnostic]:
                         rule_id="P7",
                         line=fn.lineno,
                         column=fn.col_offset,
+                        end_line=fn.end_lineno,
+                        end_column=fn.end_col_offset,
                     )
                 )
 
@@ -81,11 +135,13 @@ def check(tree: ast.AST, ctx: Context) -> List[Diagnostic]:
                         rule_id="P5",
                         line=fn.lineno,
                         column=fn.col_offset,
+                        end_line=fn.end_lineno,
+                        end_column=fn.end_col_offset,
                     )
                 )
 
         # P8 — reachability (warning only)
-        reachable = _compute_reachable(states, transitions)
+        reachable = _compute_reachable(model.initial, transitions)
         unreachable = states - reachable
         if unreachable:
             diagnostics.append(
@@ -95,6 +151,8 @@ def check(tree: ast.AST, ctx: Context) -> List[Diagnostic]:
                     rule_id="P8",
                     line=node.lineno,
                     column=node.col_offset,
+                    end_line=node.end_lineno,
+                    end_column=node.end_col_offset,
                 )
             )
 
@@ -104,18 +162,6 @@ def check(tree: ast.AST, ctx: Context) -> List[Diagnostic]:
 # ----------------- helpers -----------------
 
 
-def _has_decorator(node: ast.AST, name: str) -> bool:
-    return any(_decorator_name(d) == name for d in getattr(node, "decorator_list", []))
-
-
-def _decorator_name(dec: ast.AST) -> str | None:
-    if isinstance(dec, ast.Name):
-        return dec.id
-    if isinstance(dec, ast.Call):
-        return _decorator_name(dec.func)
-    return None
-
-
 def _parse_transition(dec: ast.Call) -> Tuple[str, str]:
     from_state = None
     to_state = None
@@ -136,22 +182,23 @@ def _is_result_annotation(node: ast.AST) -> bool:
 
 
 def _compute_reachable(
-    states: Set[str],
+    initial: str | None,
     transitions: List[Tuple[str, str, ast.FunctionDef]],
 ) -> Set[str]:
-    if not states:
+    if initial is None:
         return set()
 
+    successors: Dict[str, List[str]] = {}
+    for src, dst, _ in transitions:
+        successors.setdefault(src, []).append(dst)
+
     # First declared state is initial by convention
-    initial = next(iter(states))
     reachable = {initial}
-
-    changed = True
-    while changed:
-        changed = False
-        for src, dst, _ in transitions:
-            if src in reachable and dst not in reachable:
+    todo = [initial]
+    while todo:
+        for dst in successors.get(todo.pop(), ()):
+            if dst not in reachable:
                 reachable.add(dst)
-                changed = True
+                todo.append(dst)
 
     return reachable
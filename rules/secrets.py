@@ -2,10 +2,12 @@
 from __future__ import annotations
 
 import ast
-from typing import List, Set
+from typing import Dict, List, Set
 
-from governed.ast.context import Context, Symbol
+from governed.ast.context import Context, Scope, Symbol
+from governed.budget import walk
 from governed.diagnostics import Diagnostic, Severity
+from governed.index import module_index
 
 
 SECRET_SINKS: Set[str] = {
@@ -34,8 +36,13 @@ def _is_secret_annotation(node: ast.AST) -> bool:
 
 def check(tree: ast.AST, ctx: Context) -> List[Diagnostic]:
     diagnostics: List[Diagnostic] = []
+    index = module_index(tree, ctx)
+    sink_calls = {id(call) for name in SECRET_SINKS for call in index.calls(name)}
 
-    for node in ast.walk(tree):
+    # Nested functions get the scope of the function they are defined in.
+    enclosing: Dict[int, Scope] = {}
+
+    for node in walk(tree, ctx.budget):
 
         # SE1 / SE5 — declaring secret-typed variables
         if isinstance(node, ast.AnnAssign):
@@ -51,7 +58,8 @@ def check(tree: ast.AST, ctx: Context) -> List[Diagnostic]:
 
         # Track function scopes
         if isinstance(node, ast.FunctionDef):
-            ctx.push_scope(f"func:{node.name}")
+            outer = enclosing.pop(id(node), ctx.global_scope)
+            ctx.push_scope(f"func:{node.name}", parent=outer.binding_scope())
 
             # Register secret parameters
             for arg in node.args.args:
@@ -64,7 +72,16 @@ def check(tree: ast.AST, ctx: Context) -> List[Diagnostic]:
                         )
                     )
 
-            for inner in ast.walk(node):
+            # Nested functions are walked on their own when the outer walk
+            # reaches them.
+            sinks: List[ast.Call] = []
+            for inner in walk(node, ctx.budget, prune=(ast.FunctionDef,)):
+                if inner is not node and isinstance(inner, ast.FunctionDef):
+                    enclosing[id(inner)] = ctx.current_scope
+
+                # SE4 candidates (the index knows every sink call)
+                if isinstance(inner, ast.Call) and id(inner) in sink_calls:
+                    sinks.append(inner)
 
                 # SE3 — secret to string / interpolation
                 if isinstance(inner, ast.JoinedStr):
@@ -80,27 +97,11 @@ def check(tree: ast.AST, ctx: Context) -> List[Diagnostic]:
                                             rule_id="SE3",
                                             line=inner.lineno,
                                             column=inner.col_offset,
+                                            end_line=inner.end_lineno,
+                                            end_column=inner.end_col_offset,
                                         )
                                     )
 
-                # SE4 — secret sinks
-                if isinstance(inner, ast.Call):
-                    if isinstance(inner.func, ast.Name):
-                        if inner.func.id in SECRET_SINKS:
-                            for arg in inner.args:
-                                if isinstance(arg, ast.Name):
-                                    sym = ctx.current_scope.lookup(arg.id)
-                                    if sym and sym.kind == "secret":
-                                        diagnostics.append(
-                                            Diagnostic(
-                                                severity=Severity.ERROR,
-                                                message=f"Secret passed to sink '{inner.func.id}'",
-                                                rule_id="SE4",
-                                                line=inner.lineno,
-                                                column=inner.col_offset,
-                                            )
-                                        )
-
                 # SE6 — use after consume (simple model: assignment consumes)
                 if isinstance(inner, ast.Assign):
                     if isinstance(inner.value, ast.Name):
@@ -118,9 +119,29 @@ def check(tree: ast.AST, ctx: Context) -> List[Diagnostic]:
                                 rule_id="SE6",
                                 line=inner.lineno,
                                 column=inner.col_offset,
+                                end_line=inner.end_lineno,
+                                end_column=inner.end_col_offset,
                             )
                         )
 
-            ctx.pop_scope()
+            # SE4 — secret sinks
+            for call in sinks:
+                for arg in call.args:
+                    if isinstance(arg, ast.Name):
+                        sym = ctx.current_scope.lookup(arg.id)
+                        if sym and sym.kind == "secret":
+                            diagnostics.append(
+                                Diagnostic(
+                                    severity=Severity.ERROR,
+                                    message=f"Secret passed to sink '{call.func.id}'",
+                                    rule_id="SE4",
+                                    line=call.lineno,
+                                    column=call.col_offset,
+                                    end_line=call.end_lineno,
+                                    end_column=call.end_col_offset,
+                                )
+                            )
+
+            ctx.current_scope = ctx.global_scope
 
     return diagnostics
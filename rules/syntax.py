@@ -5,7 +5,10 @@ import ast
 from typing import List
 
 from governed.ast.context import Context
+from governed.budget import walk
 from governed.diagnostics import Diagnostic, Severity
+from governed.index import module_index
+from governed.ir import FlatTree
 
 
 # AST node types forbidden by SPEC §1
@@ -34,9 +37,21 @@ BANNED_LITERALS = (
 
 
 def check(tree: ast.AST, ctx: Context) -> List[Diagnostic]:
+    diagnostics = check_shared(tree, ctx)
+    diagnostics.extend(check_policy(tree, ctx))
+    return diagnostics
+
+
+def check_shared(tree: ast.AST, ctx: Context) -> List[Diagnostic]:
+    """
+    S1-S5, which do not depend on the config.
+    """
+    if ctx.ir is not None:
+        return _check_shared_ir(ctx.ir, ctx)
+
     diagnostics: List[Diagnostic] = []
 
-    for node in ast.walk(tree):
+    for node in walk(tree, ctx.budget):
 
         # S1 — forbidden control flow and expressions
         if isinstance(node, BANNED_NODES):
@@ -47,6 +62,8 @@ def check(tree: ast.AST, ctx: Context) -> List[Diagnostic]:
                     rule_id="S1",
                     line=getattr(node, "lineno", None),
                     column=getattr(node, "col_offset", None),
+                    end_line=getattr(node, "end_lineno", None),
+                    end_column=getattr(node, "end_col_offset", None),
                 )
             )
 
@@ -60,6 +77,8 @@ def check(tree: ast.AST, ctx: Context) -> List[Diagnostic]:
                     suggestion="Use tuple, Vector, or Map instead",
                     line=getattr(node, "lineno", None),
                     column=getattr(node, "col_offset", None),
+                    end_line=getattr(node, "end_lineno", None),
+                    end_column=getattr(node, "end_col_offset", None),
                 )
             )
 
@@ -78,46 +97,169 @@ def check(tree: ast.AST, ctx: Context) -> List[Diagnostic]:
                         rule_id="S4",
                         line=node.lineno,
                         column=node.col_offset,
+                        end_line=node.end_lineno,
+                        end_column=node.end_col_offset,
                     )
                 )
 
-        # S6 — import restrictions
-        if isinstance(node, ast.Import):
-            for alias in node.names:
-                root = alias.name.split(".")[0]
-                if root not in ctx.config.allowed_imports:
-                    diagnostics.append(
-                        Diagnostic(
-                            severity=Severity.ERROR,
-                            message=f"Import '{alias.name}' is not allowed",
-                            rule_id="S6",
-                            line=node.lineno,
-                            column=node.col_offset,
-                        )
-                    )
+    return diagnostics
 
-        if isinstance(node, ast.ImportFrom):
-            if node.module is None:
-                diagnostics.append(
-                    Diagnostic(
-                        severity=Severity.ERROR,
-                        message="Relative imports are forbidden",
-                        rule_id="S6",
-                        line=node.lineno,
-                        column=node.col_offset,
-                    )
+
+def check_policy(tree: ast.AST, ctx: Context) -> List[Diagnostic]:
+    """
+    S6, which depends on config.allowed_imports.
+    """
+    if ctx.ir is not None:
+        return _check_policy_ir(ctx.ir, ctx)
+
+    diagnostics: List[Diagnostic] = []
+
+    # S6 — import restrictions
+    allowed = ctx.config.allowed_imports
+    for ref in module_index(tree, ctx).imports():
+        node = ref.node
+        if ref.module is None:
+            message = "Relative imports are forbidden"
+        elif ref.root in allowed:
+            continue
+        elif isinstance(node, ast.Import):
+            message = f"Import '{ref.module}' is not allowed"
+        else:
+            message = f"Import from '{ref.module}' is not allowed"
+        diagnostics.append(
+            Diagnostic(
+                severity=Severity.ERROR,
+                message=message,
+                rule_id="S6",
+                line=node.lineno,
+                column=node.col_offset,
+                end_line=node.end_lineno,
+                end_column=node.end_col_offset,
+            )
+        )
+
+    return diagnostics
+
+
+# ----------------- flat IR path -----------------
+
+
+def check_ir(ir: FlatTree, ctx: Context) -> List[Diagnostic]:
+    """
+    Same rules over a lowered tree: each rule is one scan of the kind
+    column. Diagnostics come out grouped by rule, each in source order.
+    """
+    diagnostics = _check_shared_ir(ir, ctx)
+    diagnostics.extend(_check_policy_ir(ir, ctx))
+    return diagnostics
+
+
+def _check_shared_ir(ir: FlatTree, ctx: Context) -> List[Diagnostic]:
+    diagnostics: List[Diagnostic] = []
+
+    # S1 — forbidden control flow and expressions
+    for i in ir.nodes_of_kind(*(c.__name__ for c in BANNED_NODES)):
+        line, column, end_line, end_column = ir.span(i)
+        diagnostics.append(
+            Diagnostic(
+                severity=Severity.ERROR,
+                message=f"Use of {ir.kind_name(i)} is forbidden in Governed Python",
+                rule_id="S1",
+                line=line,
+                column=column,
+                end_line=end_line,
+                end_column=end_column,
+            )
+        )
+
+    # S2 — forbidden mutable literals
+    for i in ir.nodes_of_kind(*(c.__name__ for c in BANNED_LITERALS)):
+        line, column, end_line, end_column = ir.span(i)
+        diagnostics.append(
+            Diagnostic(
+                severity=Severity.ERROR,
+                message=f"Mutable literal {ir.kind_name(i)} is forbidden",
+                rule_id="S2",
+                suggestion="Use tuple, Vector, or Map instead",
+                line=line,
+                column=column,
+                end_line=end_line,
+                end_column=end_column,
+            )
+        )
+
+    # S4 — match must include wildcard case
+    for i in ir.nodes_of_kind("Match"):
+        has_wildcard = any(
+            ir.kind_name(pattern) == "MatchAs" and ir.name[pattern] < 0
+            for case in ir.children(i, "cases")
+            for pattern in ir.children(case, "pattern")
+        )
+        if not has_wildcard:
+            line, column, end_line, end_column = ir.span(i)
+            diagnostics.append(
+                Diagnostic(
+                    severity=Severity.ERROR,
+                    message="match statement must include a wildcard (case _)",
+                    rule_id="S4",
+                    line=line,
+                    column=column,
+                    end_line=end_line,
+                    end_column=end_column,
                 )
-            else:
-                root = node.module.split(".")[0]
-                if root not in ctx.config.allowed_imports:
+            )
+
+    return diagnostics
+
+
+def _check_policy_ir(ir: FlatTree, ctx: Context) -> List[Diagnostic]:
+    diagnostics: List[Diagnostic] = []
+
+    # S6 — import restrictions
+    allowed = ctx.config.allowed_imports
+    for i in ir.nodes_of_kind("Import", "ImportFrom"):
+        line, column, end_line, end_column = ir.span(i)
+        if ir.kind_name(i) == "Import":
+            for alias in ir.children(i, "names"):
+                name = ir.name_of(alias)
+                if name.split(".")[0] not in allowed:
                     diagnostics.append(
                         Diagnostic(
                             severity=Severity.ERROR,
-                            message=f"Import from '{node.module}' is not allowed",
+                            message=f"Import '{name}' is not allowed",
                             rule_id="S6",
-                            line=node.lineno,
-                            column=node.col_offset,
+                            line=line,
+                            column=column,
+                            end_line=end_line,
+                            end_column=end_column,
                         )
                     )
+            continue
+
+        module = ir.name_of(i)
+        if module is None:
+            diagnostics.append(
+                Diagnostic(
+                    severity=Severity.ERROR,
+                    message="Relative imports are forbidden",
+                    rule_id="S6",
+                    line=line,
+                    column=column,
+                    end_line=end_line,
+                    end_column=end_column,
+                )
+            )
+        elif module.split(".")[0] not in allowed:
+            diagnostics.append(
+                Diagnostic(
+                    severity=Severity.ERROR,
+                    message=f"Import from '{module}' is not allowed",
+                    rule_id="S6",
+                    line=line,
+                    column=column,
+                    end_line=end_line,
+                    end_column=end_column,
+                )
+            )
 
     return diagnostics
@@ -0,0 +1,149 @@
+# governed/shard.py
+"""
+Deterministic sharding of a check run, and merging of per-shard reports.
+
+`check --shard i/N` discovers the full file set on every runner, splits
+it with partition(), and checks only shard i. The split depends only on
+file paths and sizes, so runners with identical checkouts agree on it
+without sharing anything. Each shard's JSON or NDJSON report records
+which shard it is; `merge` combines the reports into one verdict and
+fails if a shard is missing or duplicated.
+"""
+from __future__ import annotations
+
+import heapq
+import json
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from governed.diagnostics import Diagnostic
+from governed.discovery import SourceFile
+
+
+def parse_shard(spec: str) -> Tuple[int, int]:
+    """
+    Parse "i/N" (1 <= i <= N) into (i, N). Raises ValueError.
+    """
+    index, sep, count = spec.partition("/")
+    if not sep:
+        raise ValueError(f"expected i/N, got {spec!r}")
+    try:
+        i, n = int(index), int(count)
+    except ValueError:
+        raise ValueError(f"expected i/N, got {spec!r}") from None
+    if n < 1 or not 1 <= i <= n:
+        raise ValueError(f"shard {spec!r} out of range (need 1 <= i <= N)")
+    return i, n
+
+
+def partition(files: Sequence[SourceFile], count: int) -> List[List[SourceFile]]:
+    """
+    Split files into count shards of roughly equal total size.
+
+    Largest files are placed first, each on the least-loaded shard (ties
+    go to the lowest shard), so the result depends only on the set of
+    (path, size) pairs and not on discovery order. Each shard keeps the
+    input order of its files.
+    """
+    unique: Dict[str, SourceFile] = {}
+    for f in files:
+        unique.setdefault(f.path, f)
+
+    owner: Dict[str, int] = {}
+    loads = [(0, i) for i in range(count)]
+    for f in sorted(unique.values(), key=lambda f: (-f.size, f.path)):
+        load, i = heapq.heappop(loads)
+        owner[f.path] = i
+        # Empty files still cost a parse.
+        heapq.heappush(loads, (load + max(f.size, 1), i))
+
+    shards: List[List[SourceFile]] = [[] for _ in range(count)]
+    for f in files:
+        shards[owner[f.path]].append(f)
+    return shards
+
+
+# ----------------- reports -----------------
+
+
+@dataclass
+class ShardReport:
+    """
+    The diagnostics and verdict inputs read back from one report file.
+    """
+
+    diagnostics: List[Tuple[str, Diagnostic]] = field(default_factory=list)
+    unchecked_files: int = 0
+    shard: Optional[Tuple[int, int]] = None
+
+
+def read_report(path: Path) -> ShardReport:
+    """
+    Read a report written by `check --json` or `check --ndjson`.
+
+    Raises OSError if it cannot be read and ValueError if it is neither.
+    """
+    text = Path(path).read_text(encoding="utf-8")
+    try:
+        payload = json.loads(text)
+    except json.JSONDecodeError:
+        payload = None
+
+    report = ShardReport()
+    if isinstance(payload, dict) and "diagnostics" in payload:
+        records = payload["diagnostics"]
+        summary = payload
+    else:
+        try:
+            lines = [json.loads(line) for line in text.splitlines() if line.strip()]
+        except json.JSONDecodeError as e:
+            raise ValueError(f"not a JSON or NDJSON report: {e}") from None
+        records = [r for r in lines if "summary" not in r]
+        summaries = [r["summary"] for r in lines if "summary" in r]
+        if len(summaries) != 1:
+            raise ValueError("NDJSON report must end with exactly one summary line")
+        summary = summaries[0]
+
+    try:
+        for record in records:
+            report.diagnostics.append((record["file"], Diagnostic.from_json(record)))
+        report.unchecked_files = int(summary.get("unchecked_files", 0))
+        shard = summary.get("shard")
+        if shard is not None:
+            report.shard = (int(shard["index"]), int(shard["count"]))
+    except (KeyError, TypeError, ValueError) as e:
+        raise ValueError(f"malformed report: {e!r}") from None
+    return report
+
+
+def merge_reports(reports: Sequence[ShardReport]) -> Tuple[List[Tuple[str, List[Diagnostic]]], int]:
+    """
+    Combine shard reports into (file, diagnostics) results and a total of
+    unchecked files.
+
+    Raises ValueError unless the reports are either all unsharded or
+    exactly the shards 1..N of one split.
+    """
+    shards = [r.shard for r in reports]
+    if any(s is not None for s in shards):
+        if any(s is None for s in shards):
+            raise ValueError("cannot merge sharded and unsharded reports")
+        counts = {n for _i, n in shards}
+        if len(counts) != 1:
+            raise ValueError(f"reports come from different splits: N = {sorted(counts)}")
+        n = counts.pop()
+        seen = sorted(i for i, _n in shards)
+        if len(set(seen)) != len(seen):
+            raise ValueError(f"duplicate shard(s): {sorted({i for i in seen if seen.count(i) > 1})}")
+        missing = sorted(set(range(1, n + 1)) - set(seen))
+        if missing:
+            raise ValueError(f"missing shard(s) of {n}: {missing}")
+
+    by_file: Dict[str, List[Diagnostic]] = {}
+    for report in reports:
+        for name, d in report.diagnostics:
+            by_file.setdefault(name, []).append(d)
+    results = [(name, by_file[name]) for name in sorted(by_file)]
+    return results, sum(r.unchecked_files for r in reports)
+
@@ -0,0 +1,130 @@
+# governed/snippet.py
+"""
+Source snippets under diagnostics.
+
+LineIndex records the byte offset of every line start of a file once, so
+fetching any line afterwards is a slice rather than a re-split of the
+file. It indexes the UTF-8 bytes (ast column offsets are UTF-8 byte
+offsets too) and can sit directly on a memory map of the file.
+
+render() prints a diagnostic followed by its source line and a caret
+range built from column/end_column:
+
+    ERROR [S1]: Use of While is forbidden in Governed Python (line 3, col 4)
+      |
+    3 |     while True:
+      |     ^^^^^^^^^^^
+"""
+from __future__ import annotations
+
+import mmap
+import os
+import re
+from array import array
+from typing import Optional, Union
+
+from governed.diagnostics import Diagnostic
+
+
+Buffer = Union[bytes, mmap.mmap]
+
+_BOM = b"\xef\xbb\xbf"
+_NEWLINE = re.compile(rb"\r\n?|\n")
+
+
+class LineIndex:
+    """
+    Line-start offsets over the UTF-8 bytes of one source file.
+    """
+
+    def __init__(self, data: Buffer, start: int = 0):
+        self._data = data
+        offsets = array("q", [start])
+        if data.find(b"\r", start) < 0:
+            find, append = data.find, offsets.append
+            pos = find(b"\n", start)
+            while pos >= 0:
+                append(pos + 1)
+                pos = find(b"\n", pos + 1)
+        else:
+            offsets.extend(m.end() for m in _NEWLINE.finditer(data, start))
+        # Sentinel: the end of the last line.
+        offsets.append(len(data))
+        self._offsets = offsets
+
+    @classmethod
+    def from_text(cls, text: str) -> LineIndex:
+        return cls(text.encode("utf-8"))
+
+    @classmethod
+    def from_file(cls, path: str) -> LineIndex:
+        """
+        Index a file through a read-only memory map (empty files are read
+        normally). Raises OSError.
+        """
+        with open(path, "rb") as f:
+            size = os.fstat(f.fileno()).st_size
+            data: Buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) if size else b""
+        # read_source() decodes with utf-8-sig: columns start after a BOM.
+        start = len(_BOM) if data[:len(_BOM)] == _BOM else 0
+        return cls(data, start)
+
+    def __len__(self) -> int:
+        # A trailing newline does not start another line.
+        n = len(self._offsets) - 1
+        if n > 1 and self._offsets[-2] == self._offsets[-1]:
+            n -= 1
+        return n
+
+    def _raw(self, line: int) -> bytes:
+        raw = self._data[self._offsets[line - 1]:self._offsets[line]]
+        return raw.rstrip(b"\r\n")
+
+    def line(self, line: int) -> str:
+        """
+        Text of a 1-based line, without its line ending.
+        """
+        return self._raw(line).decode("utf-8", errors="replace")
+
+    def column(self, line: int, byte_offset: int) -> int:
+        """
+        Character column of a UTF-8 byte offset within a 1-based line.
+        """
+        raw = self._raw(line)
+        if raw.isascii():
+            return min(byte_offset, len(raw))
+        return len(raw[:byte_offset].decode("utf-8", errors="replace"))
+
+    def close(self) -> None:
+        if isinstance(self._data, mmap.mmap):
+            self._data.close()
+
+
+def render(diagnostic: Diagnostic, lines: Optional[LineIndex]) -> str:
+    """
+    format_human() with the source line and caret range inserted after
+    the first line. Falls back to format_human() without a usable line.
+    """
+    text = diagnostic.format_human()
+    number = diagnostic.line
+    if lines is None or number is None or not 1 <= number <= len(lines):
+        return text
+
+    source = lines.line(number)
+    start = lines.column(number, diagnostic.column or 0)
+    if diagnostic.end_line == number and diagnostic.end_column is not None:
+        end = lines.column(number, diagnostic.end_column)
+    else:
+        # Multi-line range: underline to the end of the first line.
+        end = len(source.rstrip())
+    # Keep tabs in the lead-in so the carets line up with the source.
+    lead = "".join("\t" if c == "\t" else " " for c in source[:start])
+    gutter = " " * len(str(number))
+    snippet = (
+        f"{gutter} |\n"
+        f"{number} | {source}\n"
+        f"{gutter} | {lead}{'^' * max(end - start, 1)}"
+    )
+
+    head, sep, rest = text.partition("\n")
+    return f"{head}\n{snippet}{sep}{rest}"
@@ -0,0 +1,89 @@
+# tests/test_aio.py
+import asyncio
+import threading
+
+import pytest
+
+import governed.aio as aio
+from governed.aio import AsyncChecker, check_source_async
+from governed.config import Config
+from governed.engine import check_source
+from governed.transport import DiagnosticArray
+
+
+BAD = """
+def f(x: int) -> int:
+    while True:
+        return x
+"""
+
+
+def test_results_match_check_source():
+    async def main():
+        async with AsyncChecker(max_workers=2) as checker:
+            one = await check_source_async(BAD, Config(), checker=checker)
+            many = await checker.check_sources([("a.py", BAD), ("b.py", "x = 1\n")])
+        return one, many
+
+    one, many = asyncio.run(main())
+    assert one == check_source(BAD, Config())
+    assert many == [one, []]
+
+
+@pytest.mark.parametrize("processes", [True, False])
+def test_result_types_do_not_depend_on_the_pool(processes):
+    async def main():
+        async with AsyncChecker(max_workers=1, processes=processes) as checker:
+            eager = await checker.check_source(BAD, Config())
+            lazy = await checker.check_source_lazy(BAD, Config())
+            many = await checker.check_sources([("a.py", BAD)])
+            many_lazy = await checker.check_sources_lazy([("a.py", BAD), ("b.py", "x = 1\n")])
+        return eager, lazy, many, many_lazy
+
+    eager, lazy, many, many_lazy = asyncio.run(main())
+    assert type(eager) is list and type(many[0]) is list
+    assert isinstance(lazy, DiagnosticArray)
+    assert all(isinstance(r, DiagnosticArray) for r in many_lazy)
+    assert eager == lazy == check_source(BAD, Config())
+    assert eager + [] == many[0]
+    assert many_lazy == [eager, []]
+
+
+def test_syntax_error_is_raised_by_the_caller():
+    async def main():
+        async with AsyncChecker(max_workers=1, processes=False) as checker:
+            await checker.check_source("def (:\n")
+
+    with pytest.raises(SyntaxError):
+        asyncio.run(main())
+
+
+def test_concurrency_is_bounded_and_waiters_cancel(monkeypatch):
+    release = threading.Event()
+    running = []
+
+    def slow(source, filename, config):
+        running.append(filename)
+        release.wait(5)
+        return []
+
+    monkeypatch.setattr(aio, "_check", slow)
+
+    async def main():
+        checker = AsyncChecker(max_workers=4, max_concurrency=2, processes=False)
+        tasks = [asyncio.ensure_future(checker.check_source("", None, f"f{i}")) for i in range(4)]
+        for _ in range(50):
+            await asyncio.sleep(0.01)
+        started = list(running)
+
+        tasks[3].cancel()
+        release.set()
+        results = await asyncio.gather(*tasks, return_exceptions=True)
+        checker.close()
+        return started, results
+
+    started, results = asyncio.run(main())
+    assert started == ["f0", "f1"]
+    assert results[:3] == [[], [], []]
+    assert isinstance(results[3], asyncio.CancelledError)
+    assert len(running) == 3
@@ -0,0 +1,101 @@
+# tests/test_audit.py
+import threading
+
+import pytest
+
+import governed.capabilities.audit as audit_module
+from governed.capabilities.audit import AuditReader, SegmentAudit
+
+
+def test_records_round_trip_in_sequence_order(tmp_path):
+    with SegmentAudit(tmp_path, flush_interval=None) as audit:
+        seqs = [audit.record(("transition", i, {"ok": i % 2 == 0})) for i in range(100)]
+    assert seqs == list(range(100))
+
+    events = list(AuditReader(tmp_path))
+    assert [s for s, _e in events] == seqs
+    assert events[3] == (3, ("transition", 3, {"ok": False}))
+
+
+def test_group_commit_shares_fsyncs_between_writers(tmp_path):
+    audit = SegmentAudit(tmp_path, sync=True)
+
+    def writer(k):
+        for i in range(100):
+            audit.record((k, i))
+
+    threads = [threading.Thread(target=writer, args=(k,)) for k in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert audit.durable_seq == 799
+    assert audit.fsyncs < 800
+    audit.close()
+    assert sorted(e for _s, e in AuditReader(tmp_path)) == sorted((k, i) for k in range(8) for i in range(100))
+
+
+def test_rotation_and_seek_by_sequence(tmp_path):
+    with SegmentAudit(tmp_path, segment_bytes=1024, index_interval=8, flush_interval=None) as audit:
+        for i in range(500):
+            audit.record(i)
+
+    assert len(list(tmp_path.glob("*.seg"))) > 1
+    reader = AuditReader(tmp_path)
+    assert next(reader.read_from(321)) == (321, 321)
+    assert [s for s, _e in reader.read_from(495)] == [495, 496, 497, 498, 499]
+
+
+def test_torn_tail_is_truncated_on_reopen(tmp_path):
+    with SegmentAudit(tmp_path, flush_interval=None) as audit:
+        for i in range(10):
+            audit.record(i)
+
+    last = sorted(tmp_path.glob("*.seg"))[-1]
+    with open(last, "ab") as f:
+        f.write(b"\x40\x00\x00\x00partial")
+
+    with SegmentAudit(tmp_path, flush_interval=None) as audit:
+        assert audit.record("after") == 10
+
+    assert list(AuditReader(tmp_path).read_from(9)) == [(9, 9), (10, "after")]
+
+
+def test_record_after_close_raises(tmp_path):
+    audit = SegmentAudit(tmp_path, flush_interval=None)
+    audit.close()
+    with pytest.raises(ValueError):
+        audit.record("late")
+
+
+def test_failed_fsync_is_not_reported_durable(tmp_path, monkeypatch):
+    audit = SegmentAudit(tmp_path, flush_interval=None)
+    audit.record("a")
+    audit.commit()
+    assert audit.durable_seq == 0
+
+    def broken(fd):
+        raise OSError("disk on fire")
+
+    monkeypatch.setattr(audit_module.os, "fsync", broken)
+    audit.record("b")
+    with pytest.raises(OSError, match="disk on fire"):
+        audit.commit()
+    assert audit.durable_seq == 0
+
+    monkeypatch.undo()
+    # Latched: nothing later may claim "b" (or anything after it) durable.
+    with pytest.raises(OSError):
+        audit.record("c")
+    with pytest.raises(OSError):
+        audit.commit()
+    assert audit.durable_seq == 0
+    with pytest.raises(OSError):
+        audit.close()
+
+    reopened = SegmentAudit(tmp_path, flush_interval=None)
+    reopened.record("d")
+    reopened.close()
+    events = [event for _seq, event in AuditReader(tmp_path)]
+    assert events[0] == "a" and events[-1] == "d" and "c" not in events
@@ -0,0 +1,107 @@
+# tests/test_baseline.py
+import ast
+import os
+from pathlib import Path
+
+import pytest
+
+from governed.baseline import Baseline, fingerprints, normalize_message
+from governed.config import Config
+from governed.engine import CheckerEngine
+
+
+def _run(src: str):
+    tree = ast.parse(src)
+    diags = CheckerEngine(Config()).check(tree)
+    return diags, fingerprints(tree, diags)
+
+
+LEGACY = """
+def f(clk: Clock) -> Clock:
+    return clk
+"""
+
+
+def test_fingerprint_survives_line_shift():
+    _, before = _run(LEGACY)
+    _, after = _run("\n\n\nX = 1\n" + LEGACY)
+    assert before and set(before) <= set(after)
+
+
+def test_baseline_reports_only_new_violations():
+    diags, fps = _run(LEGACY)
+    baseline = Baseline()
+    baseline.add_all("mod.py", fps)
+
+    src = LEGACY + """
+def g(rng: Rng) -> Rng:
+    return rng
+"""
+    diags, fps = _run(src)
+    new = baseline.filter_new("mod.py", diags, fps)
+    assert [d.rule_id for d in new] == ["C3"]
+    assert new[0].line == 6
+
+
+def test_editing_enclosing_function_resurfaces_violation():
+    _, fps = _run(LEGACY)
+    baseline = Baseline()
+    baseline.add_all("mod.py", fps)
+    edited = LEGACY.replace("return clk", "y = 1\n    return clk")
+    diags, fps = _run(edited)
+    assert baseline.filter_new("mod.py", diags, fps)
+
+
+def test_same_violation_in_another_file_is_new():
+    diags, fps = _run(LEGACY)
+    baseline = Baseline()
+    baseline.add_all("a.py", fps)
+    assert baseline.filter_new("b.py", diags, fps) == diags
+
+
+def test_baseline_roundtrip_and_prune():
+    _, fps = _run(LEGACY)
+    baseline = Baseline()
+    baseline.add_all("mod.py", fps + [1, 2, 3])
+    loaded = Baseline.from_bytes(baseline.to_bytes())
+    assert loaded.entries == baseline.entries
+
+    removed = loaded.prune([("mod.py", fps)])
+    assert removed == 3
+    assert len(loaded) == len(set(fps))
+
+
+def test_prune_keeps_entries_of_files_not_checked():
+    _, fps = _run(LEGACY)
+    baseline = Baseline()
+    baseline.add_all("a.py", fps)
+    baseline.add_all("b.py", fps)
+
+    assert baseline.prune([("a.py", [])]) == len(set(fps))
+    diags, fps = _run(LEGACY)
+    assert baseline.filter_new("a.py", diags, fps) == diags
+    assert baseline.filter_new("b.py", diags, fps) == []
+
+
+def test_paths_are_relative_to_baseline_root(tmp_path, monkeypatch):
+    (tmp_path / "bp").mkdir()
+    diags, fps = _run(LEGACY)
+    baseline = Baseline(root=tmp_path / "bp")
+    baseline.add_all(str(tmp_path / "bp" / "mod.py"), fps)
+    baseline.save(tmp_path / "bp" / "bl")
+
+    loaded = Baseline.load(tmp_path / "bp" / "bl")
+    monkeypatch.chdir(tmp_path)
+    assert loaded.filter_new(os.path.join("bp", "mod.py"), diags, fps) == []
+    monkeypatch.chdir(tmp_path / "bp")
+    assert loaded.filter_new("mod.py", diags, fps) == []
+    assert loaded.filter_new(str(Path("..") / "bp" / "mod.py"), diags, fps) == []
+
+
+def test_baseline_rejects_foreign_file():
+    with pytest.raises(ValueError):
+        Baseline.from_bytes(b"not a baseline")
+
+
+def test_normalize_message_ignores_numbers_and_spacing():
+    assert normalize_message("3 errors  in  line 10") == normalize_message("4 errors in line 12")
@@ -0,0 +1,56 @@
+# tests/test_budget.py
+import ast
+import itertools
+
+import pytest
+
+from governed.budget import Budget, BudgetExceeded, walk
+from governed.config import Config
+from governed.engine import CheckerEngine, check_source
+
+
+SRC = """
+def f(x: int) -> int:
+    while True:
+        return [x for x in range(3)]
+"""
+
+
+def _budget_diagnostics(diagnostics):
+    return [d for d in diagnostics if d.rule_id == "BUDGET"]
+
+
+def test_walk_matches_ast_walk_order():
+    tree = ast.parse(SRC)
+    assert list(walk(tree)) == list(ast.walk(tree))
+
+
+def test_walk_stops_at_deadline():
+    ticks = itertools.count()
+    budget = Budget(max_seconds=5, clock=lambda: next(ticks))
+    tree = ast.parse("x = [" + "1, " * 20000 + "]")
+    with pytest.raises(BudgetExceeded):
+        for _ in walk(tree, budget):
+            pass
+
+
+def test_node_budget_reports_incomplete():
+    config = Config(max_nodes_per_file=10)
+    diagnostics = CheckerEngine(config).check(ast.parse(SRC))
+    assert len(diagnostics) == 1
+    assert diagnostics[0].message.startswith("Check incomplete")
+    assert "10 AST nodes" in diagnostics[0].message
+
+    assert not _budget_diagnostics(CheckerEngine(Config()).check(ast.parse(SRC)))
+
+
+def test_time_budget_keeps_finished_rules():
+    config = Config(max_seconds_per_file=0.0)
+    diagnostics = CheckerEngine(config).check(ast.parse(SRC))
+    assert len(_budget_diagnostics(diagnostics)) == 1
+    assert {d.rule_id for d in diagnostics} >= {"S1"}
+
+
+def test_deeply_nested_source_is_reported_not_raised():
+    diagnostics = check_source("x = " + "-" * 20000 + "1\n", Config())
+    assert len(_budget_diagnostics(diagnostics)) == 1
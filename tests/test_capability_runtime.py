@@ -0,0 +1,140 @@
+# tests/test_capability_runtime.py
+import pytest
+
+from governed.capabilities.reference import reference_capabilities
+from governed.capabilities.replay import Recorder, ReplayDivergence, Replayer
+from governed.config import Config
+from governed.persistent import Map, Vector
+
+
+def _workload(caps):
+    t0 = caps.clock.now()
+    roll = caps.rng.randint(1, 6)
+    caps.store.put("roll", roll)
+    caps.io.write("out.log", b"x" * roll)
+    data = caps.io.read("out.log")
+    try:
+        caps.io.read("missing.log")
+        missing = False
+    except FileNotFoundError:
+        missing = True
+    caps.audit.record(("rolled", roll))
+    return (t0, roll, caps.store.get("roll"), len(data), missing, caps.clock.now() - t0)
+
+
+def test_deterministic_reference_capabilities(tmp_path):
+    config = Config(deterministic_test=True, test_seed=7)
+    a = _workload(reference_capabilities(config, tmp_path / "a"))
+    b = _workload(reference_capabilities(config, tmp_path / "b"))
+    assert a == b
+
+
+def test_record_then_replay_without_real_io(tmp_path):
+    log = tmp_path / "calls.bin"
+    live = reference_capabilities(Config(), tmp_path / "live")
+    with Recorder(log) as recorder:
+        recorded = _workload(recorder.wrap_all(live))
+
+    replayer = Replayer(log)
+    replayed = _workload(replayer.wrap_all())
+    assert replayed == recorded
+    assert replayer.exhausted
+
+
+def test_replay_detects_divergence(tmp_path):
+    log = tmp_path / "calls.bin"
+    with Recorder(log) as recorder:
+        caps = recorder.wrap_all(reference_capabilities(Config(), tmp_path))
+        caps.clock.now()
+        caps.rng.randint(1, 6)
+
+    caps = Replayer(log).wrap_all()
+    caps.clock.now()
+    with pytest.raises(ReplayDivergence):
+        caps.rng.randint(1, 100)
+
+
+def test_record_and_replay_persistent_values(tmp_path):
+    log = tmp_path / "calls.bin"
+    with Recorder(log) as recorder:
+        caps = recorder.wrap_all(reference_capabilities(Config(), tmp_path))
+        caps.store.put("v", Vector([1, 2, 3]))
+        caps.store.put("m", Map().assoc("a", 1))
+        recorded = (caps.store.get("v"), caps.store.get("m"))
+
+    caps = Replayer(log).wrap_all()
+    caps.store.put("v", Vector([1, 2, 3]))
+    caps.store.put("m", Map().assoc("a", 1))
+    assert (caps.store.get("v"), caps.store.get("m")) == recorded
+
+
+def test_unrecordable_call_does_not_run(tmp_path):
+    live = reference_capabilities(Config(), tmp_path)
+    with Recorder(tmp_path / "calls.bin") as recorder:
+        caps = recorder.wrap_all(live)
+        with pytest.raises(TypeError):
+            caps.store.put("k", lambda: None)
+    assert live.store.get("k") is None
+
+
+def test_truncated_log_is_a_divergence(tmp_path):
+    log = tmp_path / "calls.bin"
+    with Recorder(log) as recorder:
+        caps = recorder.wrap_all(reference_capabilities(Config(), tmp_path))
+        caps.clock.now()
+        caps.clock.now()
+    raw = log.read_bytes()
+
+    for cut in (3, 12):
+        log.write_bytes(raw[:-cut])
+        caps = Replayer(log).wrap_all()
+        caps.clock.now()
+        with pytest.raises(ReplayDivergence):
+            caps.clock.now()
+
+
+def test_io_is_confined_to_root(tmp_path):
+    caps = reference_capabilities(Config(), tmp_path)
+    with pytest.raises(PermissionError):
+        caps.io.read("../escape")
+
+
+def test_counter_rng_batches_match_sequential_draws():
+    from governed.capabilities.rng import CounterRng
+
+    a = CounterRng.from_config(Config(test_seed=1))
+    b = CounterRng.from_config(Config(test_seed=1))
+    batch = a.u64_batch(1000)
+    assert list(batch) == [b.next_u64() for _ in range(1000)]
+    assert a.counter == b.counter == 1000
+    assert a.random_batch(3).tolist() == [b.random() for _ in range(3)]
+
+
+def test_counter_rng_jump_and_split():
+    from governed.capabilities.rng import CounterRng
+
+    a = CounterRng(123)
+    b = CounterRng(123)
+    a.jump(10_000_000_000)
+    b._counter = 10_000_000_000
+    assert a.next_u64() == b.next_u64()
+
+    root = CounterRng(5)
+    left, right = root.split(), root.split()
+    assert left.u64_batch(4).tolist() != right.u64_batch(4).tolist()
+    # Splitting is deterministic too.
+    again = CounterRng(5)
+    assert again.split().u64_batch(4).tolist() == CounterRng(5).split().u64_batch(4).tolist()
+
+
+def test_counter_rng_ranges():
+    from governed.capabilities.rng import CounterRng
+
+    rng = CounterRng(9)
+    rolls = {rng.randint(1, 6) for _ in range(500)}
+    assert rolls == {1, 2, 3, 4, 5, 6}
+    assert 0 <= rng.randint(0, 1 << 100) <= 1 << 100
+    assert len(rng.randbytes(13)) == 13
+    assert all(0.0 <= x < 1.0 for x in rng.random_batch(100))
+    with pytest.raises(ValueError):
+        rng.randint(2, 1)
@@ -0,0 +1,205 @@
+# tests/test_cli.py
+import io
+import json
+
+import pytest
+
+from governed.cli import main
+
+
+BAD = """
+def f(clk: Clock) -> Clock:
+    return clk
+"""
+
+GOOD = """
+def f(x: int) -> int:
+    return x
+"""
+
+
+class _Stdin:
+    def __init__(self, data: bytes):
+        self.buffer = io.BytesIO(data)
+
+
+def _run(monkeypatch, capsys, argv, stdin: bytes = b""):
+    monkeypatch.setattr("sys.stdin", _Stdin(stdin))
+    with pytest.raises(SystemExit) as exc:
+        main(argv)
+    return exc.value.code, capsys.readouterr()
+
+
+def test_check_source_from_stdin_uses_stdin_filename(monkeypatch, capsys):
+    code, out = _run(
+        monkeypatch, capsys,
+        ["check", "-", "--stdin-filename", "pkg/mod.py", "--json"],
+        stdin=BAD.encode(),
+    )
+    payload = json.loads(out.out)
+    assert code == 1
+    assert {d["file"] for d in payload["diagnostics"]} == {"pkg/mod.py"}
+
+
+def test_files_from_checks_all_and_survives_unreadable(monkeypatch, capsys, tmp_path):
+    bad = tmp_path / "bad.py"
+    good = tmp_path / "good.py"
+    bad.write_text(BAD)
+    good.write_text(GOOD)
+    listing = b"\0".join(str(p).encode() for p in (bad, tmp_path / "missing.py", good)) + b"\0"
+
+    code, out = _run(monkeypatch, capsys, ["check", "--files-from", "-", "--json"], stdin=listing)
+    payload = json.loads(out.out)
+    assert code == 1
+    assert payload["unchecked_files"] == 1
+    assert {d["file"] for d in payload["diagnostics"]} == {bad.as_posix()}
+    assert "missing.py" in out.err
+
+
+def test_check_passes_clean_batch(monkeypatch, capsys, tmp_path):
+    good = tmp_path / "good.py"
+    good.write_text(GOOD)
+    code, out = _run(monkeypatch, capsys, ["check", str(good), str(good)])
+    assert code == 0
+    assert "check passed" in out.out
+
+
+def test_transitive_imports_reported_with_graph_cache(monkeypatch, capsys, tmp_path):
+    pkg = tmp_path / "app"
+    pkg.mkdir()
+    (pkg / "__init__.py").write_text("")
+    (pkg / "clock.py").write_text("import time\n")
+    (pkg / "logic.py").write_text("import app.clock\n")
+    cache = tmp_path / "graph.json"
+
+    for _ in range(2):
+        code, out = _run(monkeypatch, capsys, ["check", str(pkg), "--json", "--graph-cache", str(cache)])
+        transitive = [
+            d for d in json.loads(out.out)["diagnostics"]
+            if d["rule_id"] == "D2" and "transitively" in d["message"]
+        ]
+        assert code == 1
+        assert [d["file"].endswith("logic.py") for d in transitive] == [True]
+    assert cache.exists()
+
+
+@pytest.mark.parametrize("fmt", ["--json", "--ndjson"])
+def test_sharded_reports_merge_to_unsharded_result(monkeypatch, capsys, tmp_path, fmt):
+    src = tmp_path / "src"
+    src.mkdir()
+    for i in range(6):
+        (src / f"m{i}.py").write_text((BAD if i % 2 else GOOD) * (i + 1))
+
+    _code, full = _run(monkeypatch, capsys, ["check", str(src), "--json"])
+    reports = []
+    for i in (1, 2, 3):
+        _code, out = _run(monkeypatch, capsys, ["check", str(src), fmt, "--shard", f"{i}/3"])
+        report = tmp_path / f"shard{i}.json"
+        report.write_text(out.out)
+        reports.append(str(report))
+
+    code, merged = _run(monkeypatch, capsys, ["merge", *reports, "--json"])
+    assert code == 1
+    key = lambda d: (d["file"], d["range"]["start"]["line"], d["rule_id"])
+    assert sorted(json.loads(merged.out)["diagnostics"], key=key) == sorted(
+        json.loads(full.out)["diagnostics"], key=key
+    )
+
+    code, out = _run(monkeypatch, capsys, ["merge", *reports[:2]])
+    assert code == 1
+    assert "missing shard(s) of 3: [3]" in out.err
+
+
+def test_metrics_file_counts_cache_hits(monkeypatch, capsys, tmp_path):
+    good = tmp_path / "good.py"
+    good.write_text(GOOD)
+    cache = tmp_path / "cache"
+    prom = tmp_path / "metrics.prom"
+
+    for _ in range(2):
+        code, _out = _run(monkeypatch, capsys, ["check", str(good), "--cache", str(cache), "--metrics-file", str(prom)])
+        assert code == 0
+    text = prom.read_text()
+    assert "governed_cache_hits_total 1" in text
+    assert "governed_files_checked_total" not in text
+
+
+def test_trace_records_spans_per_stage(monkeypatch, capsys, tmp_path):
+    src = tmp_path / "src"
+    src.mkdir()
+    (src / "bad.py").write_text(BAD)
+    out = tmp_path / "trace.json"
+
+    code, _out = _run(monkeypatch, capsys, ["check", str(src), "--trace", str(out)])
+    assert code == 1
+    events = json.loads(out.read_text())["traceEvents"]
+    spans = [e for e in events if e["ph"] == "X"]
+    names = {e["name"] for e in spans}
+    assert {"discover", "read", "parse", "check", "index", "syntax", "determinism", "report"} <= names
+    assert all(e["dur"] >= 0 and "pid" in e and "tid" in e for e in spans)
+    check = next(e for e in spans if e["name"] == "check")
+    assert check["args"]["file"].endswith("bad.py")
+    assert any(e["name"] == "process_name" for e in events if e["ph"] == "M")
+
+
+def test_show_source_prints_line_and_carets(monkeypatch, capsys, tmp_path):
+    bad = tmp_path / "bad.py"
+    bad.write_text(BAD)
+    code, out = _run(monkeypatch, capsys, ["check", str(bad), "--show-source"])
+    assert code == 1
+    lines = out.out.splitlines()
+    at = next(i for i, line in enumerate(lines) if "[C3]" in line)
+    assert lines[at + 1:at + 4] == [
+        "  |",
+        "3 |     return clk",
+        "  |     ^^^^^^^^^^",
+    ]
+
+
+def test_show_source_for_stdin_uses_the_piped_text(monkeypatch, capsys, tmp_path):
+    # No such file on disk: the snippet must come from stdin, with UTF-8
+    # byte offsets turned into character columns.
+    monkeypatch.chdir(tmp_path)
+    source = 'x = 1\ny = ("é", [x])\n'
+    code, out = _run(
+        monkeypatch, capsys,
+        ["check", "-", "--stdin-filename", "piped.py", "--show-source"],
+        stdin=source.encode("utf-8"),
+    )
+    assert code == 1
+    lines = out.out.splitlines()
+    at = next(i for i, line in enumerate(lines) if "[S2]" in line)
+    assert lines[at + 1:at + 4] == [
+        "  |",
+        '2 | y = ("é", [x])',
+        "  |           ^^^",
+    ]
+
+
+def test_baseline_prune_keeps_files_not_checked(monkeypatch, capsys, tmp_path):
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "a.py").write_text(BAD)
+    (tmp_path / "b.py").write_text(BAD)
+    main(["baseline", "create", "a.py", "b.py", "--output", "bl"])
+
+    (tmp_path / "a.py").write_text(GOOD)
+    main(["baseline", "prune", "a.py", "--baseline", "bl"])
+    assert "pruned 1 fixed entr(ies); 1 remain" in capsys.readouterr().out
+
+    code, out = _run(monkeypatch, capsys, ["check", "b.py", "--baseline", "bl", "--json"])
+    assert code == 0
+    assert json.loads(out.out)["diagnostics"] == []
+
+
+def test_baseline_matches_paths_from_another_directory(monkeypatch, capsys, tmp_path):
+    (tmp_path / "bp").mkdir()
+    (tmp_path / "bp" / "mod.py").write_text(BAD)
+    monkeypatch.chdir(tmp_path / "bp")
+    main(["baseline", "create", "mod.py", "--output", "bl"])
+    capsys.readouterr()
+
+    monkeypatch.chdir(tmp_path)
+    for argv in (["bp"], [str(tmp_path / "bp" / "mod.py")]):
+        code, out = _run(monkeypatch, capsys, ["check", *argv, "--baseline", "bp/bl", "--json"])
+        assert code == 0
+        assert json.loads(out.out)["diagnostics"] == []
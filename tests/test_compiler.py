@@ -0,0 +1,110 @@
+# tests/test_compiler.py
+import ast
+
+import pytest
+
+from governed.compiler import DISABLED, compile_protocols, emit_module
+from governed.config import Config
+
+
+DOOR = """
+@protocol
+class Door:
+
+    @state
+    class Closed:
+        pass
+
+    @state
+    class Open:
+        pass
+
+    @state
+    class Locked:
+        pass
+
+    @transition(from_=Closed, to=Open)
+    def open(s: Closed) -> Result[Ok[Open], Err[str]]:
+        return Ok(Open())
+
+    @transition(from_=Open, to=Closed)
+    def close(s: Open) -> Result[Ok[Closed], Err[str]]:
+        return Ok(Closed())
+
+    @transition(from_=Closed, to=Locked)
+    def lock(s: Closed) -> Result[Ok[Locked], Err[str]]:
+        return Ok(Locked())
+"""
+
+
+def test_table_uses_declaration_order():
+    tables, diags = compile_protocols(ast.parse(DOOR), Config())
+    assert not diags
+    (door,) = tables
+    assert door.states == ("Closed", "Open", "Locked")
+    assert door.transitions == ("open", "close", "lock")
+    assert door.step(0, 0) == 1
+    assert door.step(1, 0) == DISABLED
+    assert door.enabled(0) == (0, 2)
+
+
+def test_generated_module_dispatches_through_table():
+    tables, _ = compile_protocols(ast.parse(DOOR), Config())
+    namespace = {}
+    exec(compile(emit_module(tables, "door.py"), "door_tables.py", "exec"), namespace)
+    Door = namespace["Door"]
+
+    assert Door.step(Door.S_Closed, Door.T_open) == Door.S_Open
+    assert Door.step(Door.S_Locked, Door.T_open) == -1
+    assert Door.step_many([0, 1, 0], [0, 1, 2]) == [1, 0, 2]
+
+    class Impl:
+        def open(s):
+            return "opened"
+
+        def close(s):
+            return "closed"
+
+        def lock(s):
+            return "locked"
+
+    handlers = Door.bind(Impl)
+    assert Door.dispatch(handlers, Door.S_Closed, Door.T_lock, None) == (Door.S_Locked, "locked")
+    assert Door.dispatch(handlers, Door.S_Open, Door.T_lock, None) == (-1, None)
+
+
+def test_protocol_errors_block_compilation():
+    src = DOOR.replace("to=Open)", "to=Ajar)")
+    tables, diags = compile_protocols(ast.parse(src), Config())
+    assert tables == []
+    assert any(d.rule_id == "P7" for d in diags)
+
+
+def test_stacked_transition_decorators_share_one_id():
+    src = DOOR.replace(
+        "    @transition(from_=Closed, to=Open)\n",
+        "    @transition(from_=Closed, to=Open)\n    @transition(from_=Locked, to=Open)\n",
+    )
+    tables, diags = compile_protocols(ast.parse(src), Config())
+    assert not diags
+    (door,) = tables
+    assert door.transitions == ("open", "close", "lock")
+
+    namespace = {}
+    exec(compile(emit_module(tables, "door.py"), "door_tables.py", "exec"), namespace)
+    Door = namespace["Door"]
+    assert Door.T_open == 0
+    assert Door.step(Door.S_Closed, Door.T_open) == Door.S_Open
+    assert Door.step(Door.S_Locked, Door.T_open) == Door.S_Open
+    assert Door.step(Door.S_Open, Door.T_open) == -1
+    assert Door.ENABLED[Door.S_Locked] == (Door.T_open,)
+
+
+def test_one_name_with_two_destinations_from_a_state_is_rejected():
+    src = DOOR.replace(
+        "    @transition(from_=Closed, to=Open)\n",
+        "    @transition(from_=Closed, to=Open)\n    @transition(from_=Closed, to=Locked)\n",
+    )
+    tables, diags = compile_protocols(ast.parse(src), Config())
+    assert tables == []
+    assert [d.rule_id for d in diags] == ["P4"]
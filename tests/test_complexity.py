@@ -0,0 +1,171 @@
+# tests/test_complexity.py
+"""
+Growth-rate guards for the rule modules.
+
+Each rule runs on generated sources at doubling sizes along one axis.
+Its cost is the number of Python line events executed in governed code
+(deterministic, unlike timings), and the growth exponent is fitted over
+two doublings. A rule fails if it grows faster than linearithmic:
+n log n fits an exponent of about 1.15 at these sizes, n**2 fits 2.
+"""
+import ast
+import math
+import sys
+
+import pytest
+
+from governed.ast.context import Context
+from governed.config import Config
+from governed.rules import capabilities, determinism, protocol, secrets, syntax
+
+
+RULES = {
+    "syntax": syntax,
+    "capabilities": capabilities,
+    "secrets": secrets,
+    "protocol": protocol,
+    "determinism": determinism,
+}
+
+MAX_EXPONENT = 1.35
+
+# ----------------- generated inputs -----------------
+
+
+def functions(n: int) -> str:
+    """
+    n sibling functions, each with capability and secret parameters,
+    calls and sinks.
+    """
+    out = []
+    for i in range(n):
+        out.append(
+            f"def f{i}(clk: Clock, key: Secret[int], x: int) -> int:\n"
+            f"    y = x + {i}\n"
+            f"    print(y)\n"
+            f"    clk.now()\n"
+            f"    return y\n"
+        )
+    return "\n".join(out)
+
+
+def function_nesting(n: int) -> str:
+    """
+    n functions, each defined inside the previous one.
+    """
+    out = []
+    for i in range(n):
+        pad = "    " * i
+        out.append(f"{pad}def f{i}(x{i}: int) -> int:\n{pad}    y = x{i} + 1\n")
+    return "".join(out)
+
+
+def expression_depth(n: int) -> str:
+    """
+    One expression nested n levels deep.
+    """
+    return "def f(x: int) -> int:\n    return " + " + ".join(["x"] * n) + "\n"
+
+
+def transitions(n: int) -> str:
+    """
+    One protocol whose n transitions form a chain, declared last first.
+    """
+    states = "".join(f"    @state\n    class S{i}:\n        pass\n" for i in range(n + 1))
+    moves = "".join(
+        f"    @transition(from_=S{i}, to=S{i + 1})\n"
+        f"    def t{i}(s: S{i}) -> Result[Ok[S{i + 1}], Err[str]]:\n"
+        f"        return s\n"
+        for i in reversed(range(n))
+    )
+    return f"@protocol\nclass P:\n{states}{moves}"
+
+
+def diagnostics(n: int) -> str:
+    """
+    One function with n violations of every rule.
+    """
+    body = "".join(
+        f"    while x:\n"
+        f"        y = [x, {i}]\n"
+        f"        time.time()\n"
+        f"        print(key)\n"
+        f"        z = clk\n"
+        f"        clk.now()\n"
+        for i in range(n)
+    )
+    return f"import time\ndef f(clk: Clock, key: Secret[int], x: int) -> int:\n{body}"
+
+
+# Axis -> (generator, smallest size). Sizes are large enough for an n**2
+# term to dominate the linear index build; nesting is capped by the
+# parser's 100 indentation levels.
+AXES = {
+    "functions": (functions, 128),
+    "function_nesting": (function_nesting, 24),
+    "expression_depth": (expression_depth, 256),
+    "transitions": (transitions, 256),
+    "diagnostics": (diagnostics, 64),
+}
+SIZES = 3
+
+
+# ----------------- measurement -----------------
+
+
+def operations(rule, tree: ast.AST) -> int:
+    """
+    Line events executed in governed code while rule checks tree.
+    """
+    count = 0
+    files = {
+        module.__file__
+        for name, module in list(sys.modules.items())
+        if name.startswith("governed.") and getattr(module, "__file__", None)
+    }
+
+    def local(frame, event, arg):
+        nonlocal count
+        if event == "line":
+            count += 1
+        return local
+
+    def global_(frame, event, arg):
+        return local if frame.f_code.co_filename in files else None
+
+    ctx = Context(config=Config())
+    sys.settrace(global_)
+    try:
+        rule.check(tree, ctx)
+    finally:
+        sys.settrace(None)
+    return count
+
+
+def exponent(sizes, counts) -> float:
+    """
+    Least-squares slope of log(count) over log(size).
+    """
+    xs = [math.log(n) for n in sizes]
+    ys = [math.log(max(c, 1)) for c in counts]
+    mx, my = sum(xs) / len(xs), sum(ys) / len(ys)
+    return sum((x - mx) * (y - my) for x, y in zip(xs, ys)) / sum((x - mx) ** 2 for x in xs)
+
+
+def test_exponent_fit_separates_linearithmic_from_quadratic():
+    sizes = [64, 128, 256, 512]
+    assert exponent(sizes, [n * math.log2(n) for n in sizes]) < MAX_EXPONENT
+    assert exponent(sizes, [n * n for n in sizes]) > 1.9
+
+
+@pytest.mark.parametrize("axis", sorted(AXES))
+@pytest.mark.parametrize("rule_name", sorted(RULES))
+def test_rule_grows_at_most_linearithmically(rule_name, axis):
+    generate, start = AXES[axis]
+    sizes = [start << k for k in range(SIZES)]
+    counts = [operations(RULES[rule_name], ast.parse(generate(n))) for n in sizes]
+    fitted = exponent(sizes, counts)
+    assert fitted <= MAX_EXPONENT, (
+        f"{rule_name} grows like n^{fitted:.2f} along {axis}: "
+        + ", ".join(f"n={n}: {c}" for n, c in zip(sizes, counts))
+    )
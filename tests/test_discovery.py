@@ -0,0 +1,84 @@
+# tests/test_discovery.py
+from pathlib import Path
+
+import pytest
+
+import governed.discovery as discovery
+from governed.config import Config
+from governed.discovery import Manifest, discover, read_source, stat_file
+
+
+def _tree(root: Path, files: dict) -> None:
+    for rel, text in files.items():
+        p = root / rel
+        p.parent.mkdir(parents=True, exist_ok=True)
+        p.write_text(text)
+
+
+def _rel(root: Path, config: Config = None):
+    return [Path(f.path).relative_to(root).as_posix() for f in discover(str(root), config or Config())]
+
+
+def test_discover_honours_gitignore_and_is_sorted(tmp_path):
+    _tree(tmp_path, {
+        ".gitignore": "build/\n*_pb2.py\n!keep_pb2.py\n",
+        "b.py": "",
+        "a.py": "",
+        "notes.txt": "",
+        "gen_pb2.py": "",
+        "keep_pb2.py": "",
+        "build/out.py": "",
+        "pkg/.gitignore": "local.py\n",
+        "pkg/local.py": "",
+        "pkg/mod.py": "",
+        "other/local.py": "",
+    })
+    assert _rel(tmp_path) == ["a.py", "b.py", "keep_pb2.py", "other/local.py", "pkg/mod.py"]
+
+
+def test_discover_include_exclude_globs(tmp_path):
+    _tree(tmp_path, {"src/a.py": "", "src/a.pyi": "", "tests/t.py": "", "src/vendor/v.py": ""})
+    config = Config(include=("*.py", "*.pyi"), exclude=("tests/", "**/vendor"))
+    assert _rel(tmp_path, config) == ["src/a.py", "src/a.pyi"]
+
+
+def test_read_source_mmap_and_plain_agree(tmp_path):
+    p = tmp_path / "m.py"
+    p.write_bytes("﻿x = 'é'\n".encode("utf-8") * 100)
+    assert read_source(str(p), mmap_threshold=1) == read_source(str(p), mmap_threshold=1 << 30)
+    assert read_source(str(p)).startswith("x = 'é'")
+
+
+def test_manifest_reuses_unchanged_files(tmp_path):
+    p = tmp_path / "m.py"
+    p.write_text("x = 1\n")
+    config = Config()
+    cache = tmp_path / "cache.json"
+
+    first = Manifest.load(cache, config)
+    f = stat_file(str(p))
+    assert first.lookup(f) is None
+    first.record(f, [], [])
+    first.save(cache)
+
+    second = Manifest.load(cache, config)
+    assert second.lookup(stat_file(str(p))) == ([], [])
+    assert (second.hits, second.misses) == (1, 0)
+
+    p.write_text("x = 22\n")
+    assert second.lookup(stat_file(str(p))) is None
+
+    changed = Manifest.load(cache, Config(strict=False))
+    assert changed.lookup(f) is None
+
+
+def test_manifest_is_dropped_when_the_checker_changes(tmp_path, monkeypatch):
+    p = tmp_path / "m.py"
+    p.write_text("x = 1\n")
+    cache = tmp_path / "cache.json"
+    first = Manifest.load(cache, Config())
+    first.record(stat_file(str(p)), [], [])
+    first.save(cache)
+
+    monkeypatch.setattr(discovery, "checker_digest", lambda: "edited rules")
+    assert Manifest.load(cache, Config()).lookup(stat_file(str(p))) is None
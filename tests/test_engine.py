@@ -0,0 +1,110 @@
+# tests/test_engine.py
+import ast
+from dataclasses import replace
+
+import pytest
+
+from governed.config import Config
+from governed.engine import CheckerEngine, check_source, check_source_matrix, incomplete
+from governed.metrics import Metrics
+
+
+SRC = """
+import time
+
+def f(clk: Clock, key: Secret[int]) -> Clock:
+    x = clk
+    print(key)
+    y = [1, 2]
+    return clk
+
+@protocol
+class Door:
+
+    @state
+    class Closed:
+        pass
+
+    @state
+    class Open:
+        pass
+
+    @transition(from_=Closed, to=Open)
+    def open(s: Closed) -> int:
+        return 1
+"""
+
+
+def test_parallel_rules_match_sequential_order():
+    tree = ast.parse(SRC)
+    sequential = CheckerEngine(Config()).check(tree)
+    parallel = CheckerEngine(Config(), max_workers=5).check(tree)
+    assert sequential == parallel
+
+
+def test_parallel_rules_are_repeatable():
+    tree = ast.parse(SRC)
+    engine = CheckerEngine(Config(), max_workers=5)
+    runs = [engine.check(tree) for _ in range(10)]
+    assert all(r == runs[0] for r in runs)
+
+
+MATRIX = {
+    "strict": Config(),
+    "lenient": Config(protocol_validation="lenient", secret_protection="lenient"),
+    "relaxed": Config(strict=False, protocol_validation="lenient"),
+    "edge": Config(allowed_imports={"time", "typing"}),
+}
+
+
+@pytest.mark.parametrize("options", [{}, {"use_ir": True}, {"max_workers": 5}])
+def test_check_matrix_matches_one_check_per_config(options):
+    tree = ast.parse(SRC)
+    matrix = CheckerEngine(Config(), **options).check_matrix(tree, MATRIX)
+    assert list(matrix) == list(MATRIX)
+    for name, config in MATRIX.items():
+        assert matrix[name] == CheckerEngine(config, **options).check(tree), name
+
+
+def test_policy_knobs():
+    tree = ast.parse(SRC)
+    matrix = CheckerEngine(Config()).check_matrix(tree, MATRIX)
+
+    def severities(name, prefix):
+        return {d.severity.value for d in matrix[name] if d.rule_id.startswith(prefix)}
+
+    assert severities("strict", "SE") == {"error"}
+    assert severities("lenient", "SE") == {"warning"}
+    assert severities("lenient", "P") == {"warning"}
+    assert severities("lenient", "C") == {"error"}
+    # Non-strict drops warnings, including the downgraded protocol errors.
+    assert severities("relaxed", "P") == set()
+    assert severities("relaxed", "SE") == {"error"}
+    assert not [d for d in matrix["edge"] if d.rule_id == "S6"]
+    assert [d for d in matrix["strict"] if d.rule_id == "S6"]
+
+
+def test_check_matrix_runs_each_rule_module_once():
+    metrics = Metrics()
+    CheckerEngine(Config(), metrics=metrics).check_matrix(ast.parse(SRC), MATRIX)
+    assert metrics.count("governed_rule_seconds", module="syntax") == 1
+    assert metrics.count("governed_rule_seconds", module="index") == 1
+
+
+def test_check_matrix_reports_incomplete_for_every_config():
+    configs = {name: replace(config, max_nodes_per_file=10) for name, config in MATRIX.items()}
+    matrix = CheckerEngine(Config()).check_matrix(ast.parse(SRC), configs)
+    assert all(d == [incomplete("file has more than 10 AST nodes")] for d in matrix.values())
+    assert matrix == {name: check_source(SRC, config) for name, config in configs.items()}
+    assert check_source_matrix(SRC, configs) == matrix
+
+
+def test_check_matrix_rejects_configs_with_different_budgets():
+    configs = {"small": Config(max_nodes_per_file=10), "default": Config()}
+    with pytest.raises(ValueError):
+        CheckerEngine(Config()).check_matrix(ast.parse(SRC), configs)
+
+
+def test_check_source_matrix():
+    matrix = check_source_matrix(SRC, MATRIX)
+    assert matrix == {name: check_source(SRC, config) for name, config in MATRIX.items()}
@@ -0,0 +1,68 @@
+# tests/test_explorer.py
+import pytest
+
+from governed.compiler import TransitionTable
+from governed.explorer import explore, explore_all
+
+
+def _table(states, transitions):
+    """
+    transitions: list of (name, src, dst) using state names.
+    """
+    ids = {s: i for i, s in enumerate(states)}
+    width = len(transitions)
+    nxt = [-1] * (len(states) * width)
+    for t, (_name, src, dst) in enumerate(transitions):
+        nxt[ids[src] * width + t] = ids[dst]
+    return TransitionTable(
+        name="P",
+        states=tuple(states),
+        transitions=tuple(name for name, _s, _d in transitions),
+        next_state=tuple(nxt),
+    )
+
+
+def test_explore_reports_dead_ends_no_return_and_never_enabled():
+    table = _table(
+        ["Idle", "Busy", "Done", "Orphan"],
+        [
+            ("start", "Idle", "Busy"),
+            ("stop", "Busy", "Idle"),
+            ("finish", "Busy", "Done"),
+            ("adopt", "Orphan", "Idle"),
+        ],
+    )
+    report = explore(table, depth=6)
+    assert report.reachable == ["Idle", "Busy", "Done"]
+    assert report.dead_ends == ["Done"]
+    assert report.no_return == ["Done"]
+    assert report.never_enabled == ["adopt"]
+    assert report.truncated
+
+
+def test_explore_counts_paths_without_enumerating():
+    # Two parallel self-loops: 2**k sequences of length k.
+    table = _table(["S"], [("a", "S", "S"), ("b", "S", "S")])
+    report = explore(table, depth=40)
+    assert report.paths == sum(2 ** k for k in range(1, 41))
+    assert report.clean
+
+
+def test_explore_stops_when_frontier_empties():
+    table = _table(["A", "B"], [("go", "A", "B")])
+    report = explore(table, depth=10)
+    assert report.paths == 1 and not report.truncated
+
+
+def test_explore_parallel_matches_serial():
+    # Ring with a reset: every state steps to the next one, or back to S0.
+    n = 64
+    nxt = []
+    for i in range(n):
+        nxt += [(i + 1) % n, 0]
+    table = TransitionTable("Ring", tuple(f"S{i}" for i in range(n)), ("next", "reset"), tuple(nxt))
+
+    serial = explore_all([table], depth=n + 5, workers=1)[0]
+    parallel = explore_all([table], depth=n + 5, workers=2, parallel_threshold=8)[0]
+    assert serial.to_json() == parallel.to_json()
+    assert serial.reachable == list(table.states)
@@ -0,0 +1,87 @@
+# tests/test_importgraph.py
+import os
+
+from governed.discovery import stat_file
+from governed.importgraph import ImportGraph, _tarjan
+
+
+def _write(root, rel, text):
+    path = root / rel
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(text)
+    return path
+
+
+def _project(tmp_path):
+    _write(tmp_path, "app/__init__.py", "")
+    _write(tmp_path, "app/util/__init__.py", "")
+    _write(tmp_path, "app/util/clock.py", "import time\n")
+    _write(tmp_path, "app/logic.py", "from app.util import clock\n")
+    _write(tmp_path, "app/main.py", "from . import logic\nimport math\n")
+    _write(tmp_path, "app/a.py", "import app.b\n")
+    _write(tmp_path, "app/b.py", "import app.a\nimport random\n")
+
+
+def _sources(tmp_path):
+    files = sorted(str(p) for p in (tmp_path / "app").rglob("*.py"))
+    return [(str(tmp_path), stat_file(f)) for f in files]
+
+
+def test_transitive_reachability_and_chains(tmp_path):
+    _project(tmp_path)
+    graph = ImportGraph()
+    graph.refresh(_sources(tmp_path))
+
+    assert graph.reachable_roots("app.main") == {"time", "math"}
+    assert graph.reachable_roots("app.a") == {"random"}
+    assert graph.chain("app.main", "time") == ["app.main", "app.logic", "app.util.clock", "time"]
+
+    main = str(tmp_path / "app" / "main.py")
+    diags = graph.transitive_diagnostics(main, {"time", "random"})
+    assert [(d.rule_id, d.line) for d in diags] == [("D2", 1)]
+    assert "app.logic -> app.util.clock -> time" in diags[0].message
+
+    # Direct imports are the rules' business, not the graph's.
+    clock = str(tmp_path / "app" / "util" / "clock.py")
+    assert graph.transitive_diagnostics(clock, {"time"}) == []
+
+
+def test_roots_reached_only_through_the_importer_are_not_reported(tmp_path):
+    _write(tmp_path, "app/__init__.py", "import app.x\nimport app.y\nimport app.z\n")
+    _write(tmp_path, "app/x.py", "import time\nimport app.y\n")
+    _write(tmp_path, "app/y.py", "")
+    _write(tmp_path, "app/z.py", "import random\n")
+    graph = ImportGraph()
+    graph.refresh(_sources(tmp_path))
+
+    x = str(tmp_path / "app" / "x.py")
+    diags = graph.transitive_diagnostics(x, {"time", "random"})
+    assert [(d.line, "'random'" in d.message) for d in diags] == [(2, True)]
+    assert "(app -> app.z -> random)" in diags[0].message
+    assert graph.transitive_diagnostics(x, {"time"}) == []
+
+
+def test_only_changed_files_are_reparsed(tmp_path):
+    _project(tmp_path)
+    cache = tmp_path / "graph.json"
+    first = ImportGraph.load(cache)
+    first.refresh(_sources(tmp_path))
+    first.save(cache)
+    assert first.parsed == 7
+
+    clock = tmp_path / "app" / "util" / "clock.py"
+    clock.write_text("import math\n")
+    os.utime(tmp_path / "app" / "a.py", ns=(1, 1))  # touched, content unchanged
+
+    second = ImportGraph.load(cache)
+    second.refresh(_sources(tmp_path))
+    assert (second.parsed, second.rehashed, second.reused) == (1, 1, 5)
+    assert second.reachable_roots("app.main") == {"math"}
+
+
+def test_tarjan_orders_components_sinks_first():
+    # 0 -> 1 <-> 2 -> 3
+    component, components = _tarjan([(1,), (2,), (1, 3), ()])
+    assert component[1] == component[2]
+    assert len(components) == 3
+    assert component[3] < component[1] < component[0]
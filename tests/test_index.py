@@ -0,0 +1,75 @@
+# tests/test_index.py
+import ast
+
+from governed.ast.context import Context
+from governed.config import Config
+from governed.index import ModuleIndex, module_index
+
+
+SRC = """
+import time, os.path
+from random import randint
+from . import sibling
+
+@protocol
+class Door:
+    @state
+    class Open:
+        pass
+
+    @transition(from_=Open, to=Open)
+    def stay(s: Open, key: Secret[int]) -> Result[Ok[Open], Err[str]]:
+        print(key)
+        return time.time()
+
+def f(clk: Clock, *rest: Rng) -> int:
+    x: Secret[str] = "k"
+    random.randint(1, 2)
+    random.seed.deep()
+    return time.monotonic()
+"""
+
+
+def test_calls_by_name_and_pattern():
+    index = ModuleIndex.build(ast.parse(SRC))
+    assert [c.lineno for c in index.calls("print")] == [14]
+    assert {c.func.attr for c in index.calls_matching("time.*")} == {"time", "monotonic"}
+    assert len(index.calls_matching("random.*")) == 1
+    assert len(index.calls_matching("random.**")) == 2
+    assert "random.seed.deep" in index.call_names()
+
+
+def test_decorators_and_annotations():
+    tree = ast.parse(SRC)
+    index = ModuleIndex.build(tree)
+    door = tree.body[3]
+    assert index.decorated("protocol") == [door]
+    assert index.has_decorator(door, "protocol")
+    assert not index.has_decorator(door, "state")
+    assert [n.name for n in index.decorated("transition")] == ["stay"]
+
+    assert [owner.arg for owner, _ann in index.annotated("Clock")] == ["clk"]
+    assert [owner.arg for owner, _ann in index.annotated("Rng")] == ["rest"]
+    secret_owners = index.annotated("Secret")
+    assert sorted(type(o).__name__ for o, _a in secret_owners) == ["AnnAssign", "arg"]
+    assert [o.name for o, _a in index.annotated("Result")] == ["stay"]
+
+
+def test_imports_and_types():
+    index = ModuleIndex.build(ast.parse(SRC))
+    assert [(r.module, r.root) for r in index.imports()] == [
+        ("time", "time"),
+        ("os.path", "os"),
+        ("random", "random"),
+        (None, None),
+    ]
+    assert [r.module for r in index.imports("os")] == ["os.path"]
+    kinds = [type(n).__name__ for n in index.of_type(ast.Import, ast.ImportFrom)]
+    assert kinds == ["Import", "ImportFrom", "ImportFrom"]
+
+
+def test_module_index_is_built_once_per_context():
+    tree = ast.parse(SRC)
+    ctx = Context(config=Config())
+    first = module_index(tree, ctx)
+    assert module_index(tree, ctx) is first
@@ -0,0 +1,58 @@
+# tests/test_io.py
+import os
+
+import pytest
+
+from governed.capabilities.io import AsyncIo, BufferedIo, _writev_all
+
+
+def test_buffered_writes_are_gathered_until_flush(tmp_path):
+    io = BufferedIo(tmp_path, buffer_bytes=1024)
+    for i in range(10):
+        assert io.write("log/t.bin", b"%d;" % i) == 2
+    assert not (tmp_path / "log" / "t.bin").exists()
+
+    assert io.read("log/t.bin") == b"0;1;2;3;4;5;6;7;8;9;"
+    io.write("log/t.bin", b"x" * 2000)
+    assert (tmp_path / "log" / "t.bin").stat().st_size == 2020
+    io.close()
+
+
+def test_buffered_io_stays_confined_to_root(tmp_path):
+    with BufferedIo(tmp_path / "root") as io:
+        with pytest.raises(PermissionError):
+            io.write("../escape", b"x")
+
+
+def test_writev_all_handles_many_chunks(tmp_path):
+    path = tmp_path / "out"
+    chunks = [bytes([i % 256]) * 3 for i in range(5000)]
+    with open(path, "wb") as f:
+        _writev_all(f.fileno(), chunks)
+    assert path.read_bytes() == b"".join(chunks)
+
+
+def test_async_io_preserves_order_under_backpressure(tmp_path):
+    expected = {}
+    with AsyncIo(tmp_path, buffer_bytes=64, max_in_flight=2) as io:
+        for i in range(2000):
+            name = f"f{i % 3}"
+            data = b"%05d" % i
+            io.write(name, data)
+            expected[name] = expected.get(name, b"") + data
+        assert io.read("f1") == expected["f1"]
+    for name, data in expected.items():
+        assert (tmp_path / name).read_bytes() == data
+
+
+def test_async_io_reports_failed_flush(tmp_path):
+    io = AsyncIo(tmp_path, buffer_bytes=1)
+    io.write("a", b"x")
+    io.flush()
+    # Break the file descriptor behind the capability's back.
+    os.close(io._fds[io._resolve("a")])
+    io.write("a", b"y")
+    with pytest.raises(OSError):
+        io.flush()
+    io._fds.clear()
+    io.close()
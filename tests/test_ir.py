@@ -0,0 +1,110 @@
+# tests/test_ir.py
+import argparse
+import ast
+import dataclasses
+import inspect
+import json.decoder
+
+import pytest
+
+from governed.config import Config
+from governed.engine import CheckerEngine
+from governed.ir import FlatTree, lower
+
+
+SRC = """
+import time
+from . import sibling
+from os.path import join
+
+def f(clk: Clock, xs: tuple) -> int:
+    y = [1, 2]
+    while True:
+        pass
+    match xs:
+        case (a, b):
+            return a
+    return {k: v for k, v in xs}
+
+class Door:
+    def open(self, s):
+        return lambda: s
+"""
+
+
+def _preorder(tree):
+    out, stack = [], [tree]
+    while stack:
+        node = stack.pop()
+        out.append(node)
+        stack.extend(reversed(list(ast.iter_child_nodes(node))))
+    return out
+
+
+def test_lowering_matches_ast_preorder():
+    tree = ast.parse(SRC)
+    ir = lower(tree)
+    nodes = _preorder(tree)
+
+    assert len(ir) == len(nodes)
+    assert [ir.kind_name(i) for i in range(len(ir))] == [type(n).__name__ for n in nodes]
+    for i, node in enumerate(nodes):
+        children = list(ast.iter_child_nodes(node))
+        assert [nodes[c] for c in ir.children(i)] == children
+        assert ir.position(i) == (getattr(node, "lineno", None), getattr(node, "col_offset", None))
+        assert all(ir.parent[c] == i for c in ir.children(i))
+
+
+def test_names_fields_and_kind_scans():
+    ir = lower(ast.parse(SRC))
+    defs = ir.nodes_of_kind("FunctionDef")
+    assert [ir.name_of(i) for i in defs] == ["f", "open"]
+    assert [ir.name_of(a) for a in ir.descendants(defs[0]) if ir.kind_name(a) == "arg"] == ["clk", "xs"]
+    assert [ir.name_of(i) for i in ir.nodes_of_kind("ImportFrom")] == [None, "os.path"]
+
+    door = ir.nodes_of_kind("ClassDef")[0]
+    assert [ir.kind_name(c) for c in ir.children(door, "body")] == ["FunctionDef"]
+    assert list(ir.children(door, "bases")) == []
+    assert list(ir.ancestors(defs[1])) == [door, 0]
+
+
+def test_serialization_round_trip():
+    ir = lower(ast.parse(SRC))
+    blob = ir.to_bytes()
+    back = FlatTree.from_bytes(blob)
+    assert back.to_bytes() == blob
+    assert back.strings == ir.strings
+    assert back.nodes_of_kind("While") == ir.nodes_of_kind("While")
+
+    with pytest.raises(ValueError):
+        FlatTree.from_bytes(b"nope" + blob[4:])
+    with pytest.raises(ValueError):
+        FlatTree.from_bytes(blob[:-3])
+
+
+def test_lowering_deep_trees_without_recursion():
+    pos = dict(lineno=1, col_offset=0, end_lineno=1, end_col_offset=1)
+    expr = ast.Constant(1, **pos)
+    for _ in range(4999):
+        expr = ast.BinOp(left=expr, op=ast.Add(), right=ast.Constant(1, **pos), **pos)
+    tree = ast.Module(body=[ast.Expr(expr, **pos)], type_ignores=[])
+    ir = lower(tree)
+    binops = ir.nodes_of_kind("BinOp")
+    assert len(binops) == 4999
+    assert ir.end[binops[0]] == len(ir)
+
+
+def test_engine_ir_path_matches_ast_path():
+    tree = ast.parse(SRC)
+    plain = CheckerEngine(Config()).check(tree)
+    flat = CheckerEngine(Config(), use_ir=True).check(tree)
+    assert plain == flat
+
+
+@pytest.mark.parametrize("module", [argparse, dataclasses, json.decoder])
+def test_engine_output_order_does_not_depend_on_ir(module):
+    tree = ast.parse(inspect.getsource(module))
+    plain = CheckerEngine(Config()).check(tree)
+    flat = CheckerEngine(Config(), use_ir=True).check(tree)
+    assert plain and plain == flat
+    assert [(d.line, d.column) for d in plain] == sorted((d.line, d.column) for d in plain)
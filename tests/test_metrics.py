@@ -0,0 +1,63 @@
+# tests/test_metrics.py
+import ast
+import urllib.request
+
+from governed.config import Config
+from governed.engine import CheckerEngine, check_source
+from governed.metrics import Metrics
+
+
+SRC = """
+def f(x: int) -> int:
+    while True:
+        return x
+"""
+
+
+def test_engine_records_counters_and_histograms():
+    metrics = Metrics()
+    check_source(SRC, Config(), metrics=metrics)
+    CheckerEngine(Config(), max_workers=2, metrics=metrics).check(ast.parse(SRC))
+
+    assert metrics.value("governed_files_checked_total") == 2
+    assert metrics.value("governed_diagnostics_total", rule_id="D1") == 2
+    assert metrics.count("governed_parse_seconds") == 1
+    assert metrics.count("governed_check_seconds") == 2
+    for module in ("index", "syntax", "capabilities", "secrets", "protocol", "determinism"):
+        assert metrics.count("governed_rule_seconds", module=module) == 2
+
+
+def test_render_is_prometheus_text_format():
+    metrics = Metrics(buckets=(0.1, 1.0))
+    metrics.inc("governed_diagnostics_total", rule_id='S"1')
+    metrics.observe("governed_parse_seconds", 0.05)
+    metrics.observe("governed_parse_seconds", 5.0)
+    text = metrics.render()
+
+    assert "# TYPE governed_diagnostics_total counter" in text
+    assert 'governed_diagnostics_total{rule_id="S\\"1"} 1' in text
+    assert 'governed_parse_seconds_bucket{le="0.1"} 1' in text
+    assert 'governed_parse_seconds_bucket{le="1"} 1' in text
+    assert 'governed_parse_seconds_bucket{le="+Inf"} 2' in text
+    assert "governed_parse_seconds_sum 5.05" in text
+    assert "governed_parse_seconds_count 2" in text
+    assert text.endswith("\n")
+
+
+def test_textfile_and_http_exposition(tmp_path):
+    metrics = Metrics()
+    metrics.inc("governed_files_checked_total", 3)
+
+    out = tmp_path / "governed.prom"
+    metrics.write_textfile(out)
+    assert "governed_files_checked_total 3" in out.read_text()
+
+    server = metrics.serve(0)
+    try:
+        host, port = server.server_address[:2]
+        with urllib.request.urlopen(f"http://{host}:{port}/metrics", timeout=5) as response:
+            assert response.headers["Content-Type"].startswith("text/plain; version=0.0.4")
+            assert "governed_files_checked_total 3" in response.read().decode()
+    finally:
+        server.shutdown()
+        server.server_close()
@@ -0,0 +1,129 @@
+# tests/test_persistent.py
+import random
+
+import pytest
+
+from governed.persistent import Map, Vector
+
+
+def test_vector_matches_tuple_model():
+    rng = random.Random(7)
+    v, model = Vector(), ()
+    history = []
+    for step in range(5000):
+        op = rng.random()
+        if op < 0.6 or not model:
+            v, model = v.append(step), model + (step,)
+        elif op < 0.8:
+            i = rng.randrange(len(model))
+            v, model = v.set(i, -step), model[:i] + (-step,) + model[i + 1:]
+        else:
+            v, model = v.pop(), model[:-1]
+        if step % 250 == 0:
+            history.append((v, model))
+
+    assert tuple(v) == model
+    assert [v[i] for i in range(len(v))] == list(model)
+    # Structural sharing: every older version is unchanged.
+    for old, old_model in history:
+        assert tuple(old) == old_model
+
+
+def test_vector_pop_to_empty_across_levels():
+    v = Vector(range(33 * 32 + 5))
+    for n in range(len(v), 0, -1):
+        assert len(v) == n and v[-1] == n - 1
+        v = v.pop()
+    assert len(v) == 0 and tuple(v) == ()
+    with pytest.raises(IndexError):
+        v.pop()
+
+
+def test_vector_transient_does_not_touch_source():
+    base = Vector(range(2000))
+    t = base.transient()
+    for i in range(0, 2000, 3):
+        t.set(i, None)
+    t.extend(range(100))
+    built = t.persistent()
+    assert tuple(base) == tuple(range(2000))
+    assert len(built) == 2100 and built[3] is None and built[4] == 4
+    with pytest.raises(RuntimeError):
+        t.append(1)
+
+    # A second transient from the frozen result must not edit it either.
+    again = built.transient().set(4, "x").persistent()
+    assert built[4] == 4 and again[4] == "x"
+
+
+def test_vector_keeps_list_elements_in_trie_and_tail():
+    items = [[i] for i in range(1100)]
+    v = Vector(items)
+    # 0 and 999 live in trie leaves (two levels deep), 1099 in the tail.
+    assert v[0] == [0] and type(v[0]) is list
+    assert v[999] is items[999]
+    assert v[1099] is items[1099]
+    assert all(type(x) is list for x in v)
+
+    edited = v.transient().set(5, ["x"]).append([1100]).persistent()
+    assert edited[5] == ["x"] and type(edited[4]) is list and edited[1100] == [1100]
+    assert type(v[5]) is list and v[5] == [5]
+
+def test_vector_equality_hash_and_slices():
+    a = Vector.of(1, 2, 3)
+    assert a == Vector((1, 2, 3)) and hash(a) == hash(Vector((1, 2, 3)))
+    assert a[::-1] == Vector.of(3, 2, 1)
+    assert list(reversed(a)) == [3, 2, 1]
+
+
+class _Colliding:
+    def __init__(self, n):
+        self.n = n
+
+    def __hash__(self):
+        return 42
+
+    def __eq__(self, other):
+        return isinstance(other, _Colliding) and other.n == self.n
+
+
+def test_map_matches_dict_model():
+    rng = random.Random(11)
+    m, model = Map(), {}
+    history = []
+    for step in range(5000):
+        key = rng.randrange(800)
+        if rng.random() < 0.7:
+            m, model = m.assoc(key, step), {**model, key: step}
+        else:
+            m = m.dissoc(key)
+            model = {k: v for k, v in model.items() if k != key}
+        if step % 250 == 0:
+            history.append((m, model))
+
+    assert len(m) == len(model)
+    assert dict(m.items()) == model
+    assert all(m[k] == v for k, v in model.items())
+    for old, old_model in history:
+        assert dict(old.items()) == old_model
+
+
+def test_map_hash_collisions():
+    keys = [_Colliding(i) for i in range(10)]
+    m = Map((k, k.n) for k in keys)
+    assert len(m) == 10 and all(m[k] == k.n for k in keys)
+    m2 = m.dissoc(keys[3]).assoc(1, "one")
+    assert keys[3] not in m2 and keys[3] in m and m2[1] == "one" and len(m2) == 10
+
+
+def test_map_transient_and_equality():
+    base = Map({"a": 1})
+    t = base.transient()
+    for i in range(1000):
+        t.assoc(i, i)
+    for i in range(0, 1000, 2):
+        t.dissoc(i)
+    built = t.persistent()
+    assert len(built) == 501 and dict(base.items()) == {"a": 1}
+    assert built == Map(list(built.items())) and hash(built) == hash(Map(dict(built.items())))
+    assert built.transient().assoc("a", 2).persistent()["a"] == 2 and built["a"] == 1
@@ -103,3 +103,24 @@ class WarnProto:
 """
     ids = _diag_ids(src)
     assert ("P8", Severity.WARNING) in ids  # SPEC P8
+
+
+def test_protocol_first_declared_state_is_initial_P8():
+    src = """
+@protocol
+class OrderProto:
+
+    @state
+    class Zeta:
+        pass
+
+    @state
+    class Alpha:
+        pass
+
+    @transition(from_=Zeta, to=Alpha)
+    def go(s: Zeta) -> Result[Ok[Alpha], Err[str]]:
+        return Ok(s)
+"""
+    ids = _diag_ids(src)
+    assert ("P8", Severity.WARNING) not in ids  # SPEC P3: Zeta is initial
@@ -0,0 +1,58 @@
+# tests/test_result.py
+import pickle
+
+import pytest
+
+from governed.result import UNIT, Err, Ok, Result
+from governed.secret import Secret
+
+
+def _step(x: int):
+    if x < 0:
+        return Err("negative")
+    return Ok(x + 1)
+
+
+def test_result_match_and_helpers():
+    seen = []
+    for x in (1, -1):
+        match _step(x):
+            case Ok(value):
+                seen.append(("ok", value))
+            case Err(error):
+                seen.append(("err", error))
+            case _:
+                seen.append("unreachable")
+    assert seen == [("ok", 2), ("err", "negative")]
+
+    assert Ok(1) == Ok(1) and Ok(1) != Err(1)
+    assert Ok(2).map(lambda v: v * 2) == Ok(4)
+    assert Err("e").map(lambda v: v * 2) == Err("e")
+    assert Err("e").unwrap_or(0) == 0
+    assert Result[Ok[int], Err[str]] == (Ok[int] | Err[str])
+    with pytest.raises(ValueError):
+        Err("e").unwrap()
+
+
+def test_result_types_are_slotted_and_unit_is_shared():
+    with pytest.raises(AttributeError):
+        Ok(1).extra = 2
+    assert UNIT is UNIT and UNIT == Ok(None)
+
+
+def test_secret_refuses_string_conversion():
+    s = Secret("hunter2")
+    for render in (str, repr, lambda v: f"{v}", lambda v: format(v, ""), lambda v: "%s" % v):
+        with pytest.raises(TypeError):
+            render(s)
+    with pytest.raises(TypeError):
+        pickle.dumps(s)
+    with pytest.raises(TypeError):
+        hash(s)
+    assert s.expose() == "hunter2"
+
+
+def test_secret_equality():
+    assert Secret(b"k") == Secret(b"k")
+    assert Secret("k") != Secret("j")
+    assert Secret(1) == Secret(1)
@@ -0,0 +1,46 @@
+# tests/test_shard.py
+import pytest
+
+from governed.diagnostics import Diagnostic, Severity
+from governed.discovery import SourceFile
+from governed.shard import ShardReport, merge_reports, parse_shard, partition
+
+
+def _file(path: str, size: int) -> SourceFile:
+    return SourceFile(path=path, size=size, mtime_ns=0, inode=0)
+
+
+def test_parse_shard():
+    assert parse_shard("2/3") == (2, 3)
+    for bad in ("0/3", "4/3", "3", "a/b", "1/0"):
+        with pytest.raises(ValueError):
+            parse_shard(bad)
+
+
+def test_partition_is_balanced_complete_and_order_independent():
+    files = [_file(f"m{i}.py", (i * 7919) % 5000 + 1) for i in range(200)]
+    shards = partition(files, 4)
+
+    assert sorted(f.path for s in shards for f in s) == sorted(f.path for f in files)
+    loads = [sum(f.size for f in s) for s in shards]
+    assert max(loads) - min(loads) <= max(f.size for f in files)
+
+    reshuffled = partition(list(reversed(files)), 4)
+    assert [{f.path for f in s} for s in reshuffled] == [{f.path for f in s} for s in shards]
+
+
+def test_merge_requires_every_shard_exactly_once():
+    d = Diagnostic(severity=Severity.ERROR, message="m", rule_id="D1", line=1, column=0)
+    one = ShardReport(diagnostics=[("b.py", d)], shard=(1, 2))
+    two = ShardReport(diagnostics=[("a.py", d)], unchecked_files=1, shard=(2, 2))
+
+    results, failures = merge_reports([two, one])
+    assert [name for name, _diags in results] == ["a.py", "b.py"]
+    assert failures == 1
+
+    with pytest.raises(ValueError, match="missing"):
+        merge_reports([one])
+    with pytest.raises(ValueError, match="duplicate"):
+        merge_reports([one, one, two])
+    with pytest.raises(ValueError, match="unsharded"):
+        merge_reports([one, ShardReport()])
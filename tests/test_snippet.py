@@ -0,0 +1,40 @@
+# tests/test_snippet.py
+from governed.config import Config
+from governed.diagnostics import Diagnostic, Severity
+from governed.engine import check_source
+from governed.snippet import LineIndex, render
+
+
+SRC = 'def f(x: int) -> int:\r\n    while True:\r\n        return ["é", x]\r\n'
+
+
+def test_line_index_lines_and_byte_columns(tmp_path):
+    path = tmp_path / "m.py"
+    path.write_bytes(b"\xef\xbb\xbf" + SRC.encode())
+    for index in (LineIndex.from_text(SRC), LineIndex.from_file(str(path))):
+        assert len(index) == 3
+        assert index.line(2) == "    while True:"
+        assert index.line(3) == '        return ["é", x]'
+        # "é" is two bytes: byte offset 20 is character column 19.
+        assert index.column(3, 20) == 19
+        index.close()
+
+
+def test_rules_fill_end_positions_and_render_carets():
+    diagnostics = {d.rule_id: d for d in check_source(SRC, Config())}
+    literal = diagnostics["S2"]
+    assert (literal.line, literal.column, literal.end_line, literal.end_column) == (3, 15, 3, 24)
+
+    lines = LineIndex.from_text(SRC)
+    assert render(literal, lines).splitlines()[1:4] == [
+        "  |",
+        '3 |         return ["é", x]',
+        "  |                ^^^^^^^^",
+    ]
+    # Multi-line ranges are underlined to the end of their first line.
+    assert render(diagnostics["D1"], lines).splitlines()[3] == "  |     ^^^^^^^^^^^"
+
+
+def test_render_without_position_is_format_human():
+    d = Diagnostic(severity=Severity.ERROR, message="m", rule_id="X", suggestion="s")
+    assert render(d, LineIndex.from_text("x = 1\n")) == d.format_human()
@@ -0,0 +1,84 @@
+# tests/test_store.py
+import pytest
+
+from governed.capabilities.store import SqliteStore
+
+
+def test_get_put_delete_with_buffered_writes(tmp_path):
+    store = SqliteStore(tmp_path / "s.db", batch_size=4, cache_size=2)
+    for i in range(10):
+        store.put(("k", i), {"v": i})
+    assert store.get(("k", 3)) == {"v": 3}
+    assert store.get("missing", "dflt") == "dflt"
+
+    assert store.delete(("k", 9)) is True
+    assert store.delete(("k", 9)) is False
+    assert store.get(("k", 9)) is None
+    store.close()
+
+    reopened = SqliteStore(tmp_path / "s.db")
+    assert [reopened.get(("k", i)) for i in range(10)] == [{"v": i} for i in range(9)] + [None]
+    reopened.close()
+
+
+def test_lru_cache_is_bounded(tmp_path):
+    with SqliteStore(tmp_path / "s.db", cache_size=3) as store:
+        for i in range(10):
+            store.put(i, i)
+        assert len(store._cache) == 3
+        store.get(9)
+        assert store.cache_hits == 1
+        store.get(0)
+        assert store.cache_misses == 1
+
+
+def test_snapshot_reads_are_isolated_from_later_writes(tmp_path):
+    with SqliteStore(tmp_path / "s.db", batch_size=1) as store:
+        store.put("state", "Open")
+        with store.snapshot() as snap:
+            store.put("state", "Closed")
+            store.put("extra", 1)
+            assert snap.get("state") == "Open"
+            assert "extra" not in snap
+        assert store.get("state") == "Closed"
+
+    with pytest.raises(ValueError):
+        snap.get("state")
+
+
+def test_keys_built_at_runtime_match_literals(tmp_path):
+    with SqliteStore(tmp_path / "s.db") as store:
+        key = "user" + str(1)
+        store.put(key, 1)
+        store.put(("k", "a" + "b" * 2, 10 ** 20), 2)
+        store.commit()
+        store._cache.clear()
+        assert store.get("user1") == 1
+        assert store.get(("k", "abb", 100000000000000000000)) == 2
+        with store.snapshot() as snap:
+            assert snap.get("user1") == 1
+        assert store.delete("user1") is True
+        assert store.get(key) is None
+
+
+def test_key_encoding_is_canonical_and_typed():
+    from governed.capabilities.store import _encode_key
+
+    assert _encode_key("user" + str(1)) == _encode_key("user1")
+    keys = [None, True, False, 0, 1, 1.0, "1", b"1", ("1",), (("1",),), ("a", "b"), ("ab",)]
+    assert len({_encode_key(k) for k in keys}) == len(keys)
+    with pytest.raises(TypeError):
+        _encode_key(["list"])
+
+
+def test_mutating_values_does_not_change_the_store(tmp_path):
+    with SqliteStore(tmp_path / "s.db") as store:
+        value = {"items": [1]}
+        store.put("k", value)
+        value["items"].append(2)
+        assert store.get("k") == {"items": [1]}
+
+        store.get("k")["items"].append(3)
+        assert store.get("k") == {"items": [1]}
+        store.commit()
+        assert store.get("k") == {"items": [1]}
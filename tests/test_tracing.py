@@ -0,0 +1,40 @@
+# tests/test_tracing.py
+import ast
+import json
+import threading
+
+from governed.config import Config
+from governed.engine import CheckerEngine
+from governed.tracing import Tracer, span
+
+
+def test_engine_rule_spans_carry_worker_threads():
+    tracer = Tracer()
+    with tracer.span("check", "file", file="m.py"):
+        CheckerEngine(Config(), max_workers=2, tracer=tracer).check(ast.parse("x = 1\n"))
+
+    events = tracer.events
+    rules = [e for e in events if e["cat"] == "rule"]
+    assert {e["name"] for e in rules} == {"syntax", "capabilities", "secrets", "protocol", "determinism"}
+    assert threading.get_native_id() not in {e["tid"] for e in rules}
+
+    outer = next(e for e in events if e["name"] == "check")
+    for e in rules:
+        assert outer["ts"] <= e["ts"] and e["ts"] + e["dur"] <= outer["ts"] + outer["dur"]
+
+
+def test_write_and_null_span(tmp_path):
+    tracer = Tracer()
+    with span(tracer, "read", "io", file="a.py"):
+        pass
+    with span(None, "ignored"):
+        pass
+    tracer.extend([{"name": "parse", "cat": "parse", "ph": "X", "ts": 1.0, "dur": 2.0, "pid": 1, "tid": 1}])
+
+    out = tmp_path / "trace.json"
+    tracer.write(out)
+    payload = json.loads(out.read_text())
+    assert [e["name"] for e in payload["traceEvents"] if e["ph"] == "X"] == ["read", "parse"]
+    assert {e["args"]["name"] for e in payload["traceEvents"] if e["name"] == "process_name"} == {
+        "governed", "governed worker 1",
+    }
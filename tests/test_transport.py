@@ -0,0 +1,107 @@
+# tests/test_transport.py
+import pickle
+
+import pytest
+
+from governed.config import Config
+from governed.diagnostics import Diagnostic, Severity
+from governed.engine import check_source
+from governed.transport import DiagnosticArray, decode, encode
+
+
+SRC = """
+import time
+
+def f(clk: Clock, key: Secret[int]) -> Clock:
+    x = clk
+    print(key)
+    y = [1, 2]
+    while True:
+        return clk
+"""
+
+
+def test_round_trip_of_checker_output():
+    diagnostics = check_source(SRC, Config())
+    array = decode(encode(diagnostics))
+    assert len(array) == len(diagnostics)
+    assert list(array) == diagnostics
+    assert array == diagnostics and diagnostics == array
+
+
+def test_round_trip_keeps_none_and_unicode():
+    diagnostics = [
+        Diagnostic(severity=Severity.HINT, message="bare"),
+        Diagnostic(
+            severity=Severity.WARNING,
+            message="naïve → ☃",
+            rule_id="X1",
+            suggestion="",
+            line=1,
+            column=0,
+            end_line=3,
+            end_column=7,
+        ),
+    ]
+    assert list(decode(encode(diagnostics))) == diagnostics
+    assert list(decode(encode([]))) == []
+
+
+def test_strings_are_interned():
+    one = Diagnostic(severity=Severity.ERROR, message="Use of While is forbidden", rule_id="S1", line=1)
+    many = [Diagnostic(severity=Severity.ERROR, message=one.message, rule_id="S1", line=i) for i in range(1, 101)]
+    # 100 records share two strings: only the 32-byte records grow.
+    assert len(encode(many)) - len(encode([one])) == 99 * 32
+
+
+def test_decoding_is_lazy():
+    diagnostics = check_source(SRC, Config())
+    array = decode(encode(diagnostics))
+    assert array.severity(0) is diagnostics[0].severity
+    assert array.rule_id(len(array) - 1) == diagnostics[-1].rule_id
+    assert array._items == [None] * len(array)
+    assert array[-1] == diagnostics[-1]
+    assert array[-1] is array[-1]
+    assert array[1:3] == diagnostics[1:3]
+
+
+def test_decodes_from_any_buffer():
+    data = encode(check_source(SRC, Config()))
+    assert decode(memoryview(bytearray(data))) == decode(data)
+
+
+def test_pickles_as_encoded_bytes():
+    array = decode(encode(check_source(SRC, Config())))
+    copy = pickle.loads(pickle.dumps(array))
+    assert isinstance(copy, DiagnosticArray)
+    assert copy == array
+
+
+@pytest.mark.parametrize("data", [b"", b"nope" * 8])
+def test_rejects_foreign_buffers(data):
+    with pytest.raises(ValueError):
+        decode(data)
+
+
+def test_rejects_truncated_buffers():
+    data = encode(check_source(SRC, Config()))
+    with pytest.raises(ValueError):
+        decode(data[:-1])
+
+
+def test_index_errors():
+    array = decode(encode([Diagnostic(severity=Severity.ERROR, message="m")]))
+    with pytest.raises(IndexError):
+        array[1]
+    with pytest.raises(IndexError):
+        array.severity(-1)
+
+
+def test_record_layout_matches_diagnostic_fields():
+    from dataclasses import fields
+
+    from governed.transport import FIELDS
+
+    assert tuple(f.name for f in fields(Diagnostic)) == FIELDS
+    built = decode(encode([Diagnostic(severity=Severity.ERROR, message="m", line=2)]))[0]
+    assert vars(built) == vars(Diagnostic(severity=Severity.ERROR, message="m", line=2))
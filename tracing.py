@@ -0,0 +1,118 @@
+# governed/tracing.py
+"""
+Chrome / Perfetto trace-event export.
+
+A Tracer records complete ("X") events: a name, a category, start and
+duration in microseconds, and the process and native thread IDs that
+ran the span. Timestamps come from the system-wide monotonic clock, so
+events recorded in worker processes line up with the parent's when
+their tracers are merged with extend().
+
+`check --trace out.json` records discovery, reads, parses, the index
+build, every rule module's check and report writing; load the file in
+chrome://tracing or ui.perfetto.dev.
+"""
+from __future__ import annotations
+
+import json
+import os
+import threading
+import time
+from contextlib import nullcontext
+from pathlib import Path
+from typing import Any, ContextManager, Dict, Iterable, List, Optional
+
+
+class _Span:
+    __slots__ = ("_tracer", "_name", "_cat", "_args", "_start")
+
+    def __init__(self, tracer: Tracer, name: str, cat: str, args: Dict[str, Any]):
+        self._tracer = tracer
+        self._name = name
+        self._cat = cat
+        self._args = args
+
+    def __enter__(self) -> _Span:
+        self._start = time.monotonic_ns()
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        end = time.monotonic_ns()
+        event = {
+            "name": self._name,
+            "cat": self._cat,
+            "ph": "X",
+            "ts": self._start / 1000,
+            "dur": (end - self._start) / 1000,
+            "pid": os.getpid(),
+            "tid": threading.get_native_id(),
+        }
+        if self._args:
+            event["args"] = self._args
+        self._tracer._record(event)
+
+
+class Tracer:
+    """
+    Collects trace events from any thread.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._events: List[Dict[str, Any]] = []
+        self._threads: Dict[tuple, str] = {}
+
+    def span(self, name: str, cat: str = "governed", **args: Any) -> _Span:
+        """
+        Context manager timing the enclosed block as one event.
+        """
+        return _Span(self, name, cat, args)
+
+    def _record(self, event: Dict[str, Any]) -> None:
+        key = (event["pid"], event["tid"])
+        with self._lock:
+            self._events.append(event)
+            if key not in self._threads:
+                self._threads[key] = threading.current_thread().name
+
+    @property
+    def events(self) -> List[Dict[str, Any]]:
+        with self._lock:
+            return list(self._events)
+
+    def extend(self, events: Iterable[Dict[str, Any]]) -> None:
+        """
+        Add events recorded elsewhere (e.g. returned by a worker process).
+        """
+        with self._lock:
+            self._events.extend(events)
+
+    def to_json(self) -> Dict[str, Any]:
+        with self._lock:
+            events = list(self._events)
+            threads = dict(self._threads)
+        metadata: List[Dict[str, Any]] = []
+        for pid in sorted({e["pid"] for e in events}):
+            label = "governed" if pid == os.getpid() else f"governed worker {pid}"
+            metadata.append({"name": "process_name", "ph": "M", "pid": pid, "args": {"name": label}})
+        for (pid, tid), name in sorted(threads.items()):
+            metadata.append({"name": "thread_name", "ph": "M", "pid": pid, "tid": tid, "args": {"name": name}})
+        return {"traceEvents": metadata + events, "displayTimeUnit": "ms"}
+
+    def write(self, path: Path) -> None:
+        """
+        Atomically write the trace as Chrome trace-event JSON.
+        """
+        path = Path(path)
+        tmp = path.with_name(path.name + ".tmp")
+        tmp.write_text(json.dumps(self.to_json()), encoding="utf-8")
+        os.replace(tmp, path)
+
+
+def span(tracer: Optional[Tracer], name: str, cat: str = "governed", **args: Any) -> ContextManager:
+    """
+    tracer.span(...), or a no-op context manager when tracer is None.
+    """
+    if tracer is None:
+        return nullcontext()
+    return tracer.span(name, cat, **args)
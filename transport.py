@@ -0,0 +1,235 @@
+# governed/transport.py
+"""
+Compact binary encoding of diagnostic lists.
+
+Process-pool workers return encode(diagnostics) instead of pickled
+Diagnostic objects, and the parent wraps the bytes in a DiagnosticArray,
+which decodes a record (and its strings) only when it is accessed. The
+parent therefore does no per-diagnostic work until results are used.
+
+Layout (little-endian):
+
+    header    magic b"GDIA", version u16, reserved u16,
+              record count u32, string count u32
+    offsets   (string count + 1) u32: string i is blob[off[i]:off[i + 1]]
+    records   record count x 32 bytes: severity u8, 3 pad bytes,
+              message, rule_id, suggestion (u32 string index, NO_STRING
+              for None), line, column, end_line, end_column (i32, -1
+              for None)
+    blob      UTF-8 string bytes
+
+Every distinct string is stored once, so repeated messages and rule IDs
+cost 4 bytes per record. The decoder reads any buffer (bytes, a
+memoryview, a multiprocessing.shared_memory buffer) without copying it.
+"""
+from __future__ import annotations
+
+import dataclasses
+import struct
+from typing import Dict, Iterator, List, Optional, Sequence, Union, overload
+
+from governed.diagnostics import Diagnostic, Severity
+
+
+MAGIC = b"GDIA"
+VERSION = 1
+
+NO_STRING = 0xFFFFFFFF
+
+_HEADER = struct.Struct("<4sHHII")
+_RECORD = struct.Struct("<B3xIIIiiii")
+_OFFSET = struct.Struct("<I")
+
+_SEVERITIES = tuple(Severity)
+_SEVERITY_CODES = {s: i for i, s in enumerate(_SEVERITIES)}
+
+# The record layout, in order. DiagnosticArray builds Diagnostics without
+# calling __init__, so refuse to load if the dataclass no longer matches.
+FIELDS = (
+    "severity", "message", "rule_id", "suggestion",
+    "line", "column", "end_line", "end_column",
+)
+if (
+    tuple(f.name for f in dataclasses.fields(Diagnostic)) != FIELDS
+    or hasattr(Diagnostic, "__slots__")
+    or hasattr(Diagnostic, "__post_init__")
+):
+    raise ImportError(
+        "governed.transport does not match the Diagnostic dataclass; "
+        "update the record layout and bump VERSION"
+    )
+
+
+def encode(diagnostics: Sequence[Diagnostic]) -> bytes:
+    """
+    Encode diagnostics into one bytes object.
+    """
+    strings: Dict[str, int] = {}
+
+    def intern(value: Optional[str]) -> int:
+        if value is None:
+            return NO_STRING
+        index = strings.get(value)
+        if index is None:
+            index = strings[value] = len(strings)
+        return index
+
+    records = bytearray(_RECORD.size * len(diagnostics))
+    for i, d in enumerate(diagnostics):
+        _RECORD.pack_into(
+            records,
+            i * _RECORD.size,
+            _SEVERITY_CODES[d.severity],
+            intern(d.message),
+            intern(d.rule_id),
+            intern(d.suggestion),
+            _int(d.line),
+            _int(d.column),
+            _int(d.end_line),
+            _int(d.end_column),
+        )
+
+    encoded = [s.encode("utf-8", errors="surrogatepass") for s in strings]
+    offsets = [0]
+    for raw in encoded:
+        offsets.append(offsets[-1] + len(raw))
+
+    return b"".join((
+        _HEADER.pack(MAGIC, VERSION, 0, len(diagnostics), len(strings)),
+        struct.pack(f"<{len(offsets)}I", *offsets),
+        records,
+        *encoded,
+    ))
+
+
+def decode(data: Union[bytes, bytearray, memoryview]) -> DiagnosticArray:
+    """
+    Wrap encoded diagnostics without decoding them. Raises ValueError if
+    data is not a complete encoding.
+    """
+    return DiagnosticArray(data)
+
+
+class DiagnosticArray(Sequence[Diagnostic]):
+    """
+    A read-only sequence of diagnostics over an encoded buffer.
+
+    Diagnostics are built on first access and then cached; severity()
+    and rule_id() read one field without building the Diagnostic.
+    Compares equal to any sequence of equal diagnostics.
+    """
+
+    def __init__(self, data: Union[bytes, bytearray, memoryview]):
+        view = memoryview(data).cast("B")
+        if len(view) < _HEADER.size:
+            raise ValueError("truncated diagnostic buffer")
+        magic, version, _reserved, count, nstrings = _HEADER.unpack_from(view)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"not a version {VERSION} diagnostic buffer")
+
+        self._records = _HEADER.size + _OFFSET.size * (nstrings + 1)
+        self._blob = self._records + _RECORD.size * count
+        if len(view) < self._blob:
+            raise ValueError("truncated diagnostic buffer")
+        end = _OFFSET.unpack_from(view, self._records - _OFFSET.size)[0]
+        if len(view) < self._blob + end:
+            raise ValueError("truncated diagnostic buffer")
+
+        self._view = view
+        self._count = count
+        self._strings: List[Optional[str]] = [None] * nstrings
+        self._items: List[Optional[Diagnostic]] = [None] * count
+
+    def __len__(self) -> int:
+        return self._count
+
+    @overload
+    def __getitem__(self, index: int) -> Diagnostic: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> List[Diagnostic]: ...
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(self._count))]
+        if index < 0:
+            index += self._count
+        if not 0 <= index < self._count:
+            raise IndexError("diagnostic index out of range")
+
+        item = self._items[index]
+        if item is None:
+            record = _RECORD.unpack_from(self._view, self._records + index * _RECORD.size)
+            item = self._items[index] = self._build(record)
+        return item
+
+    def __iter__(self) -> Iterator[Diagnostic]:
+        items = self._items
+        records = _RECORD.iter_unpack(self._view[self._records:self._blob])
+        for i, record in enumerate(records):
+            item = items[i]
+            if item is None:
+                item = items[i] = self._build(record)
+            yield item
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, Sequence) or isinstance(other, (str, bytes)):
+            return NotImplemented
+        return len(self) == len(other) and all(a == b for a, b in zip(self, other))
+
+    def __repr__(self) -> str:
+        return f"DiagnosticArray({list(self)!r})"
+
+    def __reduce__(self):
+        return decode, (self._view.tobytes(),)
+
+    # ---- field access without building Diagnostics ----
+
+    def severity(self, index: int) -> Severity:
+        return _SEVERITIES[self._view[self._records + self._offset(index)]]
+
+    def rule_id(self, index: int) -> Optional[str]:
+        # The rule_id index follows severity, padding and message.
+        at = self._records + self._offset(index) + 8
+        return self._string(_OFFSET.unpack_from(self._view, at)[0])
+
+    # ---- internals ----
+
+    def _build(self, record) -> Diagnostic:
+        severity, message, rule_id, suggestion, line, column, end_line, end_column = record
+        # Set the fields directly, as unpickling does: the frozen
+        # dataclass __init__ costs more than the whole decode.
+        item = object.__new__(Diagnostic)
+        item.__dict__.update(
+            severity=_SEVERITIES[severity],
+            message=self._string(message) or "",
+            rule_id=self._string(rule_id),
+            suggestion=self._string(suggestion),
+            line=None if line < 0 else line,
+            column=None if column < 0 else column,
+            end_line=None if end_line < 0 else end_line,
+            end_column=None if end_column < 0 else end_column,
+        )
+        return item
+
+    def _offset(self, index: int) -> int:
+        if not 0 <= index < self._count:
+            raise IndexError("diagnostic index out of range")
+        return index * _RECORD.size
+
+    def _string(self, index: int) -> Optional[str]:
+        if index == NO_STRING:
+            return None
+        value = self._strings[index]
+        if value is None:
+            start, end = struct.unpack_from("<2I", self._view, _HEADER.size + _OFFSET.size * index)
+            raw = self._view[self._blob + start:self._blob + end]
+            value = self._strings[index] = str(raw, "utf-8", errors="surrogatepass")
+        return value
+
+
+# ----------------- helpers -----------------
+
+
+def _int(value: Optional[int]) -> int:
+    return -1 if value is None else value